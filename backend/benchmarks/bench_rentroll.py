@@ -0,0 +1,75 @@
+"""
+Memory and group-by summary time of a 100k-unit rent roll, dataclass list vs columnar.
+
+    python -m benchmarks.bench_rentroll [units]
+"""
+import sys
+import time
+import tracemalloc
+import numpy as np
+from models.rentroll import ColumnarRentRoll, RentRoll, RentRollUnit
+
+UNIT_TYPES = ['Studio', '1BR', '2BR', '3BR', 'PH']
+STATUSES = ['occupied', 'vacant', 'notice', 'model']
+
+
+def make_columns(n_units: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    market_rent = rng.uniform(1200, 4500, n_units).round(2)
+    return {
+        'unit_id': [f'U{i:06d}' for i in range(n_units)],
+        'unit_type': rng.choice(UNIT_TYPES, n_units).tolist(),
+        'status': rng.choice(STATUSES, n_units, p=[0.9, 0.06, 0.03, 0.01]).tolist(),
+        'market_rent': market_rent.tolist(),
+        'actual_rent': (market_rent * rng.uniform(0.9, 1.0, n_units)).round(2).tolist(),
+        'sqft': rng.uniform(450, 1600, n_units).round().tolist(),
+    }
+
+
+def dataclass_summary(rent_roll: RentRoll):
+    """Reference group-by over the dataclass list, the way callers had to do it before"""
+    groups = {}
+    for unit in rent_roll.units:
+        g = groups.setdefault(unit.unit_type, {'count': 0, 'occupied': 0, 'market': 0.0, 'actual': 0.0, 'loss': 0.0, 'sqft': 0.0})
+        g['count'] += 1
+        g['occupied'] += unit.status == 'occupied'
+        g['market'] += unit.market_rent
+        g['actual'] += unit.actual_rent
+        g['loss'] += unit.loss_to_lease
+        g['sqft'] += unit.sqft or 0.0
+    return groups
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_units: int = 100_000):
+    columns = make_columns(n_units)
+    units = list(zip(*columns.values()))
+
+    tracemalloc.start()
+    rent_roll = RentRoll(units=[
+        RentRollUnit(uid, ut, st, mr, ar, mr - ar, sq) for uid, ut, st, mr, ar, sq in units
+    ])
+    dataclass_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    columnar = ColumnarRentRoll(**columns)
+    columnar_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{n_units} units")
+    print(f"  memory   dataclass list {dataclass_bytes / 1e6:8.1f} MB   columnar {columnar_bytes / 1e6:6.1f} MB ({columnar.nbytes / 1e6:.1f} MB arrays)")
+    print(f"  summary  dataclass loop {timed(lambda: dataclass_summary(rent_roll)) * 1e3:8.1f} ms   columnar {timed(lambda: columnar.summary()) * 1e3:6.1f} ms")
+    print(f"  by type and status      {'':8}     columnar {timed(lambda: columnar.summary(by=('unit_type', 'status'))) * 1e3:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,235 @@
+"""
+Timing benchmarks for the calculation engine and the /analyze endpoint, parameterized over
+hold period, loan term and unit-type count, with JSON baselines and regression checks.
+
+    python -m benchmarks.suite run [--output results.json] [--filter calculate_irr] [--min-time 0.05]
+    python -m benchmarks.suite compare benchmarks/baseline.json results.json [--threshold 0.15]
+    python -m benchmarks.suite run --compare benchmarks/baseline.json
+
+compare (and run --compare) exits with status 1 when any case is slower than the baseline
+by more than the threshold.
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+
+import numpy as np
+
+from calculations.amortization import generate_amortization_schedule
+from calculations.cashflow import CashFlowCalculator, DebtServiceCalculator
+from calculations.leasing import LeaseRolloverProjector
+from models.realestatemodel import FinancingParameters, PropertyParameters, RealEstateModel, UnitType
+from models.rentroll import ColumnarRentRoll
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HOLD_PERIODS = (5, 10, 25, 50)
+LOAN_TERMS = (5, 10, 30)
+UNIT_TYPE_COUNTS = (1, 10, 100)
+RENT_ROLL_UNITS = (200, 20_000)
+COLD_IMPORT_MODULES = ('calculations.cashflow', 'calculations.batch', 'main')
+DEFAULT_THRESHOLD = 0.15  # Relative slowdown reported as a regression
+REPEAT = 5
+
+
+def make_scenario(hold_period: int, loan_term: int, unit_types: int) -> Dict:
+    """An /analyze request body; 200 units split across the unit types"""
+    counts = np.diff(np.linspace(0, 200, unit_types + 1).round()).astype(int)
+    return {
+        'property': {
+            'property_name': 'Benchmark', 'units': 200, 'total_sqft': 180_000,
+            'purchase_price': 40_000_000, 'transaction_date': '2024-01-01', 'hold_period': hold_period,
+        },
+        'financing': {
+            'loan_amount': 26_000_000, 'interest_rate': 0.06, 'loan_term': loan_term,
+            'amortization_period': 30, 'interest_only_period': min(2, loan_term),
+        },
+        'unit_types': [
+            {'unit_type': f'T{i}', 'description': f'Type {i}', 'unit_count': int(n),
+             'sqft_per_unit': 700 + 10 * i, 'market_rent': 2400.0 + 5 * i}
+            for i, n in enumerate(counts)
+        ],
+    }
+
+
+def make_model(scenario: Dict) -> RealEstateModel:
+    return RealEstateModel(
+        PropertyParameters(**scenario['property']),
+        FinancingParameters(**scenario['financing']),
+        [UnitType(**ut) for ut in scenario['unit_types']],
+    )
+
+
+def bench_amortization_schedule(loan_term: int) -> Callable:
+    return lambda: generate_amortization_schedule(26_000_000, 0.06, loan_term, min(2, loan_term))
+
+
+def bench_debt_service_calculator(loan_term: int) -> Callable:
+    financing = make_model(make_scenario(10, loan_term, 1)).financing
+    return lambda: DebtServiceCalculator(financing)
+
+
+def bench_calculate_irr(hold_period: int, loan_term: int, unit_types: int) -> Callable:
+    model = make_model(make_scenario(hold_period, loan_term, unit_types))
+    # A fresh calculator each call, so the cached projection is part of the cost
+    return lambda: CashFlowCalculator(model).calculate_irr()
+
+
+def bench_annual_cash_flows(hold_period: int, loan_term: int, unit_types: int) -> Callable:
+    model = make_model(make_scenario(hold_period, loan_term, unit_types))
+    def run():
+        calculator = CashFlowCalculator(model)
+        return [calculator.calculate_annual_cash_flow(year) for year in range(hold_period)]
+    return run
+
+
+def bench_analyze_endpoint(hold_period: int, loan_term: int, unit_types: int) -> Callable:
+    from fastapi.testclient import TestClient
+    import main
+    client = TestClient(main.app)
+    scenario = make_scenario(hold_period, loan_term, unit_types)
+    def run():
+        main.analysis_cache.clear()  # Time the analysis, not a cache hit
+        response = client.post('/analyze', json=scenario)
+        assert response.status_code == 200, response.text
+    return run
+
+
+def make_rent_roll(units: int) -> ColumnarRentRoll:
+    """Seeded rent roll: 5% vacant, rents 0-15% below market, leases expiring over the next 13 months"""
+    rng = np.random.default_rng(units)
+    market_rent = rng.uniform(1500, 3500, units).round()
+    return ColumnarRentRoll(
+        np.arange(units).astype(str), rng.choice(['1BR', '2BR', '3BR'], units),
+        np.where(rng.random(units) < 0.05, 'vacant', 'occupied'), market_rent,
+        (market_rent * rng.uniform(0.85, 1.0, units)).round(),
+        lease_expiration=np.datetime64('2024-01-01') + rng.integers(-30, 400, units)
+    )
+
+
+def bench_lease_rollover(units: int, hold_period: int) -> Callable:
+    rent_roll = make_rent_roll(units)
+    return lambda: LeaseRolloverProjector(rent_roll, '2024-01-01', hold_period).project()
+
+
+def bench_cold_import(module: str) -> Callable:
+    # A fresh interpreter each call, so this includes Python startup (the same for every module)
+    command = [sys.executable, '-c', f'import {module}']
+    return lambda: subprocess.run(command, cwd=BACKEND_DIR, check=True)
+
+
+ENGINE_GRID = {'hold_period': HOLD_PERIODS, 'loan_term': LOAN_TERMS, 'unit_types': UNIT_TYPE_COUNTS}
+BENCHMARKS = {
+    # name: (setup returning the timed callable, parameter grid)
+    'amortization_schedule': (bench_amortization_schedule, {'loan_term': LOAN_TERMS}),
+    'debt_service_calculator': (bench_debt_service_calculator, {'loan_term': LOAN_TERMS}),
+    'calculate_irr': (bench_calculate_irr, ENGINE_GRID),
+    'annual_cash_flows': (bench_annual_cash_flows, ENGINE_GRID),
+    'analyze_endpoint': (bench_analyze_endpoint, ENGINE_GRID),
+    'lease_rollover': (bench_lease_rollover, {'units': RENT_ROLL_UNITS, 'hold_period': (10, 25)}),
+    'cold_import': (bench_cold_import, {'module': COLD_IMPORT_MODULES}),
+}
+
+
+def cases(name_filter: str = '') -> Iterator[Tuple[str, Callable, Dict]]:
+    for name, (setup, grid) in BENCHMARKS.items():
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid, values))
+            case = f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+            if name_filter in case:
+                yield case, setup, params
+
+
+def measure(fn: Callable, min_time: float, repeat: int = REPEAT) -> Dict[str, float]:
+    """Per-call seconds: loops are batched until one batch takes min_time, then best / median of repeat batches"""
+    fn()  # Warm up imports and caches
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    batches = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        batches.append((time.perf_counter() - start) / loops)
+    return {'best_us': min(batches) * 1e6, 'median_us': statistics.median(batches) * 1e6, 'loops': loops}
+
+
+def run(name_filter: str = '', min_time: float = 0.05) -> Dict:
+    results = {}
+    for case, setup, params in cases(name_filter):
+        results[case] = measure(setup(**params), min_time)
+        print(f"{case:70} {results[case]['best_us']:12.1f} us", flush=True)
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> int:
+    """Print the relative change of every case found in both runs; returns the number of regressions"""
+    regressions = 0
+    for case, result in current['results'].items():
+        if case not in baseline['results']:
+            print(f"{case:70} {'new':>10}")
+            continue
+        # Best-of-N is the least noisy statistic for short CPU-bound calls
+        change = result['best_us'] / baseline['results'][case]['best_us'] - 1
+        flag = ''
+        if change > threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"{case:70} {change:+10.1%}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Time every case and write the results as JSON')
+    run_parser.add_argument('--output', type=Path, help=f'Results file (default: print only; use {BASELINE_PATH} to refresh the baseline)')
+    run_parser.add_argument('--filter', default='', help='Only cases whose name contains this text')
+    run_parser.add_argument('--min-time', type=float, default=0.05, help='Seconds per timed batch')
+    run_parser.add_argument('--compare', type=Path, help='Baseline to compare against after the run')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('current', type=Path)
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        current = json.loads(args.current.read_text())
+    else:
+        current = run(args.filter, args.min_time)
+        if args.output:
+            args.output.write_text(json.dumps(current, indent=2) + '\n')
+        if not args.compare:
+            return 0
+    baseline = json.loads((args.baseline if args.command == 'compare' else args.compare).read_text())
+    return 1 if compare(baseline, current, args.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from typing import List, Dict
-import numpy_financial as npf
+import numpy as np
 
 def generate_amortization_schedule(loan_amount: float, interest_rate: float, amortization_period: int, interest_only_period: int = 0) -> List[Dict]:
     """
@@ -27,6 +27,7 @@ def generate_amortization_schedule(loan_amount: float, interest_rate: float, amo
     
     # Amortizing period
     if months_amort > 0:
+        import numpy_financial as npf  # Only this legacy month-by-month path needs it
         monthly_payment = npf.pmt(monthly_rate, months_amort, -balance)
         for i, month in enumerate(range(months_io + 1, months_io + months_amort + 1)):
             year = (month - 1) // 12 + 1
@@ -48,3 +49,50 @@ def generate_amortization_schedule(loan_amount: float, interest_rate: float, amo
         entry['principal'] = round(entry['principal'], 2)
         entry['balance'] = round(entry['balance'], 2)
     return schedule
+
+
+def amortization_arrays(loan_amount, interest_rate, loan_term, amortization_period, interest_only_period=0) -> Dict[str, np.ndarray]:
+    """
+    Closed-form monthly loan schedule as NumPy arrays.
+    Inputs may be scalars or equal-length arrays (one loan per row). Every output has shape
+    (loans, months), spans the longest loan, and is zero after each loan's term. The level payment
+    amortizes over amortization_period, so a term shorter than that leaves a balloon balance.
+    """
+    loan_amount, interest_rate, loan_term, amortization_period, interest_only_period = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (loan_amount, interest_rate, loan_term, amortization_period, interest_only_period))
+    )
+    monthly_rate = interest_rate[:, None] / 12
+    principal_amount = loan_amount[:, None]
+    io_months = interest_only_period[:, None] * 12
+    term_months = np.maximum(loan_term, interest_only_period)[:, None] * 12
+    amortizing_months = amortization_period[:, None] * 12
+    month = np.arange(1, int(term_months.max(initial=0)) + 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + monthly_rate) ** amortizing_months
+        level_payment = np.where(
+            monthly_rate == 0,
+            principal_amount / amortizing_months,
+            principal_amount * monthly_rate * growth / (growth - 1)
+        )
+        elapsed = np.maximum(month - io_months, 0)  # Amortizing months paid so far
+        growth = (1 + monthly_rate) ** elapsed
+        ending_balance = np.where(
+            monthly_rate == 0,
+            principal_amount - level_payment * elapsed,
+            principal_amount * growth - level_payment * (growth - 1) / monthly_rate
+        )
+
+    in_term = month <= term_months
+    ending_balance = np.where(in_term, ending_balance, 0.0)
+    beginning_balance = np.where(in_term, np.concatenate([principal_amount, ending_balance[:, :-1]], axis=1), 0.0)
+    interest = beginning_balance * monthly_rate
+    payment = np.where(month <= io_months, interest, np.where(in_term, level_payment, 0.0))
+    return {
+        'month': month,
+        'beginning_balance': beginning_balance,
+        'payment': payment,
+        'principal': payment - interest,
+        'interest': interest,
+        'ending_balance': ending_balance
+    }
@@ -21,4 +21,21 @@ DEFAULT_EXPENSE_RATIOS = {
     "Miscellaneous": 0.005,
     "Security": 0.005,
     "Equipment Lease": 0.003,
-} 
\ No newline at end of file
+} 
+
+DEFAULT_CAPEX_ASSUMPTIONS = {
+    "capex": 40000,  # Year 1 capital reserves
+    "capex_growth_rate": 0.03,
+}
+
+DEFAULT_EXIT_ASSUMPTIONS = {
+    "exit_cap_rate": 0.08,
+    "cost_of_sale_rate": 0.015,  # 1.5% transaction costs
+}
+
+DEFAULT_LEASING_ASSUMPTIONS = {
+    "lease_term": 12,  # Months of every new lease and renewal
+    "renewal_probability": 0.6,
+    "downtime_months": 1,  # Vacant months between a move-out and the next lease
+    "renewal_increase_cap": None,  # Largest renewal increase over the expiring rent; None renews at market
+}
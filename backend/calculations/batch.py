@@ -0,0 +1,226 @@
+import numpy as np
+from typing import Dict, Any, List
+from .amortization import amortization_arrays
+from .assumptions import DEFAULT_CAPEX_ASSUMPTIONS, DEFAULT_EXIT_ASSUMPTIONS
+from .cashflow import IncomeProjector, ExpenseProjector, apply_assumptions, exit_proceeds, project_operations
+from .irr import return_metrics
+from services.encoding import finite_list
+
+ANNUAL_FIELDS = [
+    'gross_income', 'total_expenses', 'noi', 'capex', 'cash_flow_operations',
+    'debt_service', 'leveraged_cash_flow', 'market_rent', 'vacancy_loss',
+    'concessions', 'bad_debt', 'effective_rental_income',
+    'variable_expenses', 'management_fee', 'fixed_expenses'
+]
+
+
+FINANCING_FIELDS = ('loan_amount', 'interest_rate', 'loan_term', 'amortization_period', 'interest_only_period', 'loan_origination_fee_rate')
+MODEL_FIELDS = ('purchase_price', 'hold_period', 'base_monthly_rent') + FINANCING_FIELDS
+# Assumptions that hold one value per scenario for every year
+_EXIT_FIELDS = tuple(DEFAULT_EXIT_ASSUMPTIONS)
+
+
+def _column(models, getter) -> np.ndarray:
+    return np.array([getter(m) for m in models], dtype=float)
+
+
+def model_columns(models) -> Dict[str, np.ndarray]:
+    """Stack the RealEstateModel inputs the batch engine needs into one column per field"""
+    return {
+        'purchase_price': _column(models, lambda m: m.property.purchase_price),
+        'hold_period': _column(models, lambda m: m.property.hold_period),
+        'base_monthly_rent': _column(models, lambda m: sum(unit.market_rent * unit.unit_count for unit in m.unit_types)),
+        **{field: _column(models, lambda m, field=field: getattr(m.financing, field)) for field in FINANCING_FIELDS}
+    }
+
+
+def stack_assumptions(per_scenario: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Stack per-scenario assumption overrides into columns, filling defaults where a scenario has none.
+    Rent growth schedules are padded to a common length with the 3% long-run rate.
+    """
+    defaults = {**IncomeProjector(None).assumptions, **DEFAULT_CAPEX_ASSUMPTIONS, **DEFAULT_EXIT_ASSUMPTIONS}
+    keys = {k for overrides in per_scenario for k in overrides}
+    unknown = keys - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown assumption: {sorted(unknown)[0]}")
+    columns = {}
+    for k in keys:
+        values = [overrides.get(k, defaults[k]) for overrides in per_scenario]
+        if k == 'rent_growth_rates':
+            width = max(len(v) for v in values)
+            values = [list(v) + [0.03] * (width - len(v)) for v in values]
+        columns[k] = np.array(values, dtype=float)
+    return columns
+
+
+class BatchIncomeProjector(IncomeProjector):
+    """IncomeProjector over a column of base rents, one row per scenario"""
+    def __init__(self, base_monthly_rent: np.ndarray):
+        super().__init__(None)
+        self._base_monthly_rent = np.asarray(base_monthly_rent, dtype=float)[:, None]
+
+    def base_monthly_rent(self) -> np.ndarray:
+        return self._base_monthly_rent
+
+
+class BatchDebtServiceCalculator:
+    """Annual debt service and balances for many loans, one row per scenario"""
+    def __init__(self, loan_amount, interest_rate, loan_term, amortization_period, interest_only_period):
+        # Scenario grids and simulations often share one loan; amortize each distinct loan once
+        rows = np.column_stack(np.broadcast_arrays(loan_amount, interest_rate, loan_term, amortization_period, interest_only_period))
+        if len(rows) and (rows == rows[0]).all():
+            loans, inverse = rows[:1], np.zeros(len(rows), dtype=int)
+        else:
+            loans, inverse = np.unique(rows, axis=0, return_inverse=True)
+        schedule = amortization_arrays(*loans.T)
+        annual_debt_service = schedule['payment'].reshape(len(loans), -1, 12).sum(axis=2)
+        self.annual_debt_service = annual_debt_service[inverse.ravel()]
+        self.annual_ending_balance = schedule['ending_balance'][:, 11::12][inverse.ravel()]
+
+    @staticmethod
+    def _annual_lookup(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+        # Index past the last loan year lands on a zero column
+        padded = np.concatenate([values, np.zeros((len(values), 1))], axis=1)
+        index = np.where((years >= 1) & (years <= values.shape[1]), years - 1, values.shape[1])
+        return np.take_along_axis(padded, np.broadcast_to(index, (len(values),) + index.shape[1:]), axis=1)
+
+    def get_annual_debt_service(self, years) -> np.ndarray:
+        """(scenarios x years) debt service for a vector of 1-based loan years"""
+        return self._annual_lookup(self.annual_debt_service, np.atleast_1d(years)[None, :])
+
+    def get_balance_schedule(self, years) -> np.ndarray:
+        """(scenarios x years) balance at the end of each of a vector of 1-based loan years"""
+        return self._annual_lookup(self.annual_ending_balance, np.atleast_1d(years)[None, :])
+
+    def get_outstanding_balance(self, years) -> np.ndarray:
+        """Balance at the end of one 1-based loan year per scenario"""
+        return self._annual_lookup(self.annual_ending_balance, np.asarray(years)[:, None])[:, 0]
+
+
+class BatchCashFlowCalculator:
+    """
+    Evaluates many scenarios at once as (scenarios x years) arrays.
+    Mirrors CashFlowCalculator, with each scenario projected over its own hold period;
+    years past a scenario's hold period are masked out of its flows.
+    columns holds one array per MODEL_FIELDS entry. assumptions maps assumption names to a
+    shared value or one value per scenario (a scenarios x years array for rent_growth_rates).
+    """
+    def __init__(self, columns: Dict[str, np.ndarray], assumptions: Dict[str, Any] = None):
+        n_scenarios = len(np.atleast_1d(columns['purchase_price']))
+        if n_scenarios == 0:
+            raise ValueError("A batch needs at least one scenario")
+        self.columns = {k: np.broadcast_to(np.asarray(columns[k], dtype=float), (n_scenarios,)) for k in MODEL_FIELDS}
+        self.n_scenarios = n_scenarios
+        self.purchase_price = self.columns['purchase_price']
+        self.hold_period = self.columns['hold_period'].astype(int)
+        if self.hold_period.min() < 1:
+            raise ValueError("hold_period must be at least 1 year for every scenario")
+        loan_amount = self.columns['loan_amount']
+        self.equity_required = self.purchase_price - loan_amount + loan_amount * self.columns['loan_origination_fee_rate']
+        self.income_projector = BatchIncomeProjector(self.columns['base_monthly_rent'])
+        self.expense_projector = ExpenseProjector(None)
+        self.debt_calculator = BatchDebtServiceCalculator(*(self.columns[field] for field in FINANCING_FIELDS[:5]))
+        self.capex_assumptions = dict(DEFAULT_CAPEX_ASSUMPTIONS)
+        self.exit_assumptions = dict(DEFAULT_EXIT_ASSUMPTIONS)
+        apply_assumptions(
+            {k: self._broadcastable(k, v) for k, v in (assumptions or {}).items()},
+            self.income_projector, self.capex_assumptions, self.exit_assumptions
+        )
+        self._projection = None
+
+    @staticmethod
+    def _broadcastable(name: str, value):
+        # Per-scenario columns line up against (scenarios x years) arrays, except exit
+        # assumptions which apply once per scenario
+        value = np.asarray(value, dtype=float)
+        if name == 'rent_growth_rates' or name in _EXIT_FIELDS or value.ndim != 1:
+            return value
+        return value[:, None]
+
+    @classmethod
+    def from_models(cls, models, assumptions: Dict[str, Any] = None):
+        return cls(model_columns(models), assumptions)
+
+    @classmethod
+    def from_base(cls, model, overrides: Dict[str, np.ndarray], assumptions: Dict[str, Any] = None):
+        """Vary one base model: overrides maps model fields or assumption names to per-scenario columns"""
+        n_scenarios = max(len(np.atleast_1d(v)) for v in overrides.values())
+        columns = {k: np.repeat(v, n_scenarios) for k, v in model_columns([model]).items()}
+        assumptions = dict(assumptions or {})
+        for k, v in overrides.items():
+            if k in MODEL_FIELDS:
+                columns[k] = np.broadcast_to(v, (n_scenarios,))
+            else:
+                assumptions[k] = v
+        return cls(columns, assumptions)
+
+    def project(self) -> Dict[str, np.ndarray]:
+        """(scenarios x years) arrays for every annual field, zero past each hold period"""
+        if self._projection is None:
+            n_scenarios = self.n_scenarios
+            years = np.arange(self.hold_period.max(initial=0))
+            in_hold = years < self.hold_period[:, None]
+            flows = project_operations(self.income_projector, self.expense_projector, self.debt_calculator, years, self.capex_assumptions)
+            self._projection = {
+                k: np.where(in_hold, np.broadcast_to(flows[k], (n_scenarios, len(years))), 0.0)
+                for k in ANNUAL_FIELDS
+            }
+        return self._projection
+
+    def calculate_exit_value(self) -> Dict[str, np.ndarray]:
+        """Exit value and proceeds at the end of each scenario's hold period"""
+        noi = self.project()['noi']
+        exit_year_noi = np.take_along_axis(noi, self.hold_period[:, None] - 1, axis=1)[:, 0] if noi.size else np.zeros(self.n_scenarios)
+        outstanding_balance = self.debt_calculator.get_outstanding_balance(self.hold_period)
+        return exit_proceeds(exit_year_noi, outstanding_balance, self.exit_assumptions)
+
+    def calculate_irr(self) -> Dict[str, np.ndarray]:
+        """Leveraged and unleveraged IRR for every scenario, solved in one batched pass"""
+        projection = self.project()
+        exit_data = self.calculate_exit_value()
+        rows = np.arange(self.n_scenarios)
+        unleveraged_flows = np.concatenate([-self.purchase_price[:, None], projection['cash_flow_operations']], axis=1)
+        leveraged_flows = np.concatenate([-self.equity_required[:, None], projection['leveraged_cash_flow']], axis=1)
+        unleveraged_flows[rows, self.hold_period] += exit_data['net_sale_price']
+        leveraged_flows[rows, self.hold_period] += exit_data['net_proceeds']
+        # Trailing zeros past a scenario's exit leave its IRR unchanged
+        returns = return_metrics(
+            np.concatenate([unleveraged_flows, leveraged_flows]),
+            operating_flows=np.concatenate([projection['cash_flow_operations'], projection['leveraged_cash_flow']])
+        )
+        n = self.n_scenarios
+        return {
+            'unleveraged_irr': returns['irr'][:n],
+            'leveraged_irr': returns['irr'][n:],
+            'unleveraged_irr_converged': returns['irr_converged'][:n],
+            'leveraged_irr_converged': returns['irr_converged'][n:],
+            'unleveraged_equity_multiple': returns['equity_multiple'][:n],
+            'leveraged_equity_multiple': returns['equity_multiple'][n:],
+            'unleveraged_flows': unleveraged_flows,
+            'leveraged_flows': leveraged_flows
+        }
+
+    def results(self, include_annual_cash_flows: bool = True) -> List[Dict[str, Any]]:
+        """
+        Per-scenario results with annual flows as one list per field, trimmed to each hold period.
+        Non-finite values are already mapped to None.
+        """
+        irr_results = {k: finite_list(v) for k, v in self.calculate_irr().items()}
+        exit_analysis = {k: finite_list(v) for k, v in self.calculate_exit_value().items()}
+        annual = {k: finite_list(v) for k, v in self.project().items()} if include_annual_cash_flows else {}
+        equity_required = self.equity_required.tolist()
+        results = []
+        for i, hold_period in enumerate(self.hold_period.tolist()):
+            result = {
+                'irr_results': {
+                    k: v[i][:hold_period + 1] if k.endswith('_flows') else v[i]
+                    for k, v in irr_results.items()
+                },
+                'exit_analysis': {k: v[i] for k, v in exit_analysis.items()},
+                'equity_required': equity_required[i],
+            }
+            if include_annual_cash_flows:
+                result['annual_cash_flows'] = {k: v[i][:hold_period] for k, v in annual.items()}
+            results.append(result)
+        return results
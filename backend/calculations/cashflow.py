@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
-import numpy_financial as npf
-from typing import Dict, Any
-from .assumptions import DEFAULT_INCOME_BREAKDOWN, DEFAULT_EXPENSE_RATIOS
+from typing import Dict, Any, List
+from .assumptions import DEFAULT_INCOME_BREAKDOWN, DEFAULT_EXPENSE_RATIOS, DEFAULT_CAPEX_ASSUMPTIONS, DEFAULT_EXIT_ASSUMPTIONS
+from .amortization import amortization_arrays
+from .irr import irr_batch, return_metrics
+from services.metrics import timed_stage
 
 # --- Real Implementations ---
 
@@ -17,13 +18,25 @@ class IncomeProjector:
             'bad_debt_rate': 0.002
         }
 
-    def calculate_market_rents(self, year: int) -> float:
-        base_rent = sum(unit.market_rent * unit.unit_count for unit in self.model.unit_types)
-        current_rent = base_rent
-        for i in range(year):
-            growth_rate = self.assumptions['rent_growth_rates'][i] if i < len(self.assumptions['rent_growth_rates']) else 0.03
-            current_rent *= (1 + growth_rate)
-        return current_rent * 12  # Annual rent
+    def rent_growth_factors(self, n_years: int) -> np.ndarray:
+        """Cumulative market rent growth factors for years 0..n_years-1 (year 0 = 1.0)"""
+        rates = np.asarray(self.assumptions['rent_growth_rates'], dtype=float)
+        n_growth = max(n_years - 1, 0)
+        if rates.shape[-1] < n_growth:
+            padding = np.full(rates.shape[:-1] + (n_growth - rates.shape[-1],), 0.03)
+            rates = np.concatenate([rates, padding], axis=-1)
+        growth = np.cumprod(1 + rates[..., :n_growth], axis=-1)
+        return np.concatenate([np.ones(growth.shape[:-1] + (1,)), growth], axis=-1)
+
+    def base_monthly_rent(self) -> float:
+        return sum(unit.market_rent * unit.unit_count for unit in self.model.unit_types)
+
+    def calculate_market_rents(self, year) -> float:
+        """Annual market rent for a year, or for an array of years at once"""
+        base_rent = self.base_monthly_rent()
+        years = np.maximum(np.asarray(year), 0)
+        factors = self.rent_growth_factors(int(years.max(initial=0)) + 1)
+        return base_rent * factors[..., years] * 12  # Annual rent
 
     def calculate_effective_rental_income(self, year: int) -> Dict[str, float]:
         market_rent = self.calculate_market_rents(year)
@@ -86,63 +99,233 @@ class ExpenseProjector:
 
 class DebtServiceCalculator:
     """Handles loan amortization and debt service calculations"""
+    @timed_stage('amortization')
     def __init__(self, financing):
         self.financing = financing
         self.monthly_rate = financing.interest_rate / 12
-        self.amortization_schedule = self._generate_amortization_schedule()
-
-    def _generate_amortization_schedule(self):
-        import pandas as pd
-        schedule_data = []
-        remaining_balance = self.financing.loan_amount
-        monthly_io_payment = self.financing.loan_amount * self.monthly_rate
-        for month in range(1, self.financing.interest_only_period * 12 + 1):
-            schedule_data.append({
-                'month': month,
-                'year': (month - 1) // 12 + 1,
-                'beginning_balance': remaining_balance,
-                'payment': monthly_io_payment,
-                'principal': 0,
-                'interest': monthly_io_payment,
-                'ending_balance': remaining_balance
+        schedule = amortization_arrays(
+            financing.loan_amount,
+            financing.interest_rate,
+            financing.loan_term,
+            financing.amortization_period,
+            financing.interest_only_period
+        )
+        self.months = schedule.pop('month')
+        self.monthly_schedule = {k: v[0] for k, v in schedule.items()}
+        # Pre-aggregated per loan year so annual lookups are plain indexing
+        self.annual_debt_service = self.monthly_schedule['payment'].reshape(-1, 12).sum(axis=1)
+        self.annual_ending_balance = self.monthly_schedule['ending_balance'][11::12]
+        self._amortization_schedule = None
+
+    @property
+    def amortization_schedule(self):
+        """Monthly schedule as a pandas DataFrame, built on first access for display"""
+        if self._amortization_schedule is None:
+            import pandas as pd
+            self._amortization_schedule = pd.DataFrame({
+                'month': self.months,
+                'year': (self.months - 1) // 12 + 1,
+                **self.monthly_schedule
             })
-        amortizing_months = (self.financing.loan_term - self.financing.interest_only_period) * 12
-        if amortizing_months > 0:
-            monthly_payment = npf.pmt(self.monthly_rate, self.financing.amortization_period * 12, -remaining_balance)
-            for month in range(self.financing.interest_only_period * 12 + 1, self.financing.loan_term * 12 + 1):
-                interest_payment = remaining_balance * self.monthly_rate
-                principal_payment = monthly_payment - interest_payment
-                remaining_balance -= principal_payment
-                schedule_data.append({
-                    'month': month,
-                    'year': (month - 1) // 12 + 1,
-                    'beginning_balance': remaining_balance + principal_payment,
-                    'payment': monthly_payment,
-                    'principal': principal_payment,
-                    'interest': interest_payment,
-                    'ending_balance': remaining_balance
-                })
-        return pd.DataFrame(schedule_data)
-
-    def get_annual_debt_service(self, year: int) -> float:
-        year_data = self.amortization_schedule[self.amortization_schedule['year'] == year]
-        return year_data['payment'].sum()
-
-    def get_outstanding_balance(self, year: int) -> float:
-        year_data = self.amortization_schedule[self.amortization_schedule['year'] == year]
-        if len(year_data) > 0:
-            return year_data['ending_balance'].iloc[-1]
-        return 0
+        return self._amortization_schedule
+
+    @staticmethod
+    def _annual_lookup(values: np.ndarray, year):
+        years = np.asarray(year)
+        if len(values) == 0:
+            result = np.zeros(years.shape)
+        else:
+            index = years - 1
+            result = np.where((index >= 0) & (index < len(values)), values[np.clip(index, 0, len(values) - 1)], 0.0)
+        return float(result) if result.ndim == 0 else result
+
+    def get_annual_debt_service(self, year):
+        """Debt service paid in a 1-based loan year (or array of years); 0 outside the loan term"""
+        return self._annual_lookup(self.annual_debt_service, year)
+
+    def get_outstanding_balance(self, year):
+        """Balance at the end of a 1-based loan year (or array of years); 0 outside the loan term"""
+        return self._annual_lookup(self.annual_ending_balance, year)
+
+    def get_monthly_schedule(self, n_months: int) -> Dict[str, np.ndarray]:
+        """Monthly schedule for loan months 1..n_months, zero past the loan term"""
+        return {
+            k: np.concatenate([v[:n_months], np.zeros(max(n_months - len(v), 0))])
+            for k, v in self.monthly_schedule.items()
+        }
+
+def apply_assumptions(assumptions: Dict[str, Any], income_projector, capex_assumptions: Dict, exit_assumptions: Dict):
+    """Route named assumption overrides to the income projector, capex or exit assumptions"""
+    for k, v in assumptions.items():
+        if k in income_projector.assumptions:
+            income_projector.assumptions[k] = v
+        elif k in capex_assumptions:
+            capex_assumptions[k] = v
+        elif k in exit_assumptions:
+            exit_assumptions[k] = v
+        else:
+            raise ValueError(f"Unknown assumption: {k}")
+
+def project_income(income_projector, years: np.ndarray) -> Dict[str, np.ndarray]:
+    """Rental income components, other income and gross income for an array of (0-based) years"""
+    income_data = income_projector.calculate_effective_rental_income(years)
+    other_income = income_projector.calculate_other_income(years)
+    return {
+        **income_data,
+        'other_income': other_income,
+        'gross_income': income_data['effective_rental_income'] + other_income
+    }
+
+def project_expenses(expense_projector, years: np.ndarray, gross_income: np.ndarray, capex_assumptions: Dict = None) -> Dict[str, np.ndarray]:
+    """Operating expenses, NOI, capex reserves and cash flow from operations against gross income"""
+    capex_assumptions = capex_assumptions or DEFAULT_CAPEX_ASSUMPTIONS
+    expense_data = expense_projector.calculate_total_expenses(years, gross_income)
+
+    # NOI calculation
+    noi = gross_income - expense_data['total_expenses']
+
+    # Capital expenditures (reserves)
+    capex = capex_assumptions['capex'] * ((1 + capex_assumptions['capex_growth_rate']) ** years)
+
+    return {
+        **expense_data,
+        'noi': noi,
+        'capex': capex,
+        'cash_flow_operations': noi - capex
+    }
+
+def project_operations(income_projector, expense_projector, debt_calculator, years: np.ndarray, capex_assumptions: Dict = None) -> Dict[str, np.ndarray]:
+    """
+    Vectorized operating and leveraged cash flows for an array of (0-based) years.
+    Projector assumptions may be scalars or per-scenario columns, in which case every
+    output broadcasts to (scenarios x years).
+    """
+    income = project_income(income_projector, years)
+    expenses = project_expenses(expense_projector, years, income['gross_income'], capex_assumptions)
+
+    # Debt service
+    debt_service = debt_calculator.get_annual_debt_service(years + 1)  # Year 1 = index 0
+
+    return {
+        'gross_income': income['gross_income'],
+        'total_expenses': expenses['total_expenses'],
+        'noi': expenses['noi'],
+        'capex': expenses['capex'],
+        'cash_flow_operations': expenses['cash_flow_operations'],
+        'debt_service': debt_service,
+        'leveraged_cash_flow': expenses['cash_flow_operations'] - debt_service,
+        **{k: v for k, v in income.items() if k not in ('other_income', 'gross_income')},
+        **{k: v for k, v in expenses.items() if k not in ('noi', 'capex', 'cash_flow_operations')},
+        'other_income': income['other_income']
+    }
+
+def exit_proceeds(exit_year_noi, outstanding_balance, exit_assumptions: Dict) -> Dict[str, Any]:
+    """Sale price and net proceeds from exit-year NOI; scalars or per-scenario arrays"""
+    exit_cap_rate = np.asarray(exit_assumptions['exit_cap_rate'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross_sale_price = np.where(exit_cap_rate != 0, exit_year_noi / exit_cap_rate, 0.0)
+    cost_of_sale = gross_sale_price * exit_assumptions['cost_of_sale_rate']
+    net_sale_price = gross_sale_price - cost_of_sale
+    return {
+        'exit_noi': exit_year_noi,
+        'gross_sale_price': gross_sale_price,
+        'cost_of_sale': cost_of_sale,
+        'net_sale_price': net_sale_price,
+        'outstanding_balance': outstanding_balance,
+        'net_proceeds': net_sale_price - outstanding_balance
+    }
+
+def hold_period_returns(purchase_price: float, equity_required: float, cash_flow_operations, leveraged_cash_flow, exit_data: Dict) -> Dict[str, Any]:
+    """Leveraged and unleveraged IRR, equity multiple and cash-on-cash for one hold period"""
+    unleveraged_flows = [-purchase_price] + list(np.asarray(cash_flow_operations, dtype=float).tolist())
+    leveraged_flows = [-equity_required] + list(np.asarray(leveraged_cash_flow, dtype=float).tolist())
+    # Add exit proceeds
+    unleveraged_flows[-1] += float(exit_data['net_sale_price'])
+    leveraged_flows[-1] += float(exit_data['net_proceeds'])
+    # Solve both IRRs in one batched pass
+    returns = return_metrics(
+        [unleveraged_flows, leveraged_flows],
+        operating_flows=[cash_flow_operations, leveraged_cash_flow]
+    )
+    return {
+        'unleveraged_irr': float(returns['irr'][0]),
+        'leveraged_irr': float(returns['irr'][1]),
+        'unleveraged_irr_converged': bool(returns['irr_converged'][0]),
+        'leveraged_irr_converged': bool(returns['irr_converged'][1]),
+        'unleveraged_equity_multiple': float(returns['equity_multiple'][0]),
+        'leveraged_equity_multiple': float(returns['equity_multiple'][1]),
+        'cash_on_cash': returns['cash_on_cash'][1].tolist(),
+        'unleveraged_flows': unleveraged_flows,
+        'leveraged_flows': leveraged_flows
+    }
+
+def _exit_year_multiple(initial: float, operating: np.ndarray, proceeds: np.ndarray) -> np.ndarray:
+    """Equity multiple of every exit year from prefix sums, splitting inflows and outflows like return_metrics"""
+    final = operating + proceeds  # The exit year's flow
+    earlier = np.concatenate([[0.0], operating[:-1]])
+    returned = max(initial, 0.0) + np.cumsum(np.maximum(earlier, 0.0)) + np.maximum(final, 0.0)
+    invested = max(-initial, 0.0) + np.cumsum(np.maximum(-earlier, 0.0)) + np.maximum(-final, 0.0)
+    return np.where(invested == 0, 0.0, returned / np.where(invested == 0, 1.0, invested))
+
+def exit_year_returns(purchase_price: float, equity_required: float, cash_flow_operations, leveraged_cash_flow,
+                      exit_data: Dict, discount_rate: float = None) -> Dict[str, np.ndarray]:
+    """
+    Returns for selling at the end of every year 1..N of one N-year projection, where exit_data
+    holds the sale proceeds of each exit year as arrays. Equity multiples (and NPVs at
+    discount_rate) come from prefix sums of the operating flows; both IRRs of every exit year
+    are solved in one batch over the lower-triangular flow matrix, whose rows hold one exit year each.
+    """
+    operating = np.asarray(cash_flow_operations, dtype=float)
+    leveraged = np.asarray(leveraged_cash_flow, dtype=float)
+    n_years = len(operating)
+    exit_years = np.arange(1, n_years + 1)
+    held = exit_years[:, None] >= exit_years  # (exit year, year) within the hold
+    flows = np.zeros((2, n_years, n_years + 1))
+    for i, (initial, annual, proceeds) in enumerate((
+        (-purchase_price, operating, exit_data['net_sale_price']),
+        (-equity_required, leveraged, exit_data['net_proceeds']),
+    )):
+        flows[i, :, 0] = initial
+        flows[i, :, 1:] = np.where(held, annual, 0.0)
+        flows[i, exit_years - 1, exit_years] += proceeds
+    result = irr_batch(flows.reshape(2 * n_years, n_years + 1))
+    irr = result.irr.reshape(2, n_years)
+    converged = result.converged.reshape(2, n_years)
+    curve = {
+        'exit_year': exit_years,
+        'unleveraged_irr': irr[0],
+        'leveraged_irr': irr[1],
+        'unleveraged_irr_converged': converged[0],
+        'leveraged_irr_converged': converged[1],
+        'unleveraged_equity_multiple': _exit_year_multiple(-purchase_price, operating, exit_data['net_sale_price']),
+        'leveraged_equity_multiple': _exit_year_multiple(-equity_required, leveraged, exit_data['net_proceeds']),
+        **{k: np.asarray(exit_data[k], dtype=float) for k in ('exit_noi', 'gross_sale_price', 'net_sale_price', 'outstanding_balance', 'net_proceeds')},
+    }
+    if discount_rate is not None:
+        discount = (1 + discount_rate) ** -exit_years.astype(float)
+        curve['unleveraged_npv'] = -purchase_price + np.cumsum(operating * discount) + exit_data['net_sale_price'] * discount
+        curve['leveraged_npv'] = -equity_required + np.cumsum(leveraged * discount) + exit_data['net_proceeds'] * discount
+    return curve
 
 class CashFlowCalculator:
     """Main cash flow and returns calculation engine"""
-    def __init__(self, model, income_breakdown=None, expense_breakdown=None):
+    def __init__(self, model, income_breakdown=None, expense_breakdown=None, assumptions=None):
         self.model = model
         self.income_projector = IncomeProjector(model)
         self.expense_projector = ExpenseProjector(model)
         self.debt_calculator = DebtServiceCalculator(model.financing)
         self.income_breakdown = income_breakdown or {}
         self.expense_breakdown = expense_breakdown or {}
+        self.capex_assumptions = dict(DEFAULT_CAPEX_ASSUMPTIONS)
+        self.exit_assumptions = dict(DEFAULT_EXIT_ASSUMPTIONS)
+        self._projection = None
+        if assumptions:
+            self.apply_assumptions(assumptions)
+
+    def apply_assumptions(self, assumptions: Dict[str, Any]):
+        """Override income, capex and exit assumptions by name, e.g. {'exit_cap_rate': 0.07}"""
+        apply_assumptions(assumptions, self.income_projector, self.capex_assumptions, self.exit_assumptions)
+        self.reset_projection()
 
     def get_income_breakdown(self, total_other_income):
         breakdown = {}
@@ -166,97 +349,101 @@ class CashFlowCalculator:
                 assumed_flags[k] = True
         return breakdown, assumed_flags
 
-    def calculate_annual_cash_flow(self, year: int) -> Dict[str, Any]:
-        """Calculate complete annual cash flow for given year"""
-        # Income calculations
-        income_data = self.income_projector.calculate_effective_rental_income(year)
-        other_income = self.income_projector.calculate_other_income(year)
-        gross_income = income_data.get('effective_rental_income', 0.0) + other_income
-
-        # Detailed income breakdown
-        income_breakdown, income_assumed = self.get_income_breakdown(other_income)
-
-        # Expense calculations
-        expense_data = self.expense_projector.calculate_total_expenses(year, gross_income)
-        expense_breakdown, expense_assumed = self.get_expense_breakdown(gross_income)
-
-        # NOI calculation
-        noi = gross_income - expense_data.get('total_expenses', 0.0)
-
-        # Capital expenditures (reserves)
-        capex = 40000 * ((1.03) ** year)  # Example assumption
+    @timed_stage('projection')
+    def _project_years(self, years: np.ndarray) -> Dict[str, Any]:
+        """Vectorized cash flow projection for an array of (0-based) years"""
+        flows = project_operations(self.income_projector, self.expense_projector, self.debt_calculator, years, self.capex_assumptions)
+        income_breakdown, income_assumed = self.get_income_breakdown(flows['other_income'])
+        expense_breakdown, expense_assumed = self.get_expense_breakdown(flows['gross_income'])
+        del flows['other_income']
+        return {
+            'flows': flows,
+            'income_breakdown': income_breakdown,
+            'expense_breakdown': expense_breakdown,
+            'assumed': {**income_assumed, **expense_assumed}
+        }
 
-        # Cash flow from operations
-        cash_flow_operations = noi - capex
+    def project(self) -> Dict[str, Any]:
+        """Project every year of the hold period at once as arrays, cached after the first call"""
+        if self._projection is None:
+            hold_period = getattr(self.model.property, 'hold_period', 0)
+            self._projection = self._project_years(np.arange(hold_period))
+        return self._projection
 
-        # Debt service
-        debt_service = self.debt_calculator.get_annual_debt_service(year + 1)  # Year 1 = index 0
+    def reset_projection(self):
+        """Drop the cached projection after changing model inputs or assumptions"""
+        self._projection = None
 
-        # Leveraged cash flow
-        leveraged_cash_flow = cash_flow_operations - debt_service
+    def calculate_annual_cash_flow(self, year: int) -> Dict[str, Any]:
+        """Calculate complete annual cash flow for given year"""
+        projection = self.project()
+        index = year
+        if not 0 <= year < len(projection['flows']['noi']):
+            projection = self._project_years(np.array([year]))
+            index = 0
 
         # Build output with assumed flags only for assumed fields
-        output = {
-            'gross_income': gross_income,
-            'total_expenses': expense_data.get('total_expenses', 0.0),
-            'noi': noi,
-            'capex': capex,
-            'cash_flow_operations': cash_flow_operations,
-            'debt_service': debt_service,
-            'leveraged_cash_flow': leveraged_cash_flow,
-            **income_data,
-            **expense_data
-        }
-        # Add detailed income breakdown
-        for k, v in income_breakdown.items():
-            if k in income_assumed:
-                output[f'{k}_assumed'] = True
-            output[k] = v
-        # Add detailed expense breakdown
-        for k, v in expense_breakdown.items():
-            if k in expense_assumed:
-                output[f'{k}_assumed'] = True
-            output[k] = v
+        output = {k: float(v[index]) for k, v in projection['flows'].items()}
+        for breakdown in (projection['income_breakdown'], projection['expense_breakdown']):
+            for k, v in breakdown.items():
+                if k in projection['assumed']:
+                    output[f'{k}_assumed'] = True
+                output[k] = float(v[index] if np.ndim(v) else v)
         return output
 
+    @timed_stage('annual_rows')
+    def calculate_annual_cash_flows(self) -> List[Dict[str, Any]]:
+        """Annual cash flow rows for every year of the hold period"""
+        return [self.calculate_annual_cash_flow(year) for year in range(len(self.project()['flows']['noi']))]
+
+    @timed_stage('annual_rows')
+    def annual_cash_flow_columns(self) -> Dict[str, Any]:
+        """The annual rows as one list per field, naming the assumed fields once rather than flagging every row"""
+        projection = self.project()
+        n_years = len(projection['flows']['noi'])
+        columns = {k: v.tolist() for k, v in projection['flows'].items()}
+        for breakdown in (projection['income_breakdown'], projection['expense_breakdown']):
+            for k, v in breakdown.items():
+                columns[k] = np.broadcast_to(np.asarray(v, dtype=float), n_years).tolist()
+        return {'columns': columns, 'assumed': [k for k in columns if k in projection['assumed']]}
+
+    @timed_stage('exit')
     def calculate_exit_value(self, exit_year: int) -> Dict[str, float]:
         """Calculate property exit value and proceeds"""
-        exit_cap_rate = 0.08  # Example assumption
         exit_year_noi = self.calculate_annual_cash_flow(exit_year - 1)['noi']
-        gross_sale_price = exit_year_noi / exit_cap_rate if exit_cap_rate else 0.0
-        cost_of_sale = gross_sale_price * 0.015  # 1.5% transaction costs
-        net_sale_price = gross_sale_price - cost_of_sale
         outstanding_balance = self.debt_calculator.get_outstanding_balance(exit_year)
-        net_proceeds = net_sale_price - outstanding_balance
-        return {
-            'exit_noi': exit_year_noi,
-            'gross_sale_price': gross_sale_price,
-            'cost_of_sale': cost_of_sale,
-            'net_sale_price': net_sale_price,
-            'outstanding_balance': outstanding_balance,
-            'net_proceeds': net_proceeds
-        }
+        return {k: float(v) for k, v in exit_proceeds(exit_year_noi, outstanding_balance, self.exit_assumptions).items()}
 
+    @timed_stage('hold_period_curve')
+    def hold_period_curve(self, max_exit_year: int = None, discount_rate: float = None) -> Dict[str, np.ndarray]:
+        """
+        IRR, equity multiple and net proceeds for every exit year from 1 to max_exit_year (the
+        hold period by default), from one projection and one lookup of the loan balances
+        """
+        hold_period = getattr(self.model.property, 'hold_period', 0)
+        n_years = hold_period if max_exit_year is None else max_exit_year
+        if n_years < 1:
+            raise ValueError("max_exit_year must be at least 1")
+        flows = self.project()['flows'] if n_years == hold_period else self._project_years(np.arange(n_years))['flows']
+        exit_years = np.arange(1, n_years + 1)
+        exit_data = exit_proceeds(flows['noi'], self.debt_calculator.get_outstanding_balance(exit_years), self.exit_assumptions)
+        return exit_year_returns(
+            getattr(self.model.property, 'purchase_price', 0.0),
+            getattr(self.model, 'calculate_equity_required', lambda: 0.0)(),
+            flows['cash_flow_operations'],
+            flows['leveraged_cash_flow'],
+            exit_data,
+            discount_rate
+        )
+
+    @timed_stage('irr')
     def calculate_irr(self) -> Dict[str, Any]:
         """Calculate leveraged and unleveraged IRR"""
-        # Generate cash flows for hold period
-        unleveraged_flows = [-getattr(self.model.property, 'purchase_price', 0.0)]
-        leveraged_flows = [-getattr(self.model, 'calculate_equity_required', lambda: 0.0)()]
-        for year in range(getattr(self.model.property, 'hold_period', 0)):
-            annual_cf = self.calculate_annual_cash_flow(year)
-            unleveraged_flows.append(annual_cf['cash_flow_operations'])
-            leveraged_flows.append(annual_cf['leveraged_cash_flow'])
-        # Add exit proceeds
-        exit_data = self.calculate_exit_value(getattr(self.model.property, 'hold_period', 0))
-        if unleveraged_flows:
-            unleveraged_flows[-1] += exit_data['net_sale_price']
-        if leveraged_flows:
-            leveraged_flows[-1] += exit_data['net_proceeds']
-        unleveraged_irr = npf.irr(unleveraged_flows)
-        leveraged_irr = npf.irr(leveraged_flows)
-        return {
-            'unleveraged_irr': unleveraged_irr,
-            'leveraged_irr': leveraged_irr,
-            'unleveraged_flows': unleveraged_flows,
-            'leveraged_flows': leveraged_flows
-        } 
\ No newline at end of file
+        flows = self.project()['flows']
+        return hold_period_returns(
+            getattr(self.model.property, 'purchase_price', 0.0),
+            getattr(self.model, 'calculate_equity_required', lambda: 0.0)(),
+            flows['cash_flow_operations'],
+            flows['leveraged_cash_flow'],
+            self.calculate_exit_value(getattr(self.model.property, 'hold_period', 0))
+        )
@@ -0,0 +1,255 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from .simulation import PERCENTILES, StochasticProcess, _simulate_process
+
+DEFAULT_RATE_PROCESS = StochasticProcess(volatility=0.0075, persistence=0.9, minimum=0.0)
+
+
+@dataclass
+class Tranche:
+    """
+    One loan in the capital stack. rate=None floats at the index plus spread, with the index
+    bounded by floor and cap (a purchased rate cap's strike). amortization_period=None is
+    interest-only to maturity.
+    """
+    name: str
+    amount: Optional[float]  # None only for a refinancing, which then takes out the repaid balance
+    term: int
+    amortization_period: Optional[int] = None
+    interest_only_period: int = 0
+    rate: Optional[float] = None
+    spread: float = 0.0
+    floor: Optional[float] = None
+    cap: Optional[float] = None
+    origination_fee_rate: float = 0.0
+
+    @property
+    def floating(self) -> bool:
+        return self.rate is None
+
+
+@dataclass
+class Refinancing:
+    """Repay a tranche at the end of a (1-based) hold year and fund its replacement at once"""
+    year: int
+    repays: str
+    replacement: Tranche
+
+
+@dataclass
+class _Leg:
+    tranche: Tranche
+    start: int  # First month (0-based)
+    end: int  # One past the last month
+    source: Optional[int] = None  # Leg whose payoff funds this one
+    refinanced: bool = False
+
+
+def rate_paths(forward_curve: Sequence[float], shifts: Sequence[float] = (0.0,), random_paths: int = 0,
+               process: StochasticProcess = DEFAULT_RATE_PROCESS, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Paths x years index rates: the forward curve moved by each parallel shift (decimal, so 0.01
+    is +100bp), followed by random_paths AR(1) paths around it. process.mean is ignored; its
+    volatility, persistence and bounds apply to the deviation from the curve.
+    """
+    forward = np.asarray(forward_curve, dtype=float)
+    paths = [forward + np.asarray(shifts, dtype=float)[:, None]]
+    if random_paths:
+        shocks = np.random.default_rng(seed).standard_normal((random_paths, len(forward)))
+        paths.append(_simulate_process(process, forward, shocks))
+    return np.concatenate(paths)
+
+
+class DebtEngine:
+    """
+    Monthly debt service for a stack of fixed and floating tranches with refinancing events,
+    evaluated for many index-rate paths at once. Every tranche and path is one row of the
+    balance arrays, so the month loop runs once however many paths there are. Amortizing
+    floating loans recast their payment every month over the remaining amortization.
+    """
+    def __init__(self, tranches: Sequence[Tranche], refinancings: Sequence[Refinancing] = (), years: Optional[int] = None):
+        if not tranches:
+            raise ValueError("At least one tranche is required")
+        names = [t.name for t in tranches] + [r.replacement.name for r in refinancings]
+        if len(set(names)) != len(names):
+            raise ValueError("Tranche names must be unique")
+        for tranche in list(tranches) + [r.replacement for r in refinancings]:
+            if tranche.term <= 0:
+                raise ValueError(f"{tranche.name}: term must be positive")
+            if tranche.amortization_period is not None and tranche.amortization_period <= 0:
+                raise ValueError(f"{tranche.name}: amortization_period must be positive")
+        for tranche in tranches:
+            if tranche.amount is None:
+                raise ValueError(f"{tranche.name}: amount is required")
+
+        self.legs: List[_Leg] = [_Leg(t, 0, t.term * 12) for t in tranches]
+        for refinancing in sorted(refinancings, key=lambda r: r.year):
+            index = next((i for i, leg in enumerate(self.legs) if leg.tranche.name == refinancing.repays), None)
+            if index is None:
+                raise ValueError(f"Refinancing repays unknown tranche {refinancing.repays}")
+            leg = self.legs[index]
+            month = refinancing.year * 12
+            if leg.refinanced or not leg.start < month <= leg.end:  # At maturity replaces the balloon
+                raise ValueError(f"{refinancing.repays} is not outstanding to refinance at the end of year {refinancing.year}")
+            leg.end, leg.refinanced = month, True
+            replacement = refinancing.replacement
+            source = index if replacement.amount is None else None
+            self.legs.append(_Leg(replacement, month, month + replacement.term * 12, source))
+        self.years = years if years is not None else -(-max(leg.end for leg in self.legs) // 12)
+
+    @classmethod
+    def from_financing(cls, financing, years: Optional[int] = None) -> 'DebtEngine':
+        """The single fixed-rate loan of a FinancingParameters"""
+        term = max(financing.loan_term, financing.interest_only_period)
+        tranche = Tranche(
+            'senior', financing.loan_amount, term, financing.amortization_period,
+            financing.interest_only_period, rate=financing.interest_rate,
+            origination_fee_rate=financing.loan_origination_fee_rate,
+        )
+        return cls([tranche], years=years)
+
+    @property
+    def floating(self) -> bool:
+        return any(leg.tranche.floating for leg in self.legs)
+
+    def _monthly_index(self, index_rates, frequency: str) -> np.ndarray:
+        """Paths x months index; a curve shorter than the horizon is held flat after its last rate"""
+        months = self.years * 12
+        if index_rates is None:
+            if self.floating:
+                raise ValueError("An index rate curve is required for floating tranches")
+            return np.zeros((1, months))
+        rates = np.atleast_2d(np.asarray(index_rates, dtype=float))
+        if rates.ndim != 2 or rates.shape[1] == 0:
+            raise ValueError("index_rates must be a curve or a paths x periods array")
+        if rates.shape[0] == 0:
+            raise ValueError("index_rates must have at least one path")
+        if frequency == 'annual':
+            rates = np.repeat(rates, 12, axis=1)
+        elif frequency != 'monthly':
+            raise ValueError(f"Unknown frequency: {frequency}")
+        if rates.shape[1] < months:
+            rates = np.concatenate([rates, np.repeat(rates[:, -1:], months - rates.shape[1], axis=1)], axis=1)
+        return rates[:, :months]
+
+    def evaluate(self, index_rates=None, noi=None, frequency: str = 'annual') -> Dict[str, Any]:
+        """
+        Annual debt figures per path, each shaped (paths, years). index_rates is one forward
+        curve or one row per path, annual or monthly. Debt service excludes balloons and
+        refinancing payoffs, which are reported separately; ending_balance is after them.
+        With noi (per year, or per path and year), dscr is noi over debt service (inf without debt).
+        """
+        index = self._monthly_index(index_rates, frequency)
+        n_paths, months = index.shape
+        n_legs, years = len(self.legs), self.years
+        tranches = [leg.tranche for leg in self.legs]
+
+        def column(values):
+            return np.array(values, dtype=float)[:, None]
+
+        start = np.array([leg.start for leg in self.legs])
+        end = np.array([leg.end for leg in self.legs])
+        io_end = start + 12 * np.array([t.interest_only_period for t in tranches])
+        amortizing = np.array([t.amortization_period is not None for t in tranches])
+        amortization_end = io_end + 12 * np.array([t.amortization_period or 0 for t in tranches])
+        floating = np.array([t.floating for t in tranches])[:, None]
+        floor = column([-np.inf if t.floor is None else t.floor for t in tranches])
+        cap = column([np.inf if t.cap is None else t.cap for t in tranches])
+        spread = column([t.spread for t in tranches])
+        fixed = column([0.0 if t.rate is None else t.rate for t in tranches])
+        fee_rate = np.array([t.origination_fee_rate for t in tranches])
+
+        balance = np.zeros((n_legs, n_paths))
+        payoff = np.zeros((n_legs, n_paths))
+        shape = (n_legs, n_paths, years)
+        interest_paid, principal_paid, ending_balance, coupon = (np.zeros(shape) for _ in range(4))
+        balloon, refinanced, proceeds = (np.zeros((n_paths, years)) for _ in range(3))
+        closing_fees = 0.0
+
+        for month in range(months):
+            year = month // 12
+            for i in np.flatnonzero(start == month):
+                leg = self.legs[i]
+                amount = payoff[leg.source] if leg.source is not None else np.full(n_paths, float(leg.tranche.amount))
+                balance[i] = amount
+                if month == 0:
+                    closing_fees += float(amount[0]) * fee_rate[i]
+                else:
+                    # Funded at the same instant the repaid tranche is taken out, at the end of the prior year
+                    proceeds[:, year - 1] += amount * (1 - fee_rate[i])
+            rate = np.where(floating, np.clip(index[:, month], floor, cap) + spread, fixed) / 12
+            interest = balance * rate
+            remaining = np.maximum(amortization_end - month, 1)[:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                annuity = np.where(rate == 0, balance / remaining, interest / (1 - (1 + rate) ** -remaining))
+            in_amortization = (amortizing & (month >= io_end) & (month < amortization_end))[:, None]
+            payment = np.where(in_amortization, annuity, interest)
+            balance = balance - (payment - interest)
+            interest_paid[:, :, year] += interest
+            principal_paid[:, :, year] += payment - interest
+            coupon[:, :, year] += rate * ((start <= month) & (month < end))[:, None]  # Averaged over the year below
+
+            for i in np.flatnonzero(end - 1 == month):
+                payoff[i] = balance[i]
+                if self.legs[i].refinanced:
+                    refinanced[:, year] += balance[i]
+                    proceeds[:, year] -= balance[i]
+                else:
+                    balloon[:, year] += balance[i]
+                balance[i] = 0.0
+            if month % 12 == 11:
+                ending_balance[:, :, year] = balance
+
+        active = (start[:, None] <= np.arange(years) * 12 + 11) & (end[:, None] > np.arange(years) * 12)
+        months_active = np.clip(np.minimum(end[:, None], (np.arange(years) + 1) * 12) - np.maximum(start[:, None], np.arange(years) * 12), 1, 12)
+        average_rate = np.where(active[:, None, :], coupon * 12 / months_active[:, None, :], np.nan)
+        debt_service = interest_paid + principal_paid
+        result = {
+            'years': np.arange(1, years + 1),
+            'paths': n_paths,
+            'debt_service': debt_service.sum(axis=0),
+            'interest': interest_paid.sum(axis=0),
+            'principal': principal_paid.sum(axis=0),
+            'ending_balance': ending_balance.sum(axis=0),
+            'balloon': balloon,
+            'refinanced': refinanced,
+            'net_refinancing_proceeds': proceeds,
+            'closing_fees': closing_fees,
+            'tranches': {
+                t.name: {
+                    'debt_service': debt_service[i],
+                    'interest': interest_paid[i],
+                    'principal': principal_paid[i],
+                    'ending_balance': ending_balance[i],
+                    'rate': average_rate[i],
+                } for i, t in enumerate(tranches)
+            },
+        }
+        if noi is not None:
+            total = result['debt_service']
+            noi = np.broadcast_to(np.asarray(noi, dtype=float), total.shape)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['dscr'] = np.where(total > 0, noi / total, np.inf)
+        return result
+
+
+def summarize(result: Dict[str, Any], dscr_threshold: float = 1.25) -> Dict[str, Any]:
+    """Distribution across paths of peak annual debt service and, when evaluated with noi, minimum DSCR"""
+    def distribution(values: np.ndarray) -> Dict[str, Any]:
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            return {'mean': None, 'min': None, 'max': None, 'percentiles': {}}
+        return {
+            'mean': float(finite.mean()),
+            'min': float(finite.min()),
+            'max': float(finite.max()),
+            'percentiles': dict(zip((f'p{q}' for q in PERCENTILES), np.percentile(finite, PERCENTILES).tolist())),
+        }
+
+    summary = {'paths': result['paths'], 'peak_debt_service': distribution(result['debt_service'].max(axis=1, initial=0.0))}
+    if 'dscr' in result:
+        min_dscr = result['dscr'].min(axis=1, initial=np.inf)
+        summary['min_dscr'] = distribution(min_dscr)
+        summary['dscr_breach_probability'] = float((min_dscr < dscr_threshold).mean())
+    return summary
@@ -0,0 +1,171 @@
+from typing import Dict, NamedTuple
+import numpy as np
+
+# Candidate rates scanned to bracket a root. Dense around 0 and stretched towards -100% and very
+# large rates, so any sign change of NPV on (-1, 1e6] falls between two neighbouring points.
+_RATE_GRID = np.sort(np.concatenate([
+    -1 + np.logspace(-9, -1, 9),
+    np.linspace(-0.9, 1.0, 39),
+    np.logspace(0.1, 6, 12),
+]))
+# Drop the repeated -0.9 (np.unique would import numpy.ma, which costs ~10 ms at startup)
+_RATE_GRID = _RATE_GRID[np.concatenate([[True], np.diff(_RATE_GRID) > 0])]
+
+
+class IRRResult(NamedTuple):
+    irr: np.ndarray  # nan where the solve did not converge
+    converged: np.ndarray
+    iterations: np.ndarray
+
+
+def _npv_and_derivative(flows: np.ndarray, rates: np.ndarray, periods: np.ndarray):
+    discount = (1 + rates)[:, None] ** -periods
+    npv = (flows * discount).sum(axis=1)
+    derivative = -(periods * flows * discount).sum(axis=1) / (1 + rates)
+    return npv, derivative
+
+
+def _refine(flows: np.ndarray, periods: np.ndarray, lo: np.ndarray, hi: np.ndarray, f_lo: np.ndarray, tol: float, max_iter: int):
+    """Safeguarded Newton iteration inside each row's [lo, hi] bracket"""
+    roots = np.full(len(flows), np.nan)
+    converged = np.zeros(len(flows), dtype=bool)
+    iterations = np.full(len(flows), max_iter)
+    active = np.arange(len(flows))
+    rates = np.where(f_lo == 0, lo, (lo + hi) / 2)
+    for iteration in range(1, max_iter + 1):
+        f, df = _npv_and_derivative(flows[active], rates, periods if periods.ndim == 1 else periods[active])
+        # Shrink the bracket around the root
+        same_side = np.sign(f) == np.sign(f_lo)
+        lo = np.where(same_side, rates, lo)
+        f_lo = np.where(same_side, f, f_lo)
+        hi = np.where(same_side, hi, rates)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = rates - f / df
+        bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        new_rates = np.where(bisect, (lo + hi) / 2, step)
+        done = (np.abs(new_rates - rates) <= tol * (1 + np.abs(new_rates))) | (f == 0)
+        rates = np.where(f == 0, rates, new_rates)
+
+        finished = active[done]
+        roots[finished] = rates[done]
+        converged[finished] = True
+        iterations[finished] = iteration
+        keep = ~done
+        active, rates, lo, hi, f_lo = active[keep], rates[keep], lo[keep], hi[keep], f_lo[keep]
+        if len(active) == 0:
+            break
+    return roots, converged, iterations
+
+
+def _grid_npv(flows: np.ndarray, periods: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    with np.errstate(over='ignore', invalid='ignore'):
+        if periods.ndim == 1:
+            return flows @ ((1 + grid)[:, None] ** -periods).T
+        return np.einsum('st,sgt->sg', flows, (1 + grid)[None, :, None] ** -periods[:, None, :])
+
+
+def irr_batch(cash_flows, tol: float = 1e-12, max_iter: int = 100, times=None) -> IRRResult:
+    """
+    Solve the IRR of many cash-flow vectors at once.
+    cash_flows is a (scenarios x periods) array, or a single vector. times optionally gives each
+    column's time in years from the first flow (e.g. days / 365 of dated flows, as XIRR does),
+    shared by every row or one row of times per scenario; by default flows are one period apart
+    and the IRR is per period. Each row is bracketed on a rate
+    grid and refined with Newton steps that fall back to bisection whenever they leave the bracket.
+    When NPV changes sign more than once, the root nearest 0% is returned, as numpy_financial.irr does.
+    Two roots inside one grid cell leave no sign change at the grid points; they are found by
+    solving for the NPV extremum between them and splitting the cell there.
+    Rows without a root on (-100%, 1e6] or that fail to converge are reported with
+    converged=False and irr=nan.
+    """
+    flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n_scenarios, n_periods = flows.shape
+    irr = np.full(n_scenarios, np.nan)
+    converged = np.zeros(n_scenarios, dtype=bool)
+    iterations = np.zeros(n_scenarios, dtype=int)
+    if n_periods < 2:
+        return IRRResult(irr, converged, iterations)
+
+    periods = np.arange(n_periods, dtype=float) if times is None else np.asarray(times, dtype=float)
+    if periods.shape not in ((n_periods,), (n_scenarios, n_periods)):
+        raise ValueError("times needs one entry per cash-flow column")
+    # Keep (1 + r) ** -t finite for long vectors such as monthly flows
+    horizon = max(periods.max(), 1e-9)
+    grid = _RATE_GRID[_RATE_GRID >= -1 + 10 ** (-250 / horizon)]
+    grid_npv = _grid_npv(flows, periods, grid)
+    left, right = grid_npv[:, :-1], grid_npv[:, 1:]
+    sign_change = (np.sign(left) * np.sign(right) <= 0) & ((left != 0) | (right != 0)) & np.isfinite(left) & np.isfinite(right)
+    # How close each bracket can get to 0%; brackets without a sign change are never searched
+    cell_distance = np.where((grid[:-1] <= 0) & (grid[1:] >= 0), 0.0, np.minimum(np.abs(grid[:-1]), np.abs(grid[1:])))
+    distance = np.where(sign_change, cell_distance, np.inf)
+
+    # Solve the nearest bracket first, then any bracket that could still hold a root nearer 0%
+    while True:
+        rows = np.flatnonzero(distance.min(axis=1) < np.where(converged, np.abs(irr), np.inf))
+        if len(rows) == 0:
+            break
+        bracket = np.argmin(distance[rows], axis=1)
+        distance[rows, bracket] = np.inf
+        roots, solved, steps = _refine(flows[rows], periods if periods.ndim == 1 else periods[rows], grid[bracket], grid[bracket + 1], left[rows, bracket], tol, max_iter)
+        better = solved & ~(converged[rows] & (np.abs(irr[rows]) <= np.abs(roots)))
+        irr[rows[better]] = roots[better]
+        converged[rows[better]] = True
+        iterations[rows] += steps
+
+    # NPV has an extremum between two roots in one cell, where its derivative, proportional to
+    # the NPV of t * flows, changes sign. Solve for it in cells that could hold a root nearer 0%,
+    # and split the cell there when NPV at the extremum is on the other side of zero.
+    weighted = flows * periods
+    slope = _grid_npv(weighted, periods, grid)
+    slope_change = (np.sign(slope[:, :-1]) * np.sign(slope[:, 1:]) < 0) & ~sign_change
+    slope_change &= np.isfinite(left) & np.isfinite(right)
+    rows, cells = np.nonzero(slope_change & (cell_distance < np.where(converged, np.abs(irr), np.inf)[:, None]))
+    if len(rows):
+        extremum, found, steps = _refine(
+            weighted[rows], periods if periods.ndim == 1 else periods[rows],
+            grid[cells], grid[cells + 1], slope[rows, cells], tol, max_iter
+        )
+        np.add.at(iterations, rows, steps)
+        peak, _ = _npv_and_derivative(flows[rows], extremum, periods if periods.ndim == 1 else periods[rows])
+        split = found & (np.sign(peak) != np.sign(left[rows, cells]))
+        rows, cells, extremum, peak = rows[split], cells[split], extremum[split], peak[split]
+        # One root either side of the extremum
+        rows = np.concatenate([rows, rows])
+        roots, solved, steps = _refine(
+            flows[rows], periods if periods.ndim == 1 else periods[rows],
+            np.concatenate([grid[cells], extremum]), np.concatenate([extremum, grid[cells + 1]]),
+            np.concatenate([left[rows[:len(cells)], cells], peak]), tol, max_iter
+        )
+        np.add.at(iterations, rows, steps)
+        # Keep each row's root nearest 0%
+        rows, roots = rows[solved], roots[solved]
+        order = np.lexsort((np.abs(roots), rows))
+        rows, first = np.unique(rows[order], return_index=True)
+        roots = roots[order][first]
+        better = ~(converged[rows] & (np.abs(irr[rows]) <= np.abs(roots)))
+        irr[rows[better]] = roots[better]
+        converged[rows[better]] = True
+    return IRRResult(irr, converged, iterations)
+
+
+def return_metrics(cash_flows, operating_flows=None, times=None) -> Dict[str, np.ndarray]:
+    """
+    IRR, equity multiple and cash-on-cash for a batch of cash-flow vectors in one pass.
+    Equity invested is the sum of outflows and cash returned the sum of inflows. Cash-on-cash is
+    computed per period from operating_flows (scenarios x periods-1, excluding exit proceeds),
+    defaulting to the flows after period 0. times is passed through to irr_batch.
+    """
+    flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    operating = flows[:, 1:] if operating_flows is None else np.atleast_2d(np.asarray(operating_flows, dtype=float))
+    result = irr_batch(flows, times=times)
+    equity_invested = -np.where(flows < 0, flows, 0.0).sum(axis=1)
+    cash_returned = np.where(flows > 0, flows, 0.0).sum(axis=1)
+    invested = np.where(equity_invested == 0, 1.0, equity_invested)
+    cash_on_cash = np.where(equity_invested[:, None] == 0, 0.0, operating / invested[:, None])
+    return {
+        'irr': result.irr,
+        'irr_converged': result.converged,
+        'equity_multiple': np.where(equity_invested == 0, 0.0, cash_returned / invested),
+        'cash_on_cash': cash_on_cash,
+        'average_cash_on_cash': cash_on_cash.mean(axis=1) if cash_on_cash.shape[1] else np.zeros(len(flows)),
+    }
@@ -0,0 +1,151 @@
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from models.rentroll import OCCUPIED_STATUSES, ColumnarRentRoll
+from .assumptions import DEFAULT_LEASING_ASSUMPTIONS
+from .cashflow import IncomeProjector
+from .monthly import ROLLUP_PERIODS
+
+LEASING_FIELDS = [
+    'market_rent', 'loss_to_lease', 'scheduled_rent', 'vacancy_loss', 'rental_income',
+    'expirations', 'move_ins', 'occupancy',
+]
+AVERAGED_FIELDS = ('occupancy',)  # Rolled up as the period average rather than the sum
+UNIT_CHUNK_SIZE = 5_000  # Units per block, bounding the units x months arrays
+
+
+class LeaseRolloverProjector:
+    """
+    Monthly rental income projected unit by unit from a rent roll. Each occupied unit pays its
+    contract rent until its lease expires, then rolls over every lease_term months: the tenant
+    renews with renewal_probability (at market, or at most renewal_increase_cap above the expiring
+    rent), otherwise the unit is vacant for downtime_months and re-leases at market. Vacant units
+    lease up at market after downtime_months. Market rents grow at each anniversary like the
+    annual engine, so in-place rents below market burn off as leases roll.
+
+    Values are expectations over renewal outcomes, so one pass covers every unit. Rents are
+    solved once per rollover over (units,) arrays, then spread onto a units x months grid by
+    indexing; no loop runs per unit or per month.
+    """
+    def __init__(self, rent_roll: ColumnarRentRoll, start_date: str, years: int, assumptions: Optional[Dict[str, Any]] = None,
+                 occupied_statuses: Tuple[str, ...] = OCCUPIED_STATUSES):
+        income = IncomeProjector(None)
+        self.assumptions = {**DEFAULT_LEASING_ASSUMPTIONS, 'rent_growth_rates': income.assumptions['rent_growth_rates']}
+        for key, value in (assumptions or {}).items():
+            if key not in self.assumptions:
+                raise ValueError(f"Unknown leasing assumption: {key}")
+            self.assumptions[key] = value
+        lease_term = self.assumptions['lease_term']
+        if years < 1:
+            raise ValueError("years must be at least 1")
+        if lease_term < 1:
+            raise ValueError("lease_term must be at least 1 month")
+        if not 0 <= self.assumptions['downtime_months'] < lease_term:
+            raise ValueError("downtime_months must be at least 0 and shorter than lease_term")
+        if not 0 <= self.assumptions['renewal_probability'] <= 1:
+            raise ValueError("renewal_probability must be between 0 and 1")
+        cap = self.assumptions['renewal_increase_cap']
+        if cap is not None and cap < 0:
+            raise ValueError("renewal_increase_cap must be at least 0")
+
+        self.rent_roll = rent_roll
+        self.years = years
+        self.n_months = years * 12
+        income.assumptions['rent_growth_rates'] = self.assumptions['rent_growth_rates']
+        self.month_growth = income.rent_growth_factors(years)[np.arange(self.n_months) // 12]
+        self.occupied = rent_roll.occupied(occupied_statuses)
+        self.first_rollover = self._first_rollover(np.datetime64(str(start_date)[:10], 'D'))
+        self._projection = None
+
+    def _first_rollover(self, start: np.datetime64) -> np.ndarray:
+        """
+        Month each unit's lease first rolls over: the month after it expires, at once if it already
+        has; vacant units at month 0. Occupied units without an expiration date are taken to expire
+        evenly over the next lease_term months.
+        """
+        expiration = self.rent_roll.lease_expiration
+        known = ~np.isnat(expiration)
+        months_left = (expiration.astype('datetime64[M]') - start.astype('datetime64[M]')).astype(np.int64)
+        first = np.where(known, np.maximum(months_left + 1, 0), 0)
+        unknown = np.flatnonzero(self.occupied & ~known)
+        first[unknown] = np.arange(len(unknown)) * self.assumptions['lease_term'] // max(len(unknown), 1) + 1
+        first[~self.occupied] = 0
+        return first
+
+    def _project_units(self, units: slice) -> Dict[str, np.ndarray]:
+        """Monthly totals over one block of units"""
+        term = self.assumptions['lease_term']
+        downtime = self.assumptions['downtime_months']
+        renewal_probability = self.assumptions['renewal_probability']
+        cap = self.assumptions['renewal_increase_cap']
+        n_months = self.n_months
+        occupied = self.occupied[units]
+        first = self.first_rollover[units]
+        market = self.rent_roll.market_rent[units].astype(float)
+        contract = self.rent_roll.actual_rent[units].astype(float)
+        contract = np.where(occupied & (contract <= 0), market, contract)  # No in-place rent given: at market
+        n_units = len(market)
+
+        # Expected rent after k rollovers, and the renewing tenants' share of it, which is all
+        # that is collected during downtime; the first rollover of a vacant unit is a lease-up
+        n_rollovers = max((n_months - 1 - int(first.min())) // term + 1, 0)  # None when every lease runs past the horizon
+        rent = np.empty((n_rollovers + 1, n_units))
+        renewing = np.empty((n_rollovers + 1, n_units))
+        stays = np.empty((n_rollovers + 1, n_units))
+        rent[0] = renewing[0] = contract
+        stays[0] = 1.0
+        for k in range(1, n_rollovers + 1):
+            month = np.minimum(first + (k - 1) * term, n_months - 1)
+            market_at_rollover = market * self.month_growth[month]
+            renewal = market_at_rollover if cap is None else np.minimum(market_at_rollover, rent[k - 1] * (1 + cap))
+            stays[k] = renewal_probability if k > 1 else np.where(occupied, renewal_probability, 0.0)
+            renewing[k] = stays[k] * renewal
+            rent[k] = renewing[k] + (1 - stays[k]) * market_at_rollover
+
+        since = np.arange(n_months) - first[:, None]
+        rollovers = np.where(since >= 0, since // term + 1, 0)
+        cycle_month = since % term
+        in_downtime = (since >= 0) & (cycle_month < downtime)
+        rolling = (since >= 0) & (cycle_month == 0)
+        column = np.arange(n_units)[:, None]
+        scheduled = rent[rollovers, column]
+        collected = np.where(in_downtime, renewing[rollovers, column], scheduled)
+        stay = stays[rollovers, column]
+        expiring = rolling & ((rollovers > 1) | occupied[:, None])
+        return {
+            'market_rent': market.sum() * self.month_growth,
+            'scheduled_rent': scheduled.sum(axis=0),
+            'rental_income': collected.sum(axis=0),
+            'expirations': expiring.sum(axis=0).astype(float),
+            'move_ins': np.where(rolling, 1 - stay, 0.0).sum(axis=0),
+            'occupied_units': n_units - np.where(in_downtime, 1 - stay, 0.0).sum(axis=0),
+        }
+
+    def project(self) -> Dict[str, np.ndarray]:
+        """One array of years x 12 monthly values per LEASING_FIELDS entry, summed over units"""
+        if self._projection is not None:
+            return self._projection
+        n_units = len(self.rent_roll)
+        totals = {k: np.zeros(self.n_months) for k in ('market_rent', 'scheduled_rent', 'rental_income', 'expirations', 'move_ins', 'occupied_units')}
+        for start in range(0, n_units, UNIT_CHUNK_SIZE):
+            for k, v in self._project_units(slice(start, start + UNIT_CHUNK_SIZE)).items():
+                totals[k] += v
+        flows = {
+            'market_rent': totals['market_rent'],
+            'loss_to_lease': totals['market_rent'] - totals['scheduled_rent'],
+            'scheduled_rent': totals['scheduled_rent'],
+            'vacancy_loss': totals['scheduled_rent'] - totals['rental_income'],
+            'rental_income': totals['rental_income'],
+            'expirations': totals['expirations'],
+            'move_ins': totals['move_ins'],
+            'occupancy': totals['occupied_units'] / n_units if n_units else np.zeros(self.n_months),
+        }
+        self._projection = {k: flows[k] for k in LEASING_FIELDS}
+        return self._projection
+
+    def rollup(self, period: str = 'annual') -> Dict[str, np.ndarray]:
+        """Monthly values summed (occupancy averaged) into quarters or years"""
+        size = ROLLUP_PERIODS[period]
+        return {
+            k: v.reshape(-1, size).mean(axis=1) if k in AVERAGED_FIELDS else v.reshape(-1, size).sum(axis=1)
+            for k, v in self.project().items()
+        }
@@ -1,12 +1,12 @@
 from typing import List
-import numpy_financial as npf
+from .irr import irr_batch
 
 def calculate_irr(cash_flows: List[float]) -> float:
-    """Calculate the Internal Rate of Return (IRR) for a series of cash flows."""
+    """Calculate the Internal Rate of Return (IRR) for a series of cash flows (nan if it does not converge)."""
     if not cash_flows or len(cash_flows) < 2:
         return 0.0
-    irr = npf.irr(cash_flows)
-    return round(irr, 6) if irr is not None else 0.0
+    result = irr_batch(cash_flows)
+    return round(float(result.irr[0]), 6)
 
 def calculate_cash_on_cash(annual_cash_flow: float, equity_invested: float) -> float:
     """Calculate the cash-on-cash return."""
@@ -0,0 +1,128 @@
+import numpy as np
+from datetime import date
+from typing import Dict, Any
+from .assumptions import DEFAULT_CAPEX_ASSUMPTIONS, DEFAULT_EXIT_ASSUMPTIONS
+from .cashflow import IncomeProjector, ExpenseProjector, DebtServiceCalculator, apply_assumptions, exit_proceeds
+from .irr import return_metrics
+
+MONTHLY_FIELDS = [
+    'market_rent', 'vacancy_loss', 'concessions', 'bad_debt', 'effective_rental_income', 'other_income',
+    'gross_income', 'variable_expenses', 'management_fee', 'fixed_expenses', 'total_expenses',
+    'noi', 'capex', 'cash_flow_operations', 'interest', 'principal', 'debt_service', 'leveraged_cash_flow'
+]
+CAPEX_TIMINGS = ('spread', 'start', 'end')  # Evenly each month, or the first / last month of each year
+ROLLUP_PERIODS = {'quarterly': 3, 'annual': 12}
+
+
+def monthly_dates(transaction_date: str, n_months: int) -> np.ndarray:
+    """Dates of the acquisition (index 0) and of each following month end-of-period flow"""
+    start = date.fromisoformat(str(transaction_date)[:10])
+    months = np.datetime64(start.strftime('%Y-%m'), 'M') + np.arange(n_months + 1)
+    # Same day of the month as the acquisition, clipped to shorter months
+    month_days = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+    return months.astype('datetime64[D]') + np.minimum(start.day, month_days) - 1
+
+
+class MonthlyCashFlowCalculator:
+    """
+    Monthly-resolution projection over hold_period x 12 periods as flat arrays.
+    Rents grow at each anniversary like the annual engine, so annual rollups reproduce the
+    annual NOI; debt service comes straight from the monthly amortization schedule.
+    """
+    def __init__(self, model, assumptions=None, capex_timing: str = 'spread'):
+        if capex_timing not in CAPEX_TIMINGS:
+            raise ValueError(f"Unknown capex timing: {capex_timing}")
+        self.model = model
+        self.capex_timing = capex_timing
+        self.income_projector = IncomeProjector(model)
+        self.expense_projector = ExpenseProjector(model)
+        self.debt_calculator = DebtServiceCalculator(model.financing)
+        self.capex_assumptions = dict(DEFAULT_CAPEX_ASSUMPTIONS)
+        self.exit_assumptions = dict(DEFAULT_EXIT_ASSUMPTIONS)
+        apply_assumptions(assumptions or {}, self.income_projector, self.capex_assumptions, self.exit_assumptions)
+        self.hold_period = model.property.hold_period
+        if self.hold_period < 1:
+            raise ValueError("hold_period must be at least 1 year")
+        self._projection = None
+
+    def project(self) -> Dict[str, np.ndarray]:
+        """One array of hold_period x 12 monthly values per MONTHLY_FIELDS entry"""
+        if self._projection is not None:
+            return self._projection
+        n_months = self.hold_period * 12
+        years = np.arange(n_months) // 12
+        income = self.income_projector
+        market_rent = income.base_monthly_rent() * income.rent_growth_factors(self.hold_period)[years]
+        flows = {'market_rent': market_rent}
+        for k in ('vacancy', 'concessions', 'bad_debt'):
+            flows['vacancy_loss' if k == 'vacancy' else k] = market_rent * income.assumptions[f'{k}_rate']
+        flows['effective_rental_income'] = market_rent - flows['vacancy_loss'] - flows['concessions'] - flows['bad_debt']
+        flows['other_income'] = income.calculate_other_income(years) / 12
+        flows['gross_income'] = flows['effective_rental_income'] + flows['other_income']
+
+        # Expense projections are annual amounts; the management fee scales with income
+        annual_expenses = self.expense_projector.calculate_total_expenses(years, flows['gross_income'] * 12)
+        flows.update({k: v / 12 for k, v in annual_expenses.items()})
+        flows['noi'] = flows['gross_income'] - flows['total_expenses']
+
+        annual_capex = self.capex_assumptions['capex'] * (1 + self.capex_assumptions['capex_growth_rate']) ** years
+        month_of_year = np.arange(n_months) % 12
+        if self.capex_timing == 'spread':
+            flows['capex'] = annual_capex / 12
+        else:
+            flows['capex'] = np.where(month_of_year == (0 if self.capex_timing == 'start' else 11), annual_capex, 0.0)
+        flows['cash_flow_operations'] = flows['noi'] - flows['capex']
+
+        loan = self.debt_calculator.get_monthly_schedule(n_months)
+        flows['interest'] = loan['interest']
+        flows['principal'] = loan['principal']
+        flows['debt_service'] = loan['payment']
+        flows['leveraged_cash_flow'] = flows['cash_flow_operations'] - flows['debt_service']
+        self._projection = {k: flows[k] for k in MONTHLY_FIELDS}
+        return self._projection
+
+    def rollup(self, period: str = 'annual') -> Dict[str, np.ndarray]:
+        """Monthly flows summed into quarters or years"""
+        size = ROLLUP_PERIODS[period]
+        return {k: v.reshape(-1, size).sum(axis=1) for k, v in self.project().items()}
+
+    def calculate_exit_value(self) -> Dict[str, float]:
+        """Sale at the end of the last month, capitalizing the trailing twelve months' NOI"""
+        n_months = self.hold_period * 12
+        trailing_noi = self.project()['noi'][-12:].sum()
+        balance = self.debt_calculator.get_monthly_schedule(n_months)['ending_balance'][-1]
+        return {k: float(v) for k, v in exit_proceeds(trailing_noi, balance, self.exit_assumptions).items()}
+
+    def calculate_irr(self) -> Dict[str, Any]:
+        """Monthly IRR (and its annualized rate) plus XIRR over the actual flow dates"""
+        flows = self.project()
+        exit_data = self.calculate_exit_value()
+        purchase_price = self.model.property.purchase_price
+        equity_required = self.model.calculate_equity_required()
+        unleveraged = np.concatenate([[-purchase_price], flows['cash_flow_operations']])
+        leveraged = np.concatenate([[-equity_required], flows['leveraged_cash_flow']])
+        unleveraged[-1] += exit_data['net_sale_price']
+        leveraged[-1] += exit_data['net_proceeds']
+        stacked = np.stack([unleveraged, leveraged])
+
+        # Month k sits at k/12 years, so the monthly solve yields the effective annual rate
+        # directly; XIRR uses actual days / 365. Both are solved in one batched pass.
+        dates = monthly_dates(self.model.property.transaction_date, len(unleveraged) - 1)
+        month_times = np.arange(len(unleveraged)) / 12
+        date_times = (dates - dates[0]).astype(float) / 365
+        returns = return_metrics(
+            np.concatenate([stacked, stacked]),
+            times=np.stack([month_times, month_times, date_times, date_times])
+        )
+        result = {'dates': dates.astype(str).tolist()}
+        for i, kind in enumerate(('unleveraged', 'leveraged')):
+            annual_irr = float(returns['irr'][i])
+            result.update({
+                f'{kind}_monthly_irr': (1 + annual_irr) ** (1 / 12) - 1,
+                f'{kind}_irr': annual_irr,
+                f'{kind}_xirr': float(returns['irr'][i + 2]),
+                f'{kind}_irr_converged': bool(returns['irr_converged'][i]),
+                f'{kind}_equity_multiple': float(returns['equity_multiple'][i]),
+                f'{kind}_flows': stacked[i].tolist(),
+            })
+        return result
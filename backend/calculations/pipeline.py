@@ -0,0 +1,159 @@
+import threading
+import numpy as np
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+from .assumptions import DEFAULT_CAPEX_ASSUMPTIONS, DEFAULT_EXIT_ASSUMPTIONS
+from .cashflow import (
+    IncomeProjector, ExpenseProjector, DebtServiceCalculator,
+    exit_proceeds, hold_period_returns, project_expenses, project_income
+)
+
+INCOME_ASSUMPTIONS = tuple(IncomeProjector(None).assumptions)
+DEBT_FIELDS = ('loan_amount', 'interest_rate', 'loan_term', 'amortization_period', 'interest_only_period')
+
+
+class Stage(NamedTuple):
+    name: str
+    depends: Tuple[str, ...]
+    inputs: Callable[[Dict[str, Any]], Dict[str, Any]]  # Picks the stage's own inputs out of a scenario
+    compute: Callable[[Dict[str, Any], Dict[str, Dict]], Dict[str, Any]]  # (inputs, upstream outputs) -> outputs
+
+
+def _assumptions(scenario: Dict[str, Any], names) -> Dict[str, Any]:
+    """Assumption overrides that were actually set (None keeps the engine default)"""
+    assumptions = scenario.get('assumptions') or {}
+    return {k: assumptions[k] for k in names if assumptions.get(k) is not None}
+
+
+def _income_inputs(scenario):
+    return {
+        'units': [(unit['market_rent'], unit['unit_count']) for unit in scenario['unit_types']],
+        'hold_period': scenario['property']['hold_period'],
+        'assumptions': _assumptions(scenario, INCOME_ASSUMPTIONS),
+    }
+
+
+def _income(inputs, upstream):
+    unit_types = [SimpleNamespace(market_rent=rent, unit_count=count) for rent, count in inputs['units']]
+    projector = IncomeProjector(SimpleNamespace(unit_types=unit_types))
+    projector.assumptions.update(inputs['assumptions'])
+    return project_income(projector, np.arange(inputs['hold_period']))
+
+
+def _expenses_inputs(scenario):
+    return {
+        'hold_period': scenario['property']['hold_period'],
+        'capex': {**DEFAULT_CAPEX_ASSUMPTIONS, **_assumptions(scenario, DEFAULT_CAPEX_ASSUMPTIONS)},
+    }
+
+
+def _expenses(inputs, upstream):
+    years = np.arange(inputs['hold_period'])
+    return project_expenses(ExpenseProjector(None), years, upstream['income']['gross_income'], inputs['capex'])
+
+
+def _debt_inputs(scenario):
+    return {
+        'financing': {k: scenario['financing'][k] for k in DEBT_FIELDS},
+        'hold_period': scenario['property']['hold_period'],
+    }
+
+
+def _debt(inputs, upstream):
+    calculator = DebtServiceCalculator(SimpleNamespace(**inputs['financing']))
+    loan_years = np.arange(1, inputs['hold_period'] + 1)
+    return {
+        'debt_service': calculator.get_annual_debt_service(loan_years),
+        'outstanding_balance': calculator.get_outstanding_balance(loan_years),
+    }
+
+
+def _exit_inputs(scenario):
+    return {**DEFAULT_EXIT_ASSUMPTIONS, **_assumptions(scenario, DEFAULT_EXIT_ASSUMPTIONS)}
+
+
+def _exit(inputs, upstream):
+    data = exit_proceeds(upstream['expenses']['noi'][-1], upstream['debt']['outstanding_balance'][-1], inputs)
+    return {k: float(v) for k, v in data.items()}
+
+
+def _returns_inputs(scenario):
+    financing = scenario['financing']
+    return {
+        'purchase_price': scenario['property']['purchase_price'],
+        'loan_amount': financing['loan_amount'],
+        'loan_origination_fee_rate': financing.get('loan_origination_fee_rate', 0.01),
+    }
+
+
+def _returns(inputs, upstream):
+    loan_amount = inputs['loan_amount']
+    equity_required = inputs['purchase_price'] - loan_amount + loan_amount * inputs['loan_origination_fee_rate']
+    cash_flow_operations = upstream['expenses']['cash_flow_operations']
+    leveraged_cash_flow = cash_flow_operations - upstream['debt']['debt_service']
+    return {
+        'equity_required': equity_required,
+        'leveraged_cash_flow': leveraged_cash_flow,
+        **hold_period_returns(inputs['purchase_price'], equity_required, cash_flow_operations, leveraged_cash_flow, upstream['exit']),
+    }
+
+
+# In dependency order: every stage comes after the stages it depends on
+STAGES = (
+    Stage('income', (), _income_inputs, _income),
+    Stage('expenses', ('income',), _expenses_inputs, _expenses),
+    Stage('debt', (), _debt_inputs, _debt),
+    Stage('exit', ('expenses', 'debt'), _exit_inputs, _exit),
+    Stage('returns', ('expenses', 'debt', 'exit'), _returns_inputs, _returns),
+)
+
+
+def _same(a, b) -> bool:
+    if np.isscalar(a) and np.isscalar(b):
+        return a == b or (a != a and b != b)  # nan == nan
+    a, b = np.asarray(a), np.asarray(b)
+    return a.shape == b.shape and bool(np.array_equal(a, b, equal_nan=a.dtype.kind == 'f' and b.dtype.kind == 'f'))
+
+
+class AnalysisPipeline:
+    """
+    The single-scenario analysis as a dependency graph of memoized stages:
+
+        income -> expenses --+--> exit --> returns
+        debt ----------------+
+
+    A stage reruns only when its own inputs change or an upstream stage's outputs changed,
+    so editing the interest rate recomputes debt, exit and returns but not income or expenses.
+    Scenarios are plain dicts shaped like the /analyze request.
+    """
+    def __init__(self, stages: Tuple[Stage, ...] = STAGES):
+        self.stages = stages
+        self.outputs: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        self._memo: Dict[str, tuple] = {}  # name -> (inputs, upstream versions)
+        self._lock = threading.Lock()
+
+    def run(self, scenario: Dict[str, Any]) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Bring every stage up to date with the scenario.
+        Returns the stages that were recomputed and, per stage, the outputs whose values changed.
+        """
+        if scenario['property']['hold_period'] < 1:
+            raise ValueError("hold_period must be at least 1 year")
+        recomputed, changes = [], {}
+        with self._lock:
+            for stage in self.stages:
+                key = (stage.inputs(scenario), tuple(self.versions[name] for name in stage.depends))
+                if self._memo.get(stage.name) == key:
+                    continue
+                outputs = stage.compute(key[0], {name: self.outputs[name] for name in stage.depends})
+                previous = self.outputs.get(stage.name, {})
+                changed = {k: v for k, v in outputs.items() if k not in previous or not _same(previous[k], v)}
+                self._memo[stage.name] = key
+                self.outputs[stage.name] = outputs
+                recomputed.append(stage.name)
+                if changed:
+                    # Unchanged outputs leave the version alone, so downstream stages stay clean
+                    self.versions[stage.name] = self.versions.get(stage.name, 0) + 1
+                    changes[stage.name] = changed
+        return recomputed, changes
@@ -0,0 +1,152 @@
+import math
+import numpy as np
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .batch import BatchCashFlowCalculator, stack_assumptions
+from .irr import return_metrics
+from .parallel import map_chunks, worker_count
+
+# Properties per array pass. A vectorized pass over 1,000 properties takes tens of
+# milliseconds, about what a worker process costs to start, so smaller roll-ups run inline.
+MIN_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 5_000  # Bounds a worker's peak memory
+CALENDAR_FIELDS = (
+    'unleveraged_cash_flow', 'leveraged_cash_flow', 'noi', 'debt_service',
+    'outstanding_debt', 'maturing_debt', 'maturing_loans'
+)
+PROPERTY_FIELDS = (
+    'acquisition_year', 'exit_year', 'equity_required',
+    'unleveraged_irr', 'leveraged_irr', 'unleveraged_equity_multiple', 'leveraged_equity_multiple'
+)
+
+Series = Tuple[int, np.ndarray]  # (first calendar year, values per year)
+
+
+def acquisition_year(model) -> int:
+    """Calendar year of the property's ISO transaction_date"""
+    try:
+        return date.fromisoformat(str(model.property.transaction_date)[:10]).year
+    except ValueError:
+        raise ValueError(f"Invalid transaction_date: {model.property.transaction_date!r}") from None
+
+
+def _to_calendar(start_years: np.ndarray, rows: np.ndarray) -> Series:
+    """Sum per-property rows (column k falls in calendar year start_year + k) onto one year axis"""
+    first = int(start_years.min())
+    offsets = (start_years - first)[:, None] + np.arange(rows.shape[1])
+    total = np.zeros(int(offsets.max(initial=0)) + 1)
+    np.add.at(total, offsets.ravel(), rows.ravel())
+    return first, total
+
+
+def _add_series(a: Optional[Series], b: Series) -> Series:
+    if a is None:
+        return b
+    first = min(a[0], b[0])
+    total = np.zeros(max(a[0] + len(a[1]), b[0] + len(b[1])) - first)
+    for start, values in (a, b):
+        total[start - first:start - first + len(values)] += values
+    return first, total
+
+
+def _evaluate_chunk(task) -> Dict[str, Any]:
+    """Project one chunk of properties and roll it up by calendar year; module-level for the process pool"""
+    start, models, assumptions, acquisition_years = task
+    calculator = BatchCashFlowCalculator.from_models(models, stack_assumptions(assumptions))
+    irr = calculator.calculate_irr()
+    projection = calculator.project()
+    hold_period = calculator.hold_period
+    n_years = projection['noi'].shape[1]
+    loan_amount = calculator.columns['loan_amount']
+
+    # Loan balance at each year end while held; the year of exit is repaid from the sale
+    loan_years = np.arange(n_years)
+    balances = calculator.debt_calculator.get_balance_schedule(loan_years)
+    balances[:, 0] = loan_amount
+    balances = np.where(loan_years < hold_period[:, None], balances, 0.0)
+    # Scheduled maturity: the balloon left when each loan's term runs out, for loans still
+    # outstanding then; a sale before maturity repays the loan instead
+    maturity = np.maximum(calculator.columns['loan_term'], calculator.columns['interest_only_period']).astype(int)
+    has_loan = ((loan_amount > 0) & (maturity <= hold_period)).astype(float)
+
+    flows = {'unleveraged': irr['unleveraged_flows'], 'leveraged': irr['leveraged_flows']}
+    series = {
+        'unleveraged_cash_flow': _to_calendar(acquisition_years, flows['unleveraged']),
+        'leveraged_cash_flow': _to_calendar(acquisition_years, flows['leveraged']),
+        # Operating year k is reported in the calendar year it ends, acquisition year + k
+        'noi': _to_calendar(acquisition_years + 1, projection['noi']),
+        'debt_service': _to_calendar(acquisition_years + 1, projection['debt_service']),
+        'outstanding_debt': _to_calendar(acquisition_years, balances),
+        'maturing_debt': _to_calendar(acquisition_years + maturity, (calculator.debt_calculator.get_outstanding_balance(maturity) * has_loan)[:, None]),
+        'maturing_loans': _to_calendar(acquisition_years + maturity, has_loan[:, None]),
+    }
+    totals = {
+        f'{kind}_{total}': float(np.where(sign * v > 0, sign * v, 0.0).sum())
+        for kind, v in flows.items() for total, sign in (('invested', -1), ('returned', 1))
+    }
+    properties = {
+        'acquisition_year': acquisition_years,
+        'exit_year': acquisition_years + hold_period,
+        'equity_required': calculator.equity_required,
+        **{k: irr[k] for k in PROPERTY_FIELDS[3:]},
+    }
+    return {'start': start, 'series': series, 'totals': totals, 'properties': properties}
+
+
+def portfolio_rollup(models: Sequence, assumptions: List[Dict[str, Any]] = None, max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Evaluate many properties (each a RealEstateModel for its selected scenario) across a process
+    pool and combine them on calendar years from each transaction_date: portfolio cash flows,
+    IRR, equity multiple, outstanding debt and the debt maturity profile, plus per-property returns.
+    By default every worker gets one chunk (of at least MIN_CHUNK_SIZE properties), so large
+    roll-ups scale with the cores available.
+    """
+    n = len(models)
+    if n == 0:
+        raise ValueError("A portfolio needs at least one property")
+    assumptions = assumptions or [{} for _ in models]
+    if len(assumptions) != n:
+        raise ValueError("One assumptions dict per property is required")
+    years = np.array([acquisition_year(m) for m in models])
+    if chunk_size is None:
+        chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, math.ceil(n / worker_count(max_workers))))
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    tasks = [
+        (start, list(models[start:start + chunk_size]), assumptions[start:start + chunk_size], years[start:start + chunk_size])
+        for start in range(0, n, chunk_size)
+    ]
+
+    series: Dict[str, Optional[Series]] = {k: None for k in CALENDAR_FIELDS}
+    totals: Dict[str, float] = {}
+    properties = {k: np.zeros(n) for k in PROPERTY_FIELDS}
+    for chunk in map_chunks(_evaluate_chunk, tasks, max_workers):
+        for k, v in chunk['series'].items():
+            series[k] = _add_series(series[k], v)
+        for k, v in chunk['totals'].items():
+            totals[k] = totals.get(k, 0.0) + v
+        rows = slice(chunk['start'], chunk['start'] + len(chunk['properties']['exit_year']))
+        for k, v in chunk['properties'].items():
+            properties[k][rows] = v
+
+    # One calendar axis spanning every series
+    first = min(s[0] for s in series.values())
+    last = max(s[0] + len(s[1]) for s in series.values())
+    calendar = {k: _add_series((first, np.zeros(last - first)), s)[1] for k, s in series.items()}
+    returns = return_metrics([calendar['unleveraged_cash_flow'], calendar['leveraged_cash_flow']])
+    result = {
+        'years': np.arange(first, last),
+        **calendar,
+        'unleveraged_irr': returns['irr'][0],
+        'leveraged_irr': returns['irr'][1],
+        'unleveraged_irr_converged': returns['irr_converged'][0],
+        'leveraged_irr_converged': returns['irr_converged'][1],
+    }
+    for kind in ('unleveraged', 'leveraged'):
+        invested = totals[f'{kind}_invested']
+        result[f'{kind}_equity_multiple'] = totals[f'{kind}_returned'] / invested if invested else 0.0
+    result['equity_required'] = float(properties['equity_required'].sum())
+    for k in ('acquisition_year', 'exit_year'):
+        properties[k] = properties[k].astype(int)
+    result['properties'] = properties
+    return result
@@ -0,0 +1,52 @@
+import numpy as np
+from typing import Dict, Any, List, Sequence, Tuple
+from .batch import BatchCashFlowCalculator
+
+# Parameters a sensitivity axis can vary. rent_growth_rate replaces the whole rent growth
+# schedule with one flat annual rate.
+SENSITIVITY_PARAMETERS = (
+    'purchase_price', 'interest_rate', 'exit_cap_rate', 'cost_of_sale_rate',
+    'capex', 'capex_growth_rate', 'vacancy_rate', 'rent_growth_rate'
+)
+MAX_GRID_SIZE = 250_000
+CHUNK_SIZE = 20_000  # Scenarios evaluated per array pass, bounding peak memory
+GRID_METRICS = (
+    'unleveraged_irr', 'leveraged_irr',
+    'unleveraged_irr_converged', 'leveraged_irr_converged',
+    'unleveraged_equity_multiple', 'leveraged_equity_multiple'
+)
+
+
+def sensitivity_grid(model, axes: List[Tuple[str, Sequence[float]]], assumptions: Dict[str, Any] = None) -> Dict[str, np.ndarray]:
+    """
+    IRR and equity multiple over the full grid of 1-3 parameter axes.
+    Every grid point becomes one scenario of a BatchCashFlowCalculator, evaluated in
+    CHUNK_SIZE blocks; each metric comes back shaped like the grid (one dimension per axis).
+    """
+    if not 1 <= len(axes) <= 3:
+        raise ValueError("Sensitivity needs one to three axes")
+    names = [name for name, _ in axes]
+    for name in names:
+        if name not in SENSITIVITY_PARAMETERS:
+            raise ValueError(f"Unknown sensitivity parameter: {name}")
+    if len(set(names)) != len(names):
+        raise ValueError("Each sensitivity parameter can only be used on one axis")
+    values = [np.asarray(v, dtype=float) for _, v in axes]
+    shape = tuple(len(v) for v in values)
+    size = int(np.prod(shape))
+    if size == 0:
+        raise ValueError("Every sensitivity axis needs at least one value")
+    if size > MAX_GRID_SIZE:
+        raise ValueError(f"Sensitivity grid has {size} points; the limit is {MAX_GRID_SIZE}")
+
+    grid = {name: mesh.ravel() for name, mesh in zip(names, np.meshgrid(*values, indexing='ij'))}
+    results = {k: [] for k in GRID_METRICS}
+    for start in range(0, size, CHUNK_SIZE):
+        overrides = {k: v[start:start + CHUNK_SIZE] for k, v in grid.items()}
+        if 'rent_growth_rate' in overrides:
+            rate = overrides.pop('rent_growth_rate')
+            overrides['rent_growth_rates'] = np.repeat(rate[:, None], max(model.property.hold_period - 1, 0), axis=1)
+        irr = BatchCashFlowCalculator.from_base(model, overrides, assumptions).calculate_irr()
+        for k in GRID_METRICS:
+            results[k].append(irr[k])
+    return {k: np.concatenate(v).reshape(shape) for k, v in results.items()}
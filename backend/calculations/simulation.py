@@ -0,0 +1,226 @@
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterator, List, Optional
+from .assumptions import DEFAULT_EXIT_ASSUMPTIONS
+from .batch import BatchCashFlowCalculator
+from .cashflow import IncomeProjector
+from .parallel import map_chunks
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+# Paths per chunk accepted from API clients: fewer makes the task overhead dominate, more
+# defeats the bound on a worker's memory
+MIN_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 50_000
+# Fixed IRR histogram (0.1% bins from -100% to 200%) so summaries stay the same size at any path count
+IRR_BIN_EDGES = np.linspace(-1.0, 2.0, 3001)
+
+
+@dataclass
+class StochasticProcess:
+    """
+    Annual AR(1) process: x_t = mean_t + persistence * (x_{t-1} - mean_{t-1}) + volatility * shock_t.
+    persistence 0 gives independent draws around the mean path, 1 a random walk.
+    mean=None follows the deterministic base-case assumption.
+    """
+    mean: Optional[float] = None
+    volatility: float = 0.0
+    persistence: float = 0.0
+    minimum: float = -np.inf
+    maximum: float = np.inf
+
+
+@dataclass
+class ExitCapDistribution:
+    kind: str = 'normal'  # normal, lognormal or fixed
+    mean: Optional[float] = None
+    volatility: float = 0.0
+    minimum: float = 0.01
+
+
+@dataclass
+class SimulationConfig:
+    paths: int = 100_000
+    chunk_size: int = 10_000
+    seed: Optional[int] = None
+    rent_growth: StochasticProcess = field(default_factory=lambda: StochasticProcess(volatility=0.02, persistence=0.5))
+    vacancy: StochasticProcess = field(default_factory=lambda: StochasticProcess(volatility=0.02, persistence=0.7, minimum=0.0, maximum=1.0))
+    exit_cap: ExitCapDistribution = field(default_factory=lambda: ExitCapDistribution(volatility=0.005))
+    # Correlation of the rent growth, vacancy and exit cap shocks
+    correlation: List[List[float]] = field(default_factory=lambda: [[1.0, -0.5, -0.3], [-0.5, 1.0, 0.3], [-0.3, 0.3, 1.0]])
+    dscr_threshold: float = 1.25
+    max_workers: Optional[int] = None
+
+
+class StreamingStats:
+    """Histogram-backed running summary of one metric; merges across chunks in constant memory"""
+    def __init__(self):
+        self.counts = np.zeros(len(IRR_BIN_EDGES) + 1, dtype=np.int64)  # Plus under/overflow bins
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.not_converged = 0
+
+    def add(self, values: np.ndarray):
+        finite = values[np.isfinite(values)]
+        self.not_converged += len(values) - len(finite)
+        if len(finite) == 0:
+            return
+        self.counts += np.bincount(np.searchsorted(IRR_BIN_EDGES, finite, side='right'), minlength=len(self.counts))
+        self.count += len(finite)
+        self.total += finite.sum()
+        self.total_squares += (finite ** 2).sum()
+        self.minimum = min(self.minimum, finite.min())
+        self.maximum = max(self.maximum, finite.max())
+
+    def merge(self, other: 'StreamingStats'):
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.not_converged += other.not_converged
+
+    def percentile(self, q: float) -> float:
+        """Percentile interpolated within its histogram bin (exact to the 0.1% bin width)"""
+        target = q / 100 * self.count
+        cumulative = np.cumsum(self.counts)
+        bin_index = min(int(np.searchsorted(cumulative, target, side='left')), len(self.counts) - 1)
+        if bin_index == 0:
+            return float(self.minimum)
+        if bin_index == len(self.counts) - 1:
+            return float(self.maximum)
+        lower, upper = IRR_BIN_EDGES[bin_index - 1], IRR_BIN_EDGES[bin_index]
+        before = cumulative[bin_index - 1]
+        fraction = (target - before) / self.counts[bin_index] if self.counts[bin_index] else 0.0
+        return float(np.clip(lower + fraction * (upper - lower), self.minimum, self.maximum))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {'mean': None, 'std': None, 'min': None, 'max': None, 'percentiles': {}, 'not_converged': self.not_converged}
+        mean = self.total / self.count
+        return {
+            'mean': float(mean),
+            'std': float(np.sqrt(max(self.total_squares / self.count - mean ** 2, 0.0))),
+            'min': float(self.minimum),
+            'max': float(self.maximum),
+            'percentiles': {f'p{q}': self.percentile(q) for q in PERCENTILES},
+            'not_converged': self.not_converged,
+        }
+
+
+class SimulationSummary:
+    """Running Monte Carlo summary; never holds individual paths"""
+    def __init__(self):
+        self.paths = 0
+        self.losses = 0
+        self.dscr_breaches = 0
+        self.leveraged_irr = StreamingStats()
+        self.unleveraged_irr = StreamingStats()
+
+    def merge(self, other: 'SimulationSummary'):
+        self.paths += other.paths
+        self.losses += other.losses
+        self.dscr_breaches += other.dscr_breaches
+        self.leveraged_irr.merge(other.leveraged_irr)
+        self.unleveraged_irr.merge(other.unleveraged_irr)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'paths': self.paths,
+            'probability_of_loss': self.losses / self.paths if self.paths else None,
+            'dscr_breach_probability': self.dscr_breaches / self.paths if self.paths else None,
+            'leveraged_irr': self.leveraged_irr.to_dict(),
+            'unleveraged_irr': self.unleveraged_irr.to_dict(),
+        }
+
+
+def _simulate_process(process: StochasticProcess, mean_path: np.ndarray, shocks: np.ndarray) -> np.ndarray:
+    """Paths x years realisation of an AR(1) process around a mean path"""
+    values = np.empty_like(shocks)
+    deviation = np.zeros(len(shocks))
+    for t in range(shocks.shape[1]):
+        deviation = process.persistence * deviation + process.volatility * shocks[:, t]
+        values[:, t] = mean_path[t] + deviation
+    return np.clip(values, process.minimum, process.maximum)
+
+
+def generate_paths(model, config: SimulationConfig, n_paths: int, rng: np.random.Generator, base_assumptions: Dict[str, Any] = None) -> Dict[str, np.ndarray]:
+    """Correlated rent growth, vacancy and exit cap draws, shaped as batch override columns"""
+    base = {**IncomeProjector(None).assumptions, **DEFAULT_EXIT_ASSUMPTIONS, **(base_assumptions or {})}
+    hold_period = model.property.hold_period
+    n_growth = max(hold_period - 1, 0)
+    shocks = rng.standard_normal((n_paths, hold_period, 3)) @ np.linalg.cholesky(np.asarray(config.correlation, dtype=float)).T
+
+    base_growth = list(base['rent_growth_rates'])[:n_growth]
+    base_growth += [0.03] * (n_growth - len(base_growth))
+    growth_mean = np.full(n_growth, config.rent_growth.mean) if config.rent_growth.mean is not None else np.asarray(base_growth, dtype=float)
+    vacancy_mean = np.full(hold_period, base['vacancy_rate'] if config.vacancy.mean is None else config.vacancy.mean)
+
+    exit_cap = config.exit_cap
+    exit_mean = base['exit_cap_rate'] if exit_cap.mean is None else exit_cap.mean
+    exit_shock = shocks[:, -1, 2]
+    if exit_cap.kind == 'fixed':
+        exit_cap_rate = np.full(n_paths, exit_mean)
+    elif exit_cap.kind == 'lognormal':
+        sigma = exit_cap.volatility / exit_mean
+        exit_cap_rate = exit_mean * np.exp(sigma * exit_shock - sigma ** 2 / 2)
+    elif exit_cap.kind == 'normal':
+        exit_cap_rate = exit_mean + exit_cap.volatility * exit_shock
+    else:
+        raise ValueError(f"Unknown exit cap distribution: {exit_cap.kind}")
+
+    return {
+        'rent_growth_rates': _simulate_process(config.rent_growth, growth_mean, shocks[:, 1:, 0]),
+        'vacancy_rate': _simulate_process(config.vacancy, vacancy_mean, shocks[:, :, 1]),
+        'exit_cap_rate': np.maximum(exit_cap_rate, exit_cap.minimum),
+    }
+
+
+def _simulate_chunk(task) -> SimulationSummary:
+    """Evaluate one chunk of paths; module-level so the process pool can pickle it"""
+    model, config, base_assumptions, n_paths, seed = task
+    rng = np.random.default_rng(seed)
+    paths = generate_paths(model, config, n_paths, rng, base_assumptions)
+    calculator = BatchCashFlowCalculator.from_base(model, paths, base_assumptions)
+    irr = calculator.calculate_irr()
+    projection = calculator.project()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr = np.where(projection['debt_service'] > 0, projection['noi'] / projection['debt_service'], np.inf)
+
+    summary = SimulationSummary()
+    summary.paths = n_paths
+    summary.losses = int((irr['leveraged_equity_multiple'] < 1).sum())
+    summary.dscr_breaches = int((dscr.min(axis=1) < config.dscr_threshold).sum())
+    summary.leveraged_irr.add(irr['leveraged_irr'])
+    summary.unleveraged_irr.add(irr['unleveraged_irr'])
+    return summary
+
+
+def simulate_iter(model, config: SimulationConfig, base_assumptions: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Run the Monte Carlo in chunks across a process pool, yielding the running summary after
+    each chunk completes. Every chunk has its own child seed, so results do not depend on
+    completion order or worker count.
+    """
+    if model.property.hold_period < 1:
+        raise ValueError("hold_period must be at least 1 year")
+    if config.paths < 1 or config.chunk_size < 1:
+        raise ValueError("paths and chunk_size must be positive")
+    chunk_sizes = [min(config.chunk_size, config.paths - start) for start in range(0, config.paths, config.chunk_size)]
+    seeds = np.random.SeedSequence(config.seed).spawn(len(chunk_sizes))
+    tasks = [(model, config, base_assumptions, n, seed) for n, seed in zip(chunk_sizes, seeds)]
+    summary = SimulationSummary()
+    for chunk in map_chunks(_simulate_chunk, tasks, config.max_workers):
+        summary.merge(chunk)
+        yield summary.to_dict()
+
+
+def simulate(model, config: SimulationConfig, base_assumptions: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Final Monte Carlo summary: IRR percentiles, probability of loss and DSCR breach frequency"""
+    result = None
+    for result in simulate_iter(model, config, base_assumptions):
+        pass
+    return result
@@ -0,0 +1,164 @@
+import copy
+import math
+import numpy as np
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from .pipeline import AnalysisPipeline
+
+SOLVE_METRICS = ('leveraged_irr', 'unleveraged_irr', 'leveraged_equity_multiple', 'unleveraged_equity_multiple')
+# Where each solvable input lives in an /analyze-shaped scenario
+SOLVE_PARAMETERS = {
+    'purchase_price': ('property', 'purchase_price'),
+    'loan_amount': ('financing', 'loan_amount'),
+    'interest_rate': ('financing', 'interest_rate'),
+    'exit_cap_rate': ('assumptions', 'exit_cap_rate'),
+    'cost_of_sale_rate': ('assumptions', 'cost_of_sale_rate'),
+    'vacancy_rate': ('assumptions', 'vacancy_rate'),
+    'capex': ('assumptions', 'capex'),
+    'capex_growth_rate': ('assumptions', 'capex_growth_rate'),
+    'rent_growth_rate': ('assumptions', 'rent_growth_rates'),  # One flat rate for every year
+}
+# Search ranges when none is given; prices scale with the scenario's own value
+DEFAULT_BOUNDS = {
+    'interest_rate': (0.0, 0.25),
+    'exit_cap_rate': (0.02, 0.20),
+    'cost_of_sale_rate': (0.0, 0.20),
+    'vacancy_rate': (0.0, 0.60),
+    'capex_growth_rate': (-0.10, 0.20),
+    'rent_growth_rate': (-0.10, 0.20),
+}
+RELATIVE_BOUNDS = (0.1, 5.0)  # For purchase_price, loan_amount and capex
+SCAN_POINTS = 9  # Coarse scan that brackets the target before the root is refined
+
+
+def set_parameter(scenario: Dict[str, Any], parameter: str, value: float, keep_loan_to_value: bool = False) -> Dict[str, Any]:
+    """Copy of scenario with one input replaced; keep_loan_to_value scales the loan with the price"""
+    section, key = SOLVE_PARAMETERS[parameter]
+    updated = copy.deepcopy(scenario)
+    if updated.get(section) is None:
+        updated[section] = {}
+    if parameter == 'rent_growth_rate':
+        value = [value] * max(scenario['property']['hold_period'] - 1, 1)
+    elif parameter == 'purchase_price' and keep_loan_to_value:
+        ratio = scenario['financing']['loan_amount'] / scenario['property']['purchase_price']
+        updated['financing']['loan_amount'] = ratio * value
+    updated[section][key] = value
+    return updated
+
+
+def _current_value(scenario: Dict[str, Any], parameter: str) -> Optional[float]:
+    section, key = SOLVE_PARAMETERS[parameter]
+    value = (scenario.get(section) or {}).get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def _refine(f: Callable[[float], float], a: float, b: float, fa: float, fb: float, xtol: float, ftol: float, max_iter: int) -> Tuple[float, float, int, bool]:
+    """
+    Illinois-modified regula falsi on a sign-changing bracket [a, b]: secant-like convergence
+    on smooth metrics, with bisection whenever a step lands outside the bracket or on a NaN.
+    Gives up (converged False) on a bracket whose sign change is a jump rather than a root,
+    such as an equity multiple as equity required crosses zero.
+    """
+    side = 0
+    limit = 10 * max(abs(fa), abs(fb))  # A continuous crossing stays well inside this
+    x, fx = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+    for iteration in range(1, max_iter + 1):
+        x = (a * fb - b * fa) / (fb - fa)
+        if not a < x < b and not b < x < a:
+            x = (a + b) / 2
+        fx = f(x)
+        if math.isnan(fx):
+            x = (a + b) / 2
+            fx = f(x)
+            if math.isnan(fx):
+                return x, fx, iteration, False
+        if abs(fx) <= ftol:
+            return x, fx, iteration, True
+        if abs(b - a) <= xtol or abs(fx) > limit:
+            return x, fx, iteration, False
+        if (fx > 0) == (fb > 0):
+            b, fb = x, fx
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = x, fx
+            if side == 1:
+                fb /= 2
+            side = 1
+    return x, fx, max_iter, False
+
+
+def goal_seek(scenario: Dict[str, Any], parameter: str, target: float, metric: str = 'leveraged_irr',
+              bounds: Optional[Sequence[float]] = None, keep_loan_to_value: bool = False,
+              ftol: float = 1e-7, max_iter: int = 100, pipeline: AnalysisPipeline = None) -> Dict[str, Any]:
+    """
+    Value of one scenario input that makes metric equal target, e.g. the purchase price at a
+    15% leveraged IRR. A coarse scan of the bounds brackets the target, then the bracket is
+    refined by regula falsi. Every evaluation runs through one memoized AnalysisPipeline, so
+    stages the parameter does not feed (income and expenses for a price or an exit cap) are
+    computed once and reused on every iteration.
+    """
+    if parameter not in SOLVE_PARAMETERS:
+        raise ValueError(f"Unknown solve parameter: {parameter}")
+    if metric not in SOLVE_METRICS:
+        raise ValueError(f"Unknown solve metric: {metric}")
+    if bounds is None:
+        if parameter in DEFAULT_BOUNDS:
+            bounds = DEFAULT_BOUNDS[parameter]
+        else:
+            current = _current_value(scenario, parameter)
+            if not current:
+                raise ValueError(f"bounds are required to solve for {parameter}")
+            bounds = (current * RELATIVE_BOUNDS[0], current * RELATIVE_BOUNDS[1])
+    lo, hi = (float(v) for v in bounds)
+    if not lo < hi:
+        raise ValueError("bounds must be an increasing [low, high] pair")
+
+    pipeline = pipeline or AnalysisPipeline()
+    stage_runs: Dict[str, int] = {}
+    evaluations = [0]
+
+    def evaluate(value: float) -> float:
+        recomputed, _ = pipeline.run(set_parameter(scenario, parameter, value, keep_loan_to_value))
+        evaluations[0] += 1
+        for name in recomputed:
+            stage_runs[name] = stage_runs.get(name, 0) + 1
+        result = float(pipeline.outputs['returns'][metric])
+        return result - target if math.isfinite(result) else math.nan
+
+    # Scan for sign changes between finite values, which also copes with metrics that are
+    # undefined (NaN IRR) over part of the range, then refine them in order until one converges
+    grid = np.linspace(lo, hi, SCAN_POINTS)
+    values = [evaluate(x) for x in grid]
+    brackets = [
+        (grid[i - 1], grid[i], values[i - 1], values[i]) for i in range(1, SCAN_POINTS)
+        if not math.isnan(values[i - 1]) and not math.isnan(values[i]) and (values[i - 1] > 0) != (values[i] > 0)
+    ]
+    exact = [x for x, v in zip(grid, values) if v == 0]
+    solution = (exact[0], 0.0, 0, True) if exact else None
+    for a, b, fa, fb in brackets if solution is None else ():
+        candidate = _refine(evaluate, a, b, fa, fb, xtol=1e-12 * max(abs(a), abs(b), 1.0), ftol=ftol, max_iter=max_iter)
+        if candidate[3]:
+            solution = candidate
+            break
+    if solution is None:
+        finite = [v + target for v in values if not math.isnan(v)]
+        reach = f"; it ranges from {min(finite):.6g} to {max(finite):.6g}" if finite else ""
+        raise ValueError(f"{metric} does not reach {target} for {parameter} in [{lo:g}, {hi:g}]{reach}")
+    value, _, iterations, _ = solution
+
+    # Leave the pipeline at the solution so its outputs describe it (usually the last evaluation)
+    pipeline.run(set_parameter(scenario, parameter, value, keep_loan_to_value))
+    returns = pipeline.outputs['returns']
+    return {
+        'parameter': parameter,
+        'metric': metric,
+        'target': target,
+        'value': float(value),
+        'achieved': float(returns[metric]),
+        'iterations': iterations,
+        'evaluations': evaluations[0],
+        'stage_runs': stage_runs,
+        'equity_required': float(returns['equity_required']),
+        **{k: float(returns[k]) for k in SOLVE_METRICS},
+    }
@@ -1,5 +1,5 @@
 import pytest
-from .amortization import generate_amortization_schedule
+from .amortization import generate_amortization_schedule, amortization_arrays
 
 def test_amortization_schedule_interest_only():
     loan_amount = 1200000
@@ -27,4 +27,20 @@ def test_amortization_schedule_fully_amortizing():
     # Last year: balance should be 0
     assert schedule[-1]['balance'] == 0
     # Principal paid should increase each year
-    assert schedule[1]['principal'] > schedule[0]['principal'] 
\ No newline at end of file
+    assert schedule[1]['principal'] > schedule[0]['principal'] 
+
+def test_amortization_arrays_batch():
+    # Two loans evaluated together: 5-year fully amortizing and 3-year term with 1 year IO
+    schedule = amortization_arrays([100000, 100000], [0.05, 0.06], [5, 3], [5, 30], [0, 1])
+    assert schedule['payment'].shape == (2, 60)
+    # Fully amortizing loan ends at zero
+    assert abs(schedule['ending_balance'][0, -1]) < 1e-6
+    # IO months pay interest only and keep the balance
+    assert abs(schedule['payment'][1, 0] - 500) < 1e-9
+    assert schedule['principal'][1, 11] == 0
+    assert schedule['ending_balance'][1, 11] == 100000
+    # Shorter loan leaves a balloon at term and is zero afterwards
+    assert schedule['ending_balance'][1, 35] > 90000
+    assert schedule['payment'][1, 36:].sum() == 0
+    # Month-over-month balances chain together
+    assert (schedule['beginning_balance'][:, 1:36] == schedule['ending_balance'][:, :35]).all()
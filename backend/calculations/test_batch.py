@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from .batch import BatchCashFlowCalculator
+from .cashflow import CashFlowCalculator
+from .test_cashflow import MockRealEstateModel
+
+def make_models():
+    models = []
+    for i, (hold_period, loan_amount) in enumerate([(3, 0), (5, 60000), (1, 30000), (7, 80000)]):
+        model = MockRealEstateModel(purchase_price=100000 + 10000 * i, loan_amount=loan_amount, market_rent=10000 + 500 * i, hold_period=hold_period)
+        model.financing.interest_rate = 0.04 + 0.005 * i
+        models.append(model)
+    return models
+
+def test_batch_matches_single_scenario_calculator():
+    models = make_models()
+    batch = BatchCashFlowCalculator.from_models(models)
+    irr = batch.calculate_irr()
+    exit_data = batch.calculate_exit_value()
+    projection = batch.project()
+    for i, model in enumerate(models):
+        single = CashFlowCalculator(model)
+        expected_irr = single.calculate_irr()
+        for key in ('unleveraged_irr', 'leveraged_irr'):
+            assert (np.isnan(expected_irr[key]) and np.isnan(irr[key][i])) or abs(expected_irr[key] - irr[key][i]) < 1e-9
+        expected_exit = single.calculate_exit_value(model.property.hold_period)
+        for key, value in expected_exit.items():
+            assert abs(value - exit_data[key][i]) < 1e-6
+        rows = single.calculate_annual_cash_flows()
+        for key in ('noi', 'debt_service', 'leveraged_cash_flow'):
+            assert np.allclose([row[key] for row in rows], projection[key][i, :model.property.hold_period])
+        # Years past the hold period are masked out
+        assert (projection['noi'][i, model.property.hold_period:] == 0).all()
+
+def test_batch_results_trimmed_to_hold_period():
+    results = BatchCashFlowCalculator.from_models(make_models()).results()
+    assert [len(r['annual_cash_flows']['noi']) for r in results] == [3, 5, 1, 7]
+    assert [len(r['irr_results']['leveraged_flows']) for r in results] == [4, 6, 2, 8]
+
+def test_batch_rejects_zero_hold_period():
+    with pytest.raises(ValueError):
+        BatchCashFlowCalculator.from_models([MockRealEstateModel(hold_period=0)])
+    with pytest.raises(ValueError, match='at least one scenario'):
+        BatchCashFlowCalculator.from_models([])
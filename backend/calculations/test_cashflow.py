@@ -1,5 +1,6 @@
 import pytest
-from cashflow import CashFlowCalculator
+import numpy as np
+from .cashflow import CashFlowCalculator, DebtServiceCalculator
 from types import SimpleNamespace
 
 class MockUnitType:
@@ -92,4 +93,66 @@ def test_leveraged_irr():
     assert 'leveraged_irr' in irr_result
     assert isinstance(irr_result['leveraged_irr'], float)
     assert irr_result['leveraged_irr'] == irr_result['leveraged_irr']  # not nan
-    assert irr_result['leveraged_irr'] > 0 
\ No newline at end of file
+    assert irr_result['leveraged_irr'] > 0 
+
+def test_projection_matches_per_year_growth():
+    model = MockRealEstateModel(hold_period=15)
+    calc = CashFlowCalculator(model)
+    projection = calc.project()
+    assert len(projection['flows']['noi']) == 15
+    # Market rent compounds the year-by-year growth schedule
+    expected_rent = 20 * 10000 * 12
+    for year in range(15):
+        assert abs(projection['flows']['market_rent'][year] - expected_rent) < 1e-6 * expected_rent
+        rate = calc.income_projector.assumptions['rent_growth_rates'][year] if year < 11 else 0.03
+        expected_rent *= 1 + rate
+    # Annual rows are read from the same cached projection
+    assert calc.project() is projection
+    rows = calc.calculate_annual_cash_flows()
+    assert len(rows) == 15
+    assert rows[4]['noi'] == projection['flows']['noi'][4]
+    assert calc.calculate_exit_value(15)['exit_noi'] == rows[-1]['noi']
+
+def test_debt_service_annual_lookups():
+    financing = MockFinancingParams(loan_amount=1000000, interest_rate=0.06, loan_term=10, amortization_period=30, interest_only_period=2)
+    debt = DebtServiceCalculator(financing)
+    # IO years pay interest only
+    assert abs(debt.get_annual_debt_service(1) - 60000) < 1e-6
+    assert debt.get_outstanding_balance(2) == 1000000
+    # Outside the loan term there is no debt service or balance
+    assert debt.get_annual_debt_service(0) == 0
+    assert debt.get_annual_debt_service(11) == 0
+    assert debt.get_outstanding_balance(11) == 0
+    # Array lookups match scalar lookups and the monthly DataFrame
+    years = debt.get_annual_debt_service(np.arange(1, 11))
+    assert years[5] == debt.get_annual_debt_service(6)
+    schedule = debt.amortization_schedule
+    assert len(schedule) == 120
+    assert abs(schedule[schedule['year'] == 6]['payment'].sum() - years[5]) < 1e-6
+    assert abs(schedule['ending_balance'].iloc[-1] - debt.get_outstanding_balance(10)) < 1e-6
+
+def test_annual_cash_flow_columns_match_rows():
+    calc = CashFlowCalculator(MockRealEstateModel(), income_breakdown={'Laundry': 500.0})
+    rows = calc.calculate_annual_cash_flows()
+    columns = calc.annual_cash_flow_columns()
+    assert columns['columns']['Laundry'] == [500.0] * len(rows)
+    assert 'Laundry' not in columns['assumed'] and 'Parking' in columns['assumed']
+    for k, values in columns['columns'].items():
+        assert [row[k] for row in rows] == values
+        assert all(row.get(f'{k}_assumed', False) == (k in columns['assumed']) for row in rows)
+
+def test_hold_period_curve_matches_rerun_per_exit_year():
+    model = MockRealEstateModel(purchase_price=20000000, loan_amount=12000000, market_rent=30000, hold_period=8)
+    curve = CashFlowCalculator(model).hold_period_curve(discount_rate=0.08)
+    assert list(curve['exit_year']) == list(range(1, 9))
+    for exit_year in (1, 4, 8):
+        model.property.hold_period = exit_year
+        calc = CashFlowCalculator(model)
+        irr = calc.calculate_irr()
+        exit_data = calc.calculate_exit_value(exit_year)
+        i = exit_year - 1
+        for key in ('unleveraged_irr', 'leveraged_irr', 'unleveraged_equity_multiple', 'leveraged_equity_multiple'):
+            assert curve[key][i] == pytest.approx(irr[key], abs=1e-9, nan_ok=True)
+        assert curve['net_proceeds'][i] == pytest.approx(exit_data['net_proceeds'])
+        flows = np.array(irr['leveraged_flows'])
+        assert curve['leveraged_npv'][i] == pytest.approx((flows * 1.08 ** -np.arange(exit_year + 1)).sum())
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from .cashflow import DebtServiceCalculator
+from .debt import DebtEngine, Refinancing, Tranche, rate_paths, summarize
+from models.realestatemodel import FinancingParameters
+
+def test_single_fixed_tranche_matches_debt_service_calculator():
+    financing = FinancingParameters(loan_amount=26000000, interest_rate=0.06, loan_term=10, amortization_period=30, interest_only_period=2)
+    expected = DebtServiceCalculator(financing)
+    result = DebtEngine.from_financing(financing).evaluate()
+    assert np.allclose(result['debt_service'][0], expected.annual_debt_service)
+    assert np.allclose(result['ending_balance'][0][:-1], expected.annual_ending_balance[:-1])
+    # The engine repays the balloon at maturity instead of reporting it as the final balance
+    assert result['balloon'][0][-1] == pytest.approx(expected.annual_ending_balance[-1])
+    assert result['ending_balance'][0][-1] == 0
+
+def test_floating_tranche_follows_each_path_up_to_the_cap():
+    engine = DebtEngine([Tranche('senior', 10000000, 5, spread=0.02, floor=0.01, cap=0.05)])
+    result = engine.evaluate(rate_paths([0.03] * 5, shifts=[-0.03, 0.0, 0.01, 0.05]))
+    # Interest-only, so annual debt service is balance x (clipped index + spread)
+    assert np.allclose(result['debt_service'][:, 0], 10000000 * np.array([0.03, 0.05, 0.06, 0.07]))
+    assert np.allclose(result['tranches']['senior']['rate'][:, 0], [0.03, 0.05, 0.06, 0.07])
+
+def test_floating_amortizing_payment_recasts_with_the_rate():
+    engine = DebtEngine([Tranche('senior', 10000000, 10, amortization_period=25, spread=0.02)])
+    flat = engine.evaluate([0.04] * 10)
+    fixed = DebtEngine([Tranche('senior', 10000000, 10, amortization_period=25, rate=0.06)]).evaluate()
+    assert np.allclose(flat['debt_service'], fixed['debt_service'])
+    rising = engine.evaluate(np.linspace(0.04, 0.08, 10))
+    assert (rising['debt_service'][0, 1:] > flat['debt_service'][0, 1:]).all()
+
+def test_refinancing_takes_out_the_repaid_balance():
+    engine = DebtEngine(
+        [Tranche('senior', 20000000, 10, amortization_period=30, rate=0.05), Tranche('mezz', 5000000, 5, rate=0.11)],
+        [Refinancing(3, 'mezz', Tranche('mezz_refi', None, 4, rate=0.08, origination_fee_rate=0.01))],
+        years=7,
+    )
+    result = engine.evaluate()
+    assert result['refinanced'][0, 2] == pytest.approx(5000000)
+    assert result['net_refinancing_proceeds'][0, 2] == pytest.approx(-50000)
+    assert result['tranches']['mezz']['debt_service'][0, 3] == 0
+    assert result['tranches']['mezz_refi']['debt_service'][0, 3] == pytest.approx(400000)
+    # The replacement matures inside the horizon and is repaid as a balloon
+    assert result['balloon'][0, 6] == pytest.approx(5000000)
+
+def test_dscr_and_summary_across_paths():
+    engine = DebtEngine([Tranche('senior', 10000000, 5, spread=0.02)])
+    paths = rate_paths([0.03] * 5, shifts=[0.0, 0.02], random_paths=100, seed=7)
+    result = engine.evaluate(paths, noi=np.full(5, 600000.0))
+    assert result['dscr'].shape == (102, 5)
+    assert result['dscr'][0, 0] == pytest.approx(1.2)
+    summary = summarize(result, dscr_threshold=1.0)
+    assert summary['paths'] == 102
+    assert summary['min_dscr']['min'] <= 600000 / 700000 + 1e-9
+    assert 0 < summary['dscr_breach_probability'] < 1
+
+def test_invalid_stacks_are_rejected():
+    with pytest.raises(ValueError):
+        DebtEngine([Tranche('senior', 1000000, 5)]).evaluate()
+    with pytest.raises(ValueError):
+        DebtEngine([Tranche('senior', 1000000, 5, spread=0.02)]).evaluate(np.zeros((0, 5)))
+    with pytest.raises(ValueError):
+        DebtEngine([Tranche('senior', 1000000, 5, rate=0.05)], [Refinancing(6, 'senior', Tranche('new', None, 5, rate=0.05))])
+    with pytest.raises(ValueError):
+        DebtEngine([Tranche('a', 1000000, 5, rate=0.05), Tranche('a', 1000000, 5, rate=0.05)])
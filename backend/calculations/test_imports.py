@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Heavy libraries only a few rarely used code paths need; they must stay out of cold starts
+DEFERRED = ('pandas', 'numpy_financial', 'numpy.ma', 'concurrent.futures.process')
+
+def loaded_after_import(*modules):
+    code = f"import sys\nimport {', '.join(modules)}\nprint(' '.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def test_engine_import_defers_heavy_dependencies():
+    modules = ('calculations.cashflow', 'calculations.batch', 'calculations.pipeline', 'calculations.monthly', 'calculations.solve')
+    assert loaded_after_import(*modules) == []
+
+def test_legacy_amortization_loads_numpy_financial_on_first_use():
+    code = (
+        "import sys\nfrom calculations.amortization import generate_amortization_schedule\n"
+        "generate_amortization_schedule(1000000, 0.05, 10, 0)\nprint('numpy_financial' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'True'
@@ -0,0 +1,44 @@
+import numpy as np
+import numpy_financial as npf
+from .irr import irr_batch, return_metrics
+
+def test_irr_batch_matches_numpy_financial():
+    rng = np.random.default_rng(42)
+    flows = rng.normal(0.1, 0.05, (500, 11))
+    flows[:, 0] = -1
+    result = irr_batch(flows)
+    expected = np.array([npf.irr(row) for row in flows])
+    assert result.converged.all()
+    assert np.abs(result.irr - expected).max() < 1e-8
+
+def test_irr_batch_picks_root_nearest_zero():
+    # NPV has roots at 10% and 20%; numpy_financial returns the one nearest 0%
+    flows = [-1, 2.3, -1.32]
+    result = irr_batch(flows)
+    assert result.converged[0]
+    assert abs(result.irr[0] - npf.irr(flows)) < 1e-8
+
+def test_irr_batch_finds_roots_inside_one_grid_cell():
+    # Roots at 14%/16% and 20%/21% fall between neighbouring grid rates, so NPV has the same
+    # sign at both ends of the cell
+    flows = [[-1, 2.33, -1.3566], [-1, 2.41, -1.452]]
+    result = irr_batch(flows)
+    assert result.converged.all()
+    assert np.abs(result.irr - [npf.irr(row) for row in flows]).max() < 1e-8
+    result = irr_batch(flows, times=np.array([[0, 1, 2.0]] * 2))
+    assert np.allclose(result.irr, [0.14, 0.20])
+
+def test_irr_batch_reports_non_convergence():
+    flows = [[-100, 50, 60], [100, 50, 60], [0, 0, 0]]
+    result = irr_batch(flows)
+    assert result.converged.tolist() == [True, False, False]
+    assert np.isnan(result.irr[1:]).all()
+
+def test_return_metrics():
+    flows = [[-1000, 100, 100, 1100], [-500, 0, 0, 0]]
+    metrics = return_metrics(flows, operating_flows=[[100, 100, 100], [0, 0, 0]])
+    assert abs(metrics['irr'][0] - 0.1) < 1e-10
+    assert metrics['irr_converged'].tolist() == [True, False]
+    assert metrics['equity_multiple'].tolist() == [1.3, 0.0]
+    assert metrics['cash_on_cash'][0].tolist() == [0.1, 0.1, 0.1]
+    assert abs(metrics['average_cash_on_cash'][0] - 0.1) < 1e-12
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from models.rentroll import ColumnarRentRoll
+from . import leasing
+from .leasing import LeaseRolloverProjector
+
+def make_rent_roll(n=3, expirations=('2025-03-31', None, None)):
+    statuses = ['occupied', 'vacant', 'occupied'] * (n // 3)
+    return ColumnarRentRoll(
+        [str(i) for i in range(n)], ['1BR'] * n, statuses, [1000.0] * n,
+        [900.0, 0.0, 1000.0] * (n // 3), lease_expiration=list(expirations) * (n // 3)
+    )
+
+def test_rollover_downtime_and_burn_off():
+    projector = LeaseRolloverProjector(make_rent_roll(), '2025-01-01', 2, {'rent_growth_rates': [0.0], 'renewal_probability': 0.5})
+    flows = projector.project()
+    # Unit 0 pays 900 until its lease expires in March; the vacant unit leases up after a month
+    # of downtime, and unit 2, with no expiration date, rolls over at the end of month 1
+    assert np.allclose(flows['loss_to_lease'][:4], [100, 100, 100, 0])
+    assert np.allclose(flows['vacancy_loss'][:4], [1000, 500, 0, 500])
+    assert np.allclose(flows['rental_income'][:4], [1900, 2400, 2900, 2500])
+    assert np.allclose(flows['expirations'][:4], [0, 1, 0, 1])
+    assert np.allclose(flows['move_ins'][:4], [1, 0.5, 0, 0.5])
+    assert flows['occupancy'][0] == pytest.approx(2 / 3)
+    annual = projector.rollup()
+    assert np.allclose(annual['rental_income'], flows['rental_income'].reshape(2, 12).sum(axis=1))
+    assert annual['occupancy'][0] == pytest.approx(flows['occupancy'][:12].mean())
+    assert np.allclose(annual['market_rent'], annual['loss_to_lease'] + annual['vacancy_loss'] + annual['rental_income'])
+
+def test_renewal_cap_slows_mark_to_market():
+    rent_roll = ColumnarRentRoll(['a'], ['1BR'], ['occupied'], [1200.0], [1000.0], lease_expiration=['2024-12-31'])
+    assumptions = {'rent_growth_rates': [0.0, 0.0], 'renewal_probability': 1.0, 'downtime_months': 0, 'renewal_increase_cap': 0.1}
+    flows = LeaseRolloverProjector(rent_roll, '2025-01-01', 3, assumptions).project()
+    assert np.allclose(flows['rental_income'][::12], [1100, 1200, 1200])
+    assert flows['vacancy_loss'].sum() == 0
+
+def test_leases_expiring_after_horizon():
+    rent_roll = ColumnarRentRoll(['a', 'b'], ['1BR'] * 2, ['occupied'] * 2, [1000.0] * 2, [900.0] * 2, lease_expiration=['2027-01-31'] * 2)
+    projector = LeaseRolloverProjector(rent_roll, '2025-01-01', 1)
+    assert np.allclose(projector.project()['rental_income'], 1800)
+    assert projector.rollup()['expirations'][0] == 0
+
+def test_unit_chunks_match(monkeypatch):
+    rent_roll = make_rent_roll(30, ('2025-03-31', None, '2026-07-15'))
+    whole = LeaseRolloverProjector(rent_roll, '2025-01-01', 5).project()
+    monkeypatch.setattr(leasing, 'UNIT_CHUNK_SIZE', 7)
+    chunked = LeaseRolloverProjector(rent_roll, '2025-01-01', 5).project()
+    for k in whole:
+        assert np.allclose(whole[k], chunked[k])
+
+def test_invalid_assumptions():
+    with pytest.raises(ValueError):
+        LeaseRolloverProjector(make_rent_roll(), '2025-01-01', 2, {'downtime_months': 12})
+    with pytest.raises(ValueError):
+        LeaseRolloverProjector(make_rent_roll(), '2025-01-01', 2, {'vacancy_rate': 0.05})
@@ -1,3 +1,4 @@
+import math
 import pytest
 from .metrics import (
     calculate_irr,
@@ -8,10 +9,12 @@ from .metrics import (
 )
 
 def test_calculate_irr():
-    # IRR for -1000, 400, 400, 400, 400 should be about 13.45%
+    # IRR for -1000, 400, 400, 400, 400 should be about 21.86%
     cash_flows = [-1000, 400, 400, 400, 400]
     irr = calculate_irr(cash_flows)
-    assert abs(irr - 0.1345) < 0.01
+    assert abs(irr - 0.2186) < 0.01
+    # No sign change means no IRR
+    assert math.isnan(calculate_irr([1000, 400, 400]))
 
 def test_calculate_cash_on_cash():
     assert calculate_cash_on_cash(12000, 100000) == 0.12
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from .cashflow import CashFlowCalculator
+from .irr import irr_batch
+from .monthly import MonthlyCashFlowCalculator, monthly_dates
+from .test_cashflow import MockRealEstateModel
+
+def make_model():
+    model = MockRealEstateModel(purchase_price=20000000, loan_amount=12000000, market_rent=30000, hold_period=5)
+    model.property.transaction_date = '2024-01-31'
+    return model
+
+def test_annual_rollup_matches_annual_engine():
+    model = make_model()
+    monthly = MonthlyCashFlowCalculator(model)
+    annual = CashFlowCalculator(model)
+    rollup = monthly.rollup('annual')
+    projection = annual.project()['flows']
+    for k in ('gross_income', 'total_expenses', 'noi', 'capex', 'debt_service', 'leveraged_cash_flow'):
+        assert np.allclose(rollup[k], projection[k])
+    assert monthly.calculate_exit_value()['net_proceeds'] == pytest.approx(annual.calculate_exit_value(5)['net_proceeds'])
+    assert monthly.rollup('quarterly')['noi'].shape == (20,)
+
+def test_capex_timing():
+    model = make_model()
+    spread = MonthlyCashFlowCalculator(model).project()['capex']
+    end = MonthlyCashFlowCalculator(model, capex_timing='end').project()['capex']
+    assert np.count_nonzero(end) == 5 and end[11] == pytest.approx(spread[:12].sum())
+    with pytest.raises(ValueError):
+        MonthlyCashFlowCalculator(model, capex_timing='mid')
+
+def test_monthly_irr_and_xirr():
+    result = MonthlyCashFlowCalculator(make_model()).calculate_irr()
+    assert result['dates'][:3] == ['2024-01-31', '2024-02-29', '2024-03-31']
+    assert len(result['leveraged_flows']) == 61
+    assert result['leveraged_irr'] == pytest.approx((1 + result['leveraged_monthly_irr']) ** 12 - 1)
+    assert result['leveraged_irr_converged']
+    # Actual month lengths move the XIRR only slightly from the evenly spaced rate
+    assert result['leveraged_xirr'] == pytest.approx(result['leveraged_irr'], abs=0.005)
+
+def test_monthly_dates_clip_to_month_end():
+    dates = monthly_dates('2023-10-31', 4).astype(str).tolist()
+    assert dates == ['2023-10-31', '2023-11-30', '2023-12-31', '2024-01-31', '2024-02-29']
+
+def test_irr_batch_with_times():
+    # 100 invested, 121 back two years later: 10% a year whether timed in years or in months
+    flows = np.array([[-100.0, 0.0, 121.0]])
+    rate, _, _ = irr_batch(flows, times=np.array([0.0, 1.0, 2.0]))
+    assert rate[0] == pytest.approx(0.1)
+    per_row = np.array([[0.0, 1.0, 2.0], [0.0, 0.5, 1.0]])
+    rates, _, _ = irr_batch(np.vstack([flows, flows]), times=per_row)
+    assert rates == pytest.approx([0.1, 0.21])
@@ -0,0 +1,15 @@
+import os
+from .parallel import map_chunks, worker_count
+
+def square(x):
+    return x * x
+
+def test_worker_count_is_capped_at_cores():
+    cores = os.cpu_count() or 1
+    assert worker_count(None) == cores
+    assert worker_count(10_000) == cores
+    assert worker_count(1) == 1
+
+def test_map_chunks_runs_every_task():
+    assert sorted(map_chunks(square, [1, 2, 3], max_workers=10_000)) == [1, 4, 9]
+    assert list(map_chunks(square, [3], max_workers=1)) == [9]
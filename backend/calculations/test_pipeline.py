@@ -0,0 +1,58 @@
+import copy
+import pytest
+import numpy as np
+from .cashflow import CashFlowCalculator
+from .pipeline import AnalysisPipeline
+from .test_cashflow import MockRealEstateModel
+
+def make_scenario(**assumptions):
+    return {
+        'property': {'purchase_price': 20000000, 'hold_period': 5},
+        'financing': {
+            'loan_amount': 12000000, 'interest_rate': 0.05, 'loan_term': 5,
+            'amortization_period': 5, 'interest_only_period': 1, 'loan_origination_fee_rate': 0.01
+        },
+        'unit_types': [{'market_rent': 30000, 'unit_count': 10}, {'market_rent': 30000, 'unit_count': 10}],
+        'assumptions': {'exit_cap_rate': None, **assumptions},
+    }
+
+def test_pipeline_matches_calculator():
+    pipeline = AnalysisPipeline()
+    recomputed, _ = pipeline.run(make_scenario(vacancy_rate=0.07))
+    assert recomputed == ['income', 'expenses', 'debt', 'exit', 'returns']
+    model = MockRealEstateModel(purchase_price=20000000, loan_amount=12000000, market_rent=30000, hold_period=5)
+    calc = CashFlowCalculator(model, assumptions={'vacancy_rate': 0.07})
+    expected = calc.calculate_irr()
+    returns = pipeline.outputs['returns']
+    assert returns['leveraged_irr'] == pytest.approx(expected['leveraged_irr'])
+    assert returns['unleveraged_irr'] == pytest.approx(expected['unleveraged_irr'])
+    assert np.allclose(returns['leveraged_flows'], expected['leveraged_flows'])
+    assert pipeline.outputs['exit']['net_proceeds'] == pytest.approx(calc.calculate_exit_value(5)['net_proceeds'])
+
+def test_pipeline_recomputes_only_dirty_stages():
+    pipeline = AnalysisPipeline()
+    scenario = make_scenario()
+    pipeline.run(scenario)
+    assert pipeline.run(scenario) == ([], {})
+
+    scenario = copy.deepcopy(scenario)
+    scenario['financing']['interest_rate'] = 0.06
+    recomputed, changes = pipeline.run(scenario)
+    assert recomputed == ['debt', 'exit', 'returns']
+    assert 'debt_service' in changes['debt']
+    assert 'net_sale_price' not in changes['exit']  # Only the loan payoff moved
+
+    scenario = copy.deepcopy(scenario)
+    scenario['assumptions']['cost_of_sale_rate'] = 0.02
+    recomputed, _ = pipeline.run(scenario)
+    assert recomputed == ['exit', 'returns']
+
+def test_pipeline_stops_at_unchanged_outputs():
+    pipeline = AnalysisPipeline()
+    scenario = make_scenario()
+    pipeline.run(scenario)
+    # Same total rent split differently: income reruns but nothing downstream does
+    scenario['unit_types'] = [{'market_rent': 60000, 'unit_count': 5}, {'market_rent': 20000, 'unit_count': 15}]
+    recomputed, changes = pipeline.run(scenario)
+    assert recomputed == ['income']
+    assert changes == {}
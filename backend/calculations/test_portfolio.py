@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from .cashflow import CashFlowCalculator
+from .portfolio import portfolio_rollup
+from .test_cashflow import MockRealEstateModel
+
+def make_model(transaction_date, hold_period=5, loan_amount=12000000):
+    model = MockRealEstateModel(purchase_price=20000000, loan_amount=loan_amount, market_rent=30000, hold_period=hold_period)
+    model.property.transaction_date = transaction_date
+    return model
+
+def test_single_property_matches_calculator():
+    model = make_model('2021-07-01')
+    result = portfolio_rollup([model], max_workers=1)
+    expected = CashFlowCalculator(model).calculate_irr()
+    assert result['years'][0] == 2021
+    assert np.allclose(result['leveraged_cash_flow'][:6], expected['leveraged_flows'])
+    assert result['leveraged_irr'] == pytest.approx(expected['leveraged_irr'])
+    assert result['properties']['exit_year'].tolist() == [2026]
+
+def test_calendar_alignment_and_maturities():
+    models = [make_model('2020-01-01', hold_period=3), make_model('2022-03-15', hold_period=6)]
+    result = portfolio_rollup(models, max_workers=1)
+    years = result['years'].tolist()
+    first = [CashFlowCalculator(m).calculate_irr()['leveraged_flows'] for m in models]
+    combined = np.zeros(len(years))
+    combined[0:4] += first[0]
+    combined[2:9] += first[1]
+    assert np.allclose(result['leveraged_cash_flow'], combined)
+    # Both have 5-year loans; the first is repaid at its sale in 2023, before its 2025
+    # maturity, and the second matures in 2027 while still held
+    assert result['maturing_loans'][years.index(2025)] == 0
+    assert result['maturing_debt'][years.index(2025)] == 0
+    assert result['maturing_loans'][years.index(2027)] == 1
+    assert result['maturing_loans'].sum() == 1
+    # Both loans outstanding at the end of 2022; by 2023 the first is repaid at exit and
+    # the second is still interest-only
+    assert result['outstanding_debt'][years.index(2022)] > 12000000
+    assert result['outstanding_debt'][years.index(2023)] == pytest.approx(12000000)
+
+def test_chunked_rollup_matches_single_pass():
+    models = [make_model(f'{2015 + i % 6}-01-01', hold_period=3 + i % 5) for i in range(13)]
+    whole = portfolio_rollup(models, max_workers=1)
+    chunked = portfolio_rollup(models, max_workers=1, chunk_size=4)
+    for k in ('leveraged_cash_flow', 'noi', 'outstanding_debt', 'maturing_debt'):
+        assert np.allclose(whole[k], chunked[k])
+    assert np.allclose(whole['properties']['leveraged_irr'], chunked['properties']['leveraged_irr'], equal_nan=True)
+
+def test_rollup_rejects_bad_transaction_date():
+    with pytest.raises(ValueError):
+        portfolio_rollup([make_model('not a date')])
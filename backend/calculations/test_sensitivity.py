@@ -0,0 +1,34 @@
+import pytest
+from .cashflow import CashFlowCalculator
+from .sensitivity import sensitivity_grid
+from .test_cashflow import MockRealEstateModel
+
+def test_sensitivity_grid_matches_single_scenarios():
+    # Rents high enough to cover the default expense base
+    model = MockRealEstateModel(purchase_price=20000000, loan_amount=12000000, market_rent=30000, hold_period=5)
+    exit_caps = [0.06, 0.08, 0.1]
+    prices = [18000000, 20000000]
+    grid = sensitivity_grid(model, [('exit_cap_rate', exit_caps), ('purchase_price', prices)])
+    assert grid['leveraged_irr'].shape == (3, 2)
+    assert grid['leveraged_irr_converged'].all()
+    for i, exit_cap in enumerate(exit_caps):
+        for j, price in enumerate(prices):
+            point = MockRealEstateModel(purchase_price=price, loan_amount=12000000, market_rent=30000, hold_period=5)
+            expected = CashFlowCalculator(point, assumptions={'exit_cap_rate': exit_cap}).calculate_irr()
+            assert abs(grid['leveraged_irr'][i, j] - expected['leveraged_irr']) < 1e-9
+            assert abs(grid['unleveraged_equity_multiple'][i, j] - expected['unleveraged_equity_multiple']) < 1e-9
+
+def test_sensitivity_flat_rent_growth():
+    model = MockRealEstateModel(purchase_price=20000000, market_rent=30000, hold_period=4)
+    grid = sensitivity_grid(model, [('rent_growth_rate', [0.02]), ('vacancy_rate', [0.05, 0.1])])
+    expected = CashFlowCalculator(model, assumptions={'rent_growth_rates': [0.02] * 3, 'vacancy_rate': 0.1}).calculate_irr()
+    assert abs(grid['unleveraged_irr'][0, 1] - expected['unleveraged_irr']) < 1e-9
+
+def test_sensitivity_rejects_bad_axes():
+    model = MockRealEstateModel()
+    with pytest.raises(ValueError):
+        sensitivity_grid(model, [('loan_amount', [1.0])])
+    with pytest.raises(ValueError):
+        sensitivity_grid(model, [('capex', [1.0]), ('capex', [2.0])])
+    with pytest.raises(ValueError):
+        CashFlowCalculator(model, assumptions={'bogus': 1.0})
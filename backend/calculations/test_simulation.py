@@ -0,0 +1,41 @@
+import numpy as np
+from .simulation import SimulationConfig, StochasticProcess, ExitCapDistribution, StreamingStats, simulate, simulate_iter
+from .cashflow import CashFlowCalculator
+from .test_cashflow import MockRealEstateModel
+
+def make_model():
+    # Rents high enough to cover the default expense base
+    return MockRealEstateModel(purchase_price=20000000, loan_amount=12000000, market_rent=30000, hold_period=5)
+
+def test_streaming_stats_percentiles():
+    values = np.random.default_rng(0).normal(0.1, 0.05, 50000)
+    stats = StreamingStats()
+    for chunk in np.array_split(values, 7):
+        part = StreamingStats()
+        part.add(chunk)
+        stats.merge(part)
+    stats.add(np.array([np.nan]))
+    summary = stats.to_dict()
+    assert summary['not_converged'] == 1
+    assert abs(summary['mean'] - values.mean()) < 1e-12
+    for q in (5, 50, 95):
+        assert abs(summary['percentiles'][f'p{q}'] - np.percentile(values, q)) < 1e-3
+
+def test_simulation_is_deterministic_and_chunked():
+    config = SimulationConfig(paths=3000, chunk_size=1000, seed=11, max_workers=1)
+    updates = list(simulate_iter(make_model(), config))
+    assert [u['paths'] for u in updates] == [1000, 2000, 3000]
+    assert simulate(make_model(), config) == updates[-1]
+    assert 0 <= updates[-1]['probability_of_loss'] <= 1
+
+def test_zero_volatility_matches_deterministic_case():
+    model = make_model()
+    config = SimulationConfig(
+        paths=10, chunk_size=10, seed=1, max_workers=1,
+        rent_growth=StochasticProcess(), vacancy=StochasticProcess(),
+        exit_cap=ExitCapDistribution(kind='fixed')
+    )
+    summary = simulate(model, config)
+    expected = CashFlowCalculator(model).calculate_irr()['leveraged_irr']
+    assert abs(summary['leveraged_irr']['mean'] - expected) < 1e-9
+    assert summary['leveraged_irr']['std'] < 1e-6
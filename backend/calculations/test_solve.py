@@ -0,0 +1,41 @@
+import pytest
+from .pipeline import AnalysisPipeline
+from .solve import goal_seek, set_parameter
+from .test_pipeline import make_scenario
+
+def metric_at(scenario, parameter, value, metric, **kwargs):
+    pipeline = AnalysisPipeline()
+    pipeline.run(set_parameter(scenario, parameter, value, **kwargs))
+    return pipeline.outputs['returns'][metric]
+
+@pytest.mark.parametrize('parameter,metric,target', [
+    ('purchase_price', 'leveraged_irr', 0.15),
+    ('exit_cap_rate', 'leveraged_irr', 0.30),
+    ('rent_growth_rate', 'unleveraged_irr', 0.08),
+    ('vacancy_rate', 'leveraged_equity_multiple', 2.0),
+])
+def test_goal_seek_hits_target(parameter, metric, target):
+    scenario = make_scenario()
+    result = goal_seek(scenario, parameter, target, metric)
+    assert result['achieved'] == pytest.approx(target, abs=1e-6)
+    assert metric_at(scenario, parameter, result['value'], metric) == pytest.approx(target, abs=1e-6)
+
+def test_goal_seek_reuses_unaffected_stages():
+    result = goal_seek(make_scenario(), 'purchase_price', 0.15)
+    assert result['evaluations'] > 5
+    assert result['stage_runs'] == {'income': 1, 'expenses': 1, 'debt': 1, 'exit': 1, 'returns': result['evaluations']}
+
+def test_goal_seek_skips_equity_discontinuity():
+    # Below the loan amount equity turns negative and the multiple jumps sign; that is not a root
+    scenario = make_scenario()
+    result = goal_seek(scenario, 'purchase_price', 1.8, 'leveraged_equity_multiple')
+    assert result['equity_required'] > 0
+    assert result['achieved'] == pytest.approx(1.8)
+    scaled = goal_seek(scenario, 'purchase_price', 1.8, 'leveraged_equity_multiple', keep_loan_to_value=True)
+    assert metric_at(scenario, 'purchase_price', scaled['value'], 'leveraged_equity_multiple', keep_loan_to_value=True) == pytest.approx(1.8)
+
+def test_goal_seek_unreachable_target():
+    with pytest.raises(ValueError, match='does not reach'):
+        goal_seek(make_scenario(), 'exit_cap_rate', 5.0)
+    with pytest.raises(ValueError):
+        goal_seek(make_scenario(), 'hold_period', 0.1)
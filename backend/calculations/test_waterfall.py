@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from .irr import irr_batch
+from .waterfall import Waterfall, WaterfallTier
+
+def american_waterfall(lp_equity_share=1.0):
+    return Waterfall([
+        WaterfallTier('hurdle', lp_share=1.0, hurdle=0.08),
+        WaterfallTier('catch_up', lp_share=0.0, gp_target=0.2),
+        WaterfallTier('residual', lp_share=0.8),
+    ], lp_equity_share)
+
+def test_pref_catch_up_and_split():
+    result = american_waterfall().distribute([-100, 150])
+    # 108 pays the pref, 2 catches the GP up to 20% of the 10 profit, 40 splits 80/20
+    assert result['lp_distributions'][0, 1] == pytest.approx(140)
+    assert result['gp_distributions'][0, 1] == pytest.approx(10)
+    assert [t['gp'][0] for t in result['tiers']] == pytest.approx([0, 2, 8])
+    assert result['gp_promote'][0] == pytest.approx(10)
+
+def test_irr_hurdle_is_met_exactly_at_the_tier_boundary():
+    waterfall = Waterfall([
+        WaterfallTier('hurdle', lp_share=1.0, hurdle=0.08),
+        WaterfallTier('hurdle', lp_share=0.8, hurdle=0.12),
+        WaterfallTier('residual', lp_share=0.5),
+    ], lp_equity_share=1.0)
+    # What the LP must receive in year 3 for an 8% and a 12% IRR after 5 in each of years 1 and 2
+    at_8 = 100 * 1.08 ** 3 - 5 * 1.08 ** 2 - 5 * 1.08
+    at_12 = 100 * 1.12 ** 3 - 5 * 1.12 ** 2 - 5 * 1.12
+    final = at_8 + (at_12 - at_8) / 0.8
+    result = waterfall.distribute([[-100, 5, 5, final], [-100, 5, 5, final + 10]])
+    assert result['lp_irr'][0] == pytest.approx(0.12)
+    assert result['tiers'][2]['lp'] == pytest.approx([0, 5])
+    assert irr_batch(result['lp_flows'][1]).irr[0] > 0.12
+
+def test_equity_multiple_hurdle_and_co_invest():
+    waterfall = Waterfall([
+        WaterfallTier('hurdle', lp_share=0.9, hurdle=1.5, hurdle_type='equity_multiple'),
+        WaterfallTier('residual', lp_share=0.6),
+    ], lp_equity_share=0.9)
+    result = waterfall.distribute([-1000, 0, 2000])
+    # LP needs 1350 (1.5x its 900): 1500 fills tier 1 pari passu, the other 500 splits 60/40
+    assert result['lp_distributions'][0, 2] == pytest.approx(1350 + 300)
+    assert result['gp_distributions'][0, 2] == pytest.approx(150 + 200)
+    assert result['lp_equity_multiple'][0] == pytest.approx(1650 / 900)
+    assert result['gp_promote'][0] == pytest.approx(350 - 200)
+
+def test_batch_matches_one_scenario_at_a_time():
+    rng = np.random.default_rng(3)
+    flows = np.concatenate([np.full((200, 1), -1000.0), rng.normal(80, 40, (200, 6)), rng.normal(1400, 300, (200, 1))], axis=1)
+    waterfall = american_waterfall(lp_equity_share=0.9)
+    batch = waterfall.distribute(flows)
+    for i in (0, 57, 199):
+        single = waterfall.distribute(flows[i])
+        assert np.allclose(batch['lp_distributions'][i], single['lp_distributions'][0])
+        assert batch['gp_irr'][i] == pytest.approx(single['gp_irr'][0], nan_ok=True)
+    assert np.allclose(batch['lp_distributions'] + batch['gp_distributions'], np.maximum(flows, 0))
+
+def test_invalid_tiers_are_rejected():
+    with pytest.raises(ValueError):
+        Waterfall([WaterfallTier('hurdle', hurdle=0.08)])
+    with pytest.raises(ValueError):
+        Waterfall([WaterfallTier('catch_up', lp_share=0.0, gp_target=1.2), WaterfallTier('residual', lp_share=0.8)])
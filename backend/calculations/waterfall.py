@@ -0,0 +1,138 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from .irr import return_metrics
+
+TIER_KINDS = ('hurdle', 'catch_up', 'residual')
+HURDLE_TYPES = ('irr', 'equity_multiple')
+
+
+@dataclass
+class WaterfallTier:
+    """
+    One tier of a distribution waterfall; each period's cash fills the tiers in order.
+    hurdle: distributions split lp_share / 1 - lp_share until the LP's IRR (a per-period rate,
+    so annual for annual flows) or equity multiple reaches hurdle. The first hurdle tier, at the
+    preferred return, also returns capital.
+    catch_up: split lp_share / 1 - lp_share (0 for a full catch-up) until the GP's profit
+    (distributions beyond its own capital) is gp_target of all profit distributed so far.
+    residual: everything left, split lp_share / 1 - lp_share; must be the last tier.
+    """
+    kind: str = 'hurdle'
+    lp_share: float = 1.0
+    hurdle: Optional[float] = None
+    hurdle_type: str = 'irr'
+    gp_target: Optional[float] = None
+
+
+class Waterfall:
+    """
+    LP/GP equity waterfall over leveraged cash flows, vectorized across scenarios.
+    Contributions (negative flows) are split by lp_equity_share. Hurdles are tracked as running
+    balances per scenario, i.e. what the LP must still receive to reach each hurdle, compounded
+    at the hurdle rate every period. So no hurdle test needs an IRR solve: the loop runs once
+    per period and tier over (scenarios,) arrays, and the LP and GP IRRs are solved at the end
+    in one batch.
+    """
+    def __init__(self, tiers: Sequence[WaterfallTier], lp_equity_share: float = 0.9):
+        if not tiers or tiers[-1].kind != 'residual':
+            raise ValueError("The last waterfall tier must be the residual tier")
+        for tier in tiers:
+            if tier.kind not in TIER_KINDS:
+                raise ValueError(f"Unknown tier kind: {tier.kind}")
+            if not 0 <= tier.lp_share <= 1:
+                raise ValueError("lp_share must be between 0 and 1")
+            if tier.kind == 'hurdle':
+                if tier.hurdle is None or tier.hurdle_type not in HURDLE_TYPES:
+                    raise ValueError("Hurdle tiers need a hurdle and hurdle_type irr or equity_multiple")
+                if tier.lp_share == 0:
+                    raise ValueError("Hurdle tiers must pay the LP something (lp_share > 0)")
+            if tier.kind == 'catch_up' and (tier.gp_target is None or not 0 < tier.gp_target < 1 - tier.lp_share):
+                raise ValueError("Catch-up tiers need 0 < gp_target < 1 - lp_share")
+        if any(t.kind == 'residual' for t in tiers[:-1]):
+            raise ValueError("Only the last tier may be residual")
+        if not 0 < lp_equity_share <= 1:
+            raise ValueError("lp_equity_share must be in (0, 1]")
+        self.tiers = list(tiers)
+        self.lp_equity_share = lp_equity_share
+
+    def distribute(self, leveraged_flows) -> Dict[str, Any]:
+        """
+        Split (scenarios x periods) leveraged flows, or one flow vector, between LP and GP.
+        Returns per-period LP / GP distributions, their totals by tier, and the LP and GP IRR,
+        equity multiple and profit; the GP promote is what it received beyond its pro-rata share.
+        """
+        flows = np.atleast_2d(np.asarray(leveraged_flows, dtype=float))
+        n_scenarios, n_periods = flows.shape
+        n_tiers = len(self.tiers)
+        contributions = np.maximum(-flows, 0.0)
+        cash = np.maximum(flows, 0.0)
+
+        lp = np.zeros_like(flows)
+        gp = np.zeros_like(flows)
+        tier_lp = np.zeros((n_tiers, n_scenarios))
+        tier_gp = np.zeros((n_tiers, n_scenarios))
+        # What the LP must still receive to reach each hurdle tier's hurdle (0 for other tiers)
+        balance = np.zeros((n_tiers, n_scenarios))
+        is_hurdle = np.array([t.kind == 'hurdle' for t in self.tiers])
+        growth = np.array([1 + t.hurdle if t.kind == 'hurdle' and t.hurdle_type == 'irr' else 1.0 for t in self.tiers])[:, None]
+        required = np.array([
+            (t.hurdle if t.hurdle_type == 'equity_multiple' else 1.0) if t.kind == 'hurdle' else 0.0 for t in self.tiers
+        ])[:, None]
+        contributed = np.zeros(n_scenarios)
+        distributed = np.zeros(n_scenarios)
+        gp_received = np.zeros(n_scenarios)
+
+        for t in range(n_periods):
+            # Balances compound at the hurdle rate from the previous period, then take new capital
+            balance = balance * growth + required * (self.lp_equity_share * contributions[:, t])
+            contributed += contributions[:, t]
+            remaining = cash[:, t].copy()
+            for k, tier in enumerate(self.tiers):
+                if tier.kind == 'hurdle':
+                    amount = np.minimum(remaining, balance[k] / tier.lp_share)
+                elif tier.kind == 'catch_up':
+                    # Solve gp_profit + gp_share x = gp_target (profit + x) for the amount x
+                    gp_share = 1 - tier.lp_share
+                    profit = distributed - contributed
+                    gp_profit = gp_received - (1 - self.lp_equity_share) * contributed
+                    amount = np.clip((tier.gp_target * profit - gp_profit) / (gp_share - tier.gp_target), 0.0, remaining)
+                else:
+                    amount = remaining
+                to_lp = amount * tier.lp_share
+                to_gp = amount - to_lp
+                lp[:, t] += to_lp
+                gp[:, t] += to_gp
+                tier_lp[k] += to_lp
+                tier_gp[k] += to_gp
+                remaining = remaining - amount
+                distributed += amount
+                gp_received += to_gp
+                balance = np.where(is_hurdle[:, None], np.maximum(balance - to_lp, 0.0), 0.0)
+
+        lp_flows = lp - self.lp_equity_share * contributions
+        gp_flows = gp - (1 - self.lp_equity_share) * contributions
+        returns = return_metrics(np.concatenate([lp_flows, gp_flows]))
+        gp_pro_rata = (1 - self.lp_equity_share) * cash.sum(axis=1)
+        n = n_scenarios
+        return {
+            'lp_distributions': lp,
+            'gp_distributions': gp,
+            'lp_flows': lp_flows,
+            'gp_flows': gp_flows,
+            'tiers': [
+                {'kind': tier.kind, 'lp': tier_lp[k], 'gp': tier_gp[k]} for k, tier in enumerate(self.tiers)
+            ],
+            'lp_irr': returns['irr'][:n],
+            'gp_irr': returns['irr'][n:],
+            'lp_equity_multiple': returns['equity_multiple'][:n],
+            'gp_equity_multiple': returns['equity_multiple'][n:],
+            'lp_profit': lp_flows.sum(axis=1),
+            'gp_profit': gp_flows.sum(axis=1),
+            'gp_promote': gp.sum(axis=1) - gp_pro_rata,
+        }
+
+
+def tier_summaries(tiers: List[Dict[str, Any]], index: int) -> List[Dict[str, Any]]:
+    """One scenario's slice of Waterfall.distribute()['tiers']"""
+    return [{'kind': t['kind'], 'lp': float(t['lp'][index]), 'gp': float(t['gp'][index])} for t in tiers]
@@ -0,0 +1,173 @@
+import math
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .readers import Row, iter_chunks
+
+DEFAULT_CHUNK_SIZE = 5_000
+MAX_CHUNK_SIZE = 50_000  # Upper bound on client-requested chunk sizes, keeping chunks bounded
+MAX_ERRORS = 100  # Row errors kept for the report; the rest are only counted
+MAX_HEADER_ROWS = 25  # Title/banner rows skipped while looking for the header
+
+
+def normalize_header(value: Any) -> str:
+    """'Market Rent ($)' -> 'market rent'"""
+    return re.sub(r'[^a-z0-9]+', ' ', str(value or '').lower()).strip()
+
+
+def parse_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Numbers as exported by spreadsheets: '$1,250.00', '(300)', '5%' (-> 0.05); blank is None"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)  # Plain numbers and numeric strings
+    except (TypeError, ValueError):
+        pass
+    else:
+        if math.isfinite(number):
+            return number
+        raise ValueError(f"not a finite number: {value!r}")
+    text = str(value).strip().replace(',', '').replace('$', '')
+    if not text or text == '-':
+        return None
+    negative = text.startswith('(') and text.endswith(')')
+    text = text.strip('()')
+    scale = 1.0
+    if text.endswith('%'):
+        text, scale = text[:-1], 0.01
+    try:
+        number = float(text) * scale
+    except ValueError:
+        raise ValueError(f"not a number: {value!r}") from None
+    return -number if negative else number
+
+
+def parse_date(value: Any) -> Optional[str]:
+    """Dates as exported by spreadsheets: date cells, '2025-06-30', '6/30/2025' or '6/30/25'; blank is None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    if not text:
+        return None
+    for pattern in ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y'):
+        try:
+            return datetime.strptime(text[:10] if pattern == '%Y-%m-%d' else text, pattern).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"not a date: {value!r}")
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    aliases: Tuple[str, ...]
+    parse: Callable[[Any], Any]
+    required: bool = True
+
+
+class ChunkedImport:
+    """
+    Reads rows in bounded chunks: finds the header, type-coerces and validates each row and
+    hands every chunk's columns to add_chunk, so only one chunk of raw rows is held at a time.
+    Subclasses declare columns and implement add_chunk, finish and to_dict.
+    """
+    columns: Tuple[Column, ...] = ()
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, max_errors: int = MAX_ERRORS):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.error_count = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def _find_header(self, rows: Iterator[Row]) -> Tuple[int, Dict[str, int]]:
+        """Line number of the header row and the column index of every recognised field"""
+        for line, row in enumerate(rows, start=1):
+            if line > MAX_HEADER_ROWS:
+                break
+            headers = [normalize_header(cell) for cell in row]
+            positions = {}
+            for column in self.columns:
+                for alias in (column.name.replace('_', ' '),) + column.aliases:
+                    if alias in headers:
+                        positions[column.name] = headers.index(alias)
+                        break
+            if all(c.name in positions for c in self.columns if c.required):
+                return line, positions
+        required = ', '.join(c.name for c in self.columns if c.required)
+        raise ValueError(f"No header row with the required columns ({required}) found")
+
+    def error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': line, 'error': message})
+
+    def validate(self, record: Dict[str, Any]) -> Optional[str]:
+        """Error message for a parsed row, or None if it is valid"""
+        return None
+
+    def run(self, rows: Iterable[Row]) -> Iterator[Dict[str, Any]]:
+        """Import every row, yielding progress after each chunk"""
+        rows = iter(rows)
+        header_line, positions = self._find_header(rows)
+        fields = [(c.name, positions.get(c.name, -1), c.parse) for c in self.columns]
+        width = max(positions.values()) + 1
+        required = [c.name for c in self.columns if c.required]
+        line = header_line
+        for chunk in iter_chunks(rows, self.chunk_size):
+            values = {c.name: [] for c in self.columns}
+            lines = []
+            for row in chunk:
+                line += 1
+                self.rows_read += 1
+                if not any(cell is not None and str(cell).strip() for cell in row):
+                    continue
+                if len(row) < width:
+                    row = list(row) + [None] * (width - len(row))
+                record = {}
+                try:
+                    for name, index, parse in fields:
+                        record[name] = parse(row[index] if index >= 0 else None)
+                except ValueError as e:
+                    self.error(line, f"{name}: {e}")
+                    continue
+                missing = [name for name in required if record[name] is None]
+                message = f"missing {', '.join(missing)}" if missing else self.validate(record)
+                if message:
+                    self.error(line, message)
+                    continue
+                for k, v in record.items():
+                    values[k].append(v)
+                lines.append(line)
+                self.rows_imported += 1
+            self.add_chunk(values, lines)
+            yield self.progress()
+        self.finish()
+
+    def progress(self) -> Dict[str, Any]:
+        return {'rows_read': self.rows_read, 'rows_imported': self.rows_imported, 'errors': self.error_count}
+
+    def add_chunk(self, values: Dict[str, list], lines: List[int]):
+        """Take one chunk of valid rows (one list per column) and their source line numbers"""
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.progress(), 'error_details': self.errors}
@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional
+from .base import ChunkedImport, Column, normalize_header, parse_number, parse_text
+
+INCOME_CATEGORIES = ('income', 'revenue', 'other income')
+EXPENSE_CATEGORIES = ('expense', 'expenses', 'operating expense', 'operating expenses')
+
+
+class OperatingStatementImport(ChunkedImport):
+    """
+    Streams an operating statement (line item, income/expense category, annual amount) into
+    the income and expense breakdowns a scenario analysis accepts. Repeated line items are summed.
+    """
+    columns = (
+        Column('line_item', ('item', 'account', 'description', 'line'), parse_text),
+        Column('category', ('type', 'section', 'class'), parse_text),
+        Column('amount', ('annual', 'annual amount', 'total', 'value', 'ttm'), parse_number),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.income_breakdown: Dict[str, float] = {}
+        self.expense_breakdown: Dict[str, float] = {}
+
+    def validate(self, record: Dict[str, Any]) -> Optional[str]:
+        category = normalize_header(record['category'])
+        if category not in INCOME_CATEGORIES + EXPENSE_CATEGORIES:
+            return f"unknown category {record['category']!r} (expected income or expense)"
+        return None
+
+    def add_chunk(self, values: Dict[str, list], lines: List[int]):
+        for item, category, amount in zip(values['line_item'], values['category'], values['amount']):
+            breakdown = self.income_breakdown if normalize_header(category) in INCOME_CATEGORIES else self.expense_breakdown
+            breakdown[item] = breakdown.get(item, 0.0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **super().to_dict(),
+            'income_breakdown': self.income_breakdown,
+            'expense_breakdown': self.expense_breakdown,
+        }
@@ -0,0 +1,55 @@
+import csv
+import io
+from typing import IO, Iterator, List, Optional, Sequence, Union
+
+Row = Sequence[object]
+
+
+def iter_csv_rows(source: Union[str, IO]) -> Iterator[Row]:
+    """Rows of a CSV file path or binary/text file object, read one line at a time"""
+    if isinstance(source, str):
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            yield from csv.reader(f)
+        return
+    if not isinstance(source, io.TextIOBase):
+        source = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+    yield from csv.reader(source)
+
+
+def iter_xlsx_rows(source: Union[str, IO], sheet_name: Optional[str] = None) -> Iterator[Row]:
+    """
+    Cell values of one worksheet (the first by default), streamed with openpyxl's read-only
+    mode so the sheet is never fully loaded.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise ImportError("openpyxl is required to import .xlsx files") from e
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(source: Union[str, IO], filename: str = '', sheet_name: Optional[str] = None) -> Iterator[Row]:
+    """Rows of a CSV or xlsx source, picked by the (file)name's extension"""
+    name = (filename or (source if isinstance(source, str) else '')).lower()
+    if name.endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_rows(source, sheet_name)
+    if name.endswith('.csv') or not name:
+        return iter_csv_rows(source)
+    raise ValueError(f"Unsupported file type: {filename or source}")
+
+
+def iter_chunks(rows: Iterator[Row], chunk_size: int) -> Iterator[List[Row]]:
+    """Consecutive lists of at most chunk_size rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Any, Dict, List, Optional
+from models.realestatemodel import UnitType
+from models.rentroll import ColumnarRentRoll
+from .base import ChunkedImport, Column, parse_date, parse_number, parse_text
+
+
+def unit_type_mix(rent_roll: ColumnarRentRoll) -> List[UnitType]:
+    """Unit mix (count, average sqft and market rent per unit type) ready for a RealEstateModel"""
+    summary = rent_roll.summary()
+    return [
+        UnitType(
+            unit_type=unit_type,
+            description=unit_type,
+            unit_count=count,
+            sqft_per_unit=int(round(total_sqft / count)) if total_sqft else 0,
+            market_rent=round(market_rent, 2),
+        )
+        for unit_type, count, total_sqft, market_rent in zip(
+            summary['unit_type'], summary['unit_count'], summary['total_sqft'], summary['avg_market_rent']
+        )
+    ]
+
+
+class RentRollImport(ChunkedImport):
+    """Streams a rent roll into a ColumnarRentRoll, one compact array chunk at a time"""
+    columns = (
+        Column('unit_id', ('unit', 'unit number', 'unit no', 'unit id', 'apt', 'apartment'), parse_text),
+        Column('unit_type', ('type', 'floorplan', 'floor plan', 'bed bath'), parse_text),
+        Column('status', ('unit status', 'occupancy', 'occupancy status', 'lease status'), parse_text),
+        Column('market_rent', ('market', 'asking rent'), parse_number),
+        Column('actual_rent', ('rent', 'lease rent', 'contract rent', 'current rent', 'in place rent'), parse_number, required=False),
+        Column('loss_to_lease', ('ltl',), parse_number, required=False),
+        Column('sqft', ('sf', 'sq ft', 'square feet', 'size'), parse_number, required=False),
+        Column('lease_expiration', ('lease end', 'lease end date', 'lease expires', 'lease to', 'expiration', 'expiration date'), parse_date, required=False),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._parts: List[ColumnarRentRoll] = []
+        self._lines: List[np.ndarray] = []
+        self.result: Optional[ColumnarRentRoll] = None
+
+    def validate(self, record: Dict[str, Any]) -> Optional[str]:
+        if record['market_rent'] < 0 or (record['actual_rent'] or 0) < 0:
+            return "rents cannot be negative"
+        if record['sqft'] is not None and record['sqft'] <= 0:
+            return "sqft must be positive"
+        return None
+
+    def add_chunk(self, values: Dict[str, list], lines: List[int]):
+        if not values['unit_id']:
+            return
+        actual_rent = [0.0 if v is None else v for v in values['actual_rent']]
+        loss_to_lease = [
+            market - actual if loss is None else loss
+            for market, actual, loss in zip(values['market_rent'], actual_rent, values['loss_to_lease'])
+        ]
+        self._parts.append(ColumnarRentRoll(
+            values['unit_id'], values['unit_type'], values['status'],
+            values['market_rent'], actual_rent, loss_to_lease, values['sqft'], values['lease_expiration']
+        ))
+        self._lines.append(np.asarray(lines, dtype=np.int64))
+
+    def finish(self):
+        rent_roll = ColumnarRentRoll.concat(self._parts)
+        lines = np.concatenate(self._lines) if self._lines else np.zeros(0, dtype=np.int64)
+        self._parts, self._lines = [], []
+        # Later rows repeating a unit id are rejected, found with one sort over the id column
+        order = np.argsort(rent_roll.unit_id, kind='stable')
+        sorted_ids = rent_roll.unit_id[order]
+        duplicates = np.sort(order[1:][sorted_ids[1:] == sorted_ids[:-1]])
+        for index in duplicates.tolist():
+            self.error(int(lines[index]), f"duplicate unit {rent_roll.unit_id[index]}")
+        self.rows_imported -= len(duplicates)
+        if len(duplicates):
+            keep = np.ones(len(rent_roll), dtype=bool)
+            keep[duplicates] = False
+            rent_roll = rent_roll.take(keep)
+        self.result = rent_roll
+
+    def to_dict(self) -> Dict[str, Any]:
+        rent_roll = self.result
+        summary = {}
+        if rent_roll is not None and len(rent_roll):
+            summary = {
+                'totals': {k: v[0] for k, v in rent_roll.summary(by=()).items()},
+                'by_unit_type': rent_roll.summary(),
+                'by_status': rent_roll.summary(by=('status',)),
+                'unit_types': [u.__dict__ for u in unit_type_mix(rent_roll)],
+            }
+        return {**super().to_dict(), **summary}
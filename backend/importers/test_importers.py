@@ -0,0 +1,97 @@
+import io
+import json
+import pytest
+from datetime import datetime
+from .base import parse_date, parse_number
+from .operating import OperatingStatementImport
+from .readers import iter_rows
+from .rentroll import RentRollImport
+
+RENT_ROLL_CSV = b"""Rent Roll as of 01/01/2024
+
+Unit #,Floor Plan,Status,Market Rent,Lease Rent,SF
+101,1BR,Occupied,"$1,500.00",1450,700
+102,1BR,Vacant,1500,,700
+201,2BR,Occupied,2000,2000,
+202,2BR,Occupied,abc,2000,1000
+101,2BR,Occupied,2000,1900,900
+"""
+
+def run_import(importer, data, filename):
+    progress = list(importer.run(iter_rows(io.BytesIO(data), filename)))
+    return progress, importer.to_dict()
+
+def test_parse_number_spreadsheet_formats():
+    assert parse_number('$1,250.50') == 1250.5
+    assert parse_number('(300)') == -300
+    assert parse_number('5%') == pytest.approx(0.05)
+    assert parse_number('') is None
+    with pytest.raises(ValueError):
+        parse_number('n/a')
+
+def test_parse_date_spreadsheet_formats():
+    assert parse_date(datetime(2025, 6, 30, 0, 0)) == '2025-06-30'
+    assert parse_date('6/30/2025') == parse_date('06/30/25') == parse_date('2025-06-30 00:00:00') == '2025-06-30'
+    assert parse_date(' ') is None
+    with pytest.raises(ValueError):
+        parse_date('MTM')
+
+def test_rent_roll_import_in_chunks():
+    importer = RentRollImport(chunk_size=2)
+    progress, result = run_import(importer, RENT_ROLL_CSV, 'rent_roll.csv')
+    assert [p['rows_read'] for p in progress] == [2, 4, 5]
+    assert result['rows_imported'] == 3
+    # Bad rent on line 7 and the repeated unit 101 on line 8
+    assert [e['row'] for e in result['error_details']] == [7, 8]
+    rent_roll = importer.result
+    assert [u.unit_id for u in rent_roll] == ['101', '102', '201']
+    assert rent_roll[1].actual_rent == 0.0 and rent_roll[1].loss_to_lease == 1500.0
+    assert rent_roll[2].sqft is None
+    assert result['unit_types'][0] == {'unit_type': '1BR', 'description': '1BR', 'unit_count': 2, 'sqft_per_unit': 700, 'market_rent': 1500.0}
+
+def test_rent_roll_import_requires_header():
+    with pytest.raises(ValueError):
+        list(RentRollImport().run(iter_rows(io.BytesIO(b"a,b\n1,2\n"), 'x.csv')))
+
+def test_operating_statement_import():
+    data = b"Line Item,Category,Annual\nLaundry,Income,\"5,000\"\nLaundry,Income,500\nTaxes,Expense,(300)\nMisc,Other,1\n"
+    _, result = run_import(OperatingStatementImport(), data, 'statement.csv')
+    assert result['income_breakdown'] == {'Laundry': 5500.0}
+    assert result['expense_breakdown'] == {'Taxes': -300.0}
+    assert result['errors'] == 1
+
+def test_rent_roll_import_xlsx():
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['Unit', 'Type', 'Status', 'Market Rent', 'Lease End'])
+    for i in range(5):
+        sheet.append([f'A{i}', 'Studio', 'occupied', 1000 + i, datetime(2025, i + 1, 1) if i else None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    importer = RentRollImport()
+    _, result = run_import(importer, buffer.getvalue(), 'rent_roll.xlsx')
+    assert result['rows_imported'] == 5
+    assert result['totals']['avg_market_rent'] == 1002.0
+    assert [u.lease_expiration for u in importer.result][:2] == [None, '2025-02-01']
+
+def test_import_endpoint_streams_progress():
+    from fastapi.testclient import TestClient
+    from main import app
+    client = TestClient(app)
+    response = client.post('/import/rent-roll?chunk_size=2', files={'file': ('rent_roll.csv', RENT_ROLL_CSV, 'text/csv')})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['progress']['rows_read'] for line in lines[:-1]] == [2, 4, 5]
+    assert lines[-1]['status'] == 'success'
+    assert (lines[-1]['rows_imported'], lines[-1]['errors']) == (3, 2)
+    assert client.post('/import/leases', files={'file': ('x.csv', b'', 'text/csv')}).status_code == 404
+
+def test_import_endpoint_caps_chunk_size(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    monkeypatch.setattr(main, 'MAX_IMPORT_CHUNK', 2)
+    response = TestClient(main.app).post('/import/rent-roll?chunk_size=1000000000', files={'file': ('rent_roll.csv', RENT_ROLL_CSV, 'text/csv')})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['progress']['rows_read'] for line in lines[:-1]] == [2, 4, 5]
@@ -1,14 +1,64 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime
-from calculations.cashflow import CashFlowCalculator
+from calculations.cashflow import CashFlowCalculator, DebtServiceCalculator
+from calculations.debt import DEFAULT_RATE_PROCESS, DebtEngine, Refinancing, Tranche, rate_paths, summarize as summarize_debt
+from calculations.batch import BatchCashFlowCalculator, stack_assumptions
+from calculations.leasing import LeaseRolloverProjector
+from calculations.monthly import MonthlyCashFlowCalculator, ROLLUP_PERIODS, monthly_dates
+from calculations.sensitivity import sensitivity_grid
+from calculations.pipeline import AnalysisPipeline
+from calculations.portfolio import portfolio_rollup
+from calculations.solve import goal_seek
+from calculations.waterfall import Waterfall, WaterfallTier, tier_summaries
+from calculations.simulation import MAX_CHUNK_SIZE as MAX_SIMULATION_CHUNK, MIN_CHUNK_SIZE as MIN_SIMULATION_CHUNK, SimulationConfig, simulate_iter
+from services.cache import ResultCache, canonical_hash
+from services.encoding import FastJSONResponse, dumps, finite_list
+from services.export import XLSX_MEDIA_TYPE, XlsxReport
+from services.jobs import FINISHED, SUCCEEDED, InProcessQueue, JobManager
+from services.metrics import REGISTRY, TimingMiddleware, mark, sample_lines, timed
+from services.profiling import RequestProfiler
+from services.store import METRICS as STORE_METRICS, ScenarioStore, analysis_record
+from importers.base import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE as MAX_IMPORT_CHUNK
+from importers.operating import OperatingStatementImport
+from importers.readers import iter_rows
+from importers.rentroll import RentRollImport
 from models.realestatemodel import RealEstateModel, PropertyParameters, FinancingParameters, UnitType
-import math
+from models.rentroll import ColumnarRentRoll
+import dataclasses
+import json
+import os
+import queue
+import threading
+import uuid
+import numpy as np
 
 app = FastAPI()
 
+# Result cache for /analyze; set ANALYSIS_CACHE_PATH to keep results across restarts
+analysis_cache = ResultCache(
+    max_entries=int(os.environ.get("ANALYSIS_CACHE_SIZE", 1024)),
+    ttl_seconds=float(os.environ.get("ANALYSIS_CACHE_TTL", 3600)),
+    disk_path=os.environ.get("ANALYSIS_CACHE_PATH") or None,
+)
+# Part of every cache key; bump it whenever analysis results or their layout change, so entries
+# kept on disk by an older release are never served
+ANALYSIS_CACHE_VERSION = 1
+
+# Live what-if sessions, each holding its scenario, a memoized AnalysisPipeline and a lock that
+# serializes updates; idle sessions expire
+analysis_sessions = ResultCache(
+    max_entries=int(os.environ.get("ANALYSIS_SESSIONS", 256)),
+    ttl_seconds=float(os.environ.get("ANALYSIS_SESSION_TTL", 1800)),
+)
+
+# Saved scenarios and their results with version history; set SCENARIO_STORE_PATH to keep them on disk
+scenario_store = ScenarioStore(os.environ.get("SCENARIO_STORE_PATH") or ":memory:")
+MAX_RANKED_SCENARIOS = 1000
+
 # Allow CORS for local frontend development
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +68,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing headers and /metrics for every request; profiling is opt-in (see README)
+profiler = RequestProfiler(
+    allow_header=os.environ.get("PROFILING_ENABLED", "") == "1",
+    sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", 0)),
+    slow_seconds=float(os.environ.get("PROFILE_SLOW_MS", 0)) / 1000,
+)
+app.add_middleware(TimingMiddleware, profiler=profiler if profiler.enabled else None)
+
 # Import your calculation engine and models
 # from calculations.cashflow import CashFlowCalculator
 # from models.property import PropertyParameters
@@ -48,51 +106,892 @@ class FinancingRequest(BaseModel):
     interest_only_period: int
     loan_origination_fee_rate: float = 0.01
 
+class AssumptionsRequest(BaseModel):
+    # Unset fields keep the engine defaults
+    rent_growth_rates: Optional[List[float]] = None
+    vacancy_rate: Optional[float] = None
+    concessions_rate: Optional[float] = None
+    bad_debt_rate: Optional[float] = None
+    capex: Optional[float] = None
+    capex_growth_rate: Optional[float] = None
+    exit_cap_rate: Optional[float] = None
+    cost_of_sale_rate: Optional[float] = None
+
 class ScenarioAnalysisRequest(BaseModel):
     property: PropertyRequest
     financing: FinancingRequest
     unit_types: List[UnitTypeRequest]
     income_breakdown: Dict[str, float] = {}
     expense_breakdown: Dict[str, float] = {}
+    assumptions: AssumptionsRequest = AssumptionsRequest()
+
+class SolveRequest(BaseModel):
+    scenario: ScenarioAnalysisRequest
+    parameter: str = "purchase_price"  # Any of calculations.solve.SOLVE_PARAMETERS
+    metric: str = "leveraged_irr"  # leveraged / unleveraged irr or equity_multiple
+    target: float
+    bounds: Optional[List[float]] = None  # [low, high] search range for parameter
+    keep_loan_to_value: bool = False  # Scale the loan with the purchase price
+
+class SaveScenarioRequest(BaseModel):
+    name: Optional[str] = None
+    scenario: ScenarioAnalysisRequest
+
+class HoldPeriodRequest(ScenarioAnalysisRequest):
+    max_exit_year: Optional[int] = None  # Defaults to property.hold_period
+    discount_rate: Optional[float] = None  # Adds the NPV of every exit year
+
+class MonthlyAnalysisRequest(ScenarioAnalysisRequest):
+    capex_timing: str = "spread"  # spread, start or end of each year
+
+class RentRollUnitRequest(BaseModel):
+    unit_id: str
+    unit_type: str
+    status: str
+    market_rent: float
+    actual_rent: float = 0.0  # 0 for an occupied unit means in place at market
+    loss_to_lease: Optional[float] = None
+    sqft: Optional[float] = None
+    lease_expiration: Optional[str] = None  # YYYY-MM-DD
+
+class LeasingAssumptionsRequest(BaseModel):
+    # Unset fields keep the engine defaults
+    rent_growth_rates: Optional[List[float]] = None
+    lease_term: Optional[int] = None
+    renewal_probability: Optional[float] = None
+    downtime_months: Optional[int] = None
+    renewal_increase_cap: Optional[float] = None
+
+class LeaseRolloverRequest(BaseModel):
+    units: List[RentRollUnitRequest]
+    start_date: str  # YYYY-MM-DD; month 1 begins here
+    years: int = 10
+    assumptions: LeasingAssumptionsRequest = LeasingAssumptionsRequest()
+    include_monthly: bool = False
+
+class BatchAnalysisRequest(BaseModel):
+    scenarios: List[ScenarioAnalysisRequest]
+    include_annual_cash_flows: bool = True
+
+class WaterfallTierRequest(BaseModel):
+    kind: str = "hurdle"  # hurdle, catch_up or residual (last)
+    lp_share: float = 1.0  # LP's share of this tier's distributions
+    hurdle: Optional[float] = None  # LP IRR (e.g. 0.08) or equity multiple (e.g. 2.0)
+    hurdle_type: str = "irr"
+    gp_target: Optional[float] = None  # Catch-up until the GP holds this share of profit
+
+class WaterfallRequest(BaseModel):
+    scenarios: List[ScenarioAnalysisRequest]
+    tiers: List[WaterfallTierRequest]
+    lp_equity_share: float = 0.9
+    include_flows: bool = False  # Per-year LP / GP distributions
+
+class SensitivityAxis(BaseModel):
+    parameter: str
+    values: List[float]
+
+class SensitivityRequest(BaseModel):
+    scenario: ScenarioAnalysisRequest
+    axes: List[SensitivityAxis]
+
+class PortfolioRequest(BaseModel):
+    # Each property with its selected scenario; transaction_date places it on the calendar
+    properties: List[ScenarioAnalysisRequest]
+    max_workers: Optional[int] = None
+    include_properties: bool = True
+
+class StochasticProcessRequest(BaseModel):
+    # Unset fields keep the SimulationConfig defaults
+    mean: Optional[float] = None
+    volatility: Optional[float] = None
+    persistence: Optional[float] = None
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+class ExitCapDistributionRequest(BaseModel):
+    kind: Optional[str] = None
+    mean: Optional[float] = None
+    volatility: Optional[float] = None
+    minimum: Optional[float] = None
+
+class SimulationRequest(BaseModel):
+    scenario: ScenarioAnalysisRequest
+    paths: int = 100_000
+    chunk_size: int = 10_000
+    seed: Optional[int] = None
+    rent_growth: StochasticProcessRequest = StochasticProcessRequest()
+    vacancy: StochasticProcessRequest = StochasticProcessRequest()
+    exit_cap: ExitCapDistributionRequest = ExitCapDistributionRequest()
+    correlation: Optional[List[List[float]]] = None
+    dscr_threshold: float = 1.25
+    max_workers: Optional[int] = None  # Capped at the server's core count
+    stream: bool = False  # Stream the running summary as NDJSON after every chunk
+
+class TrancheRequest(BaseModel):
+    name: str
+    amount: Optional[float] = None  # Omit on a refinancing to take out the repaid balance
+    term: int
+    amortization_period: Optional[int] = None  # Interest-only to maturity when omitted
+    interest_only_period: int = 0
+    rate: Optional[float] = None  # Fixed coupon; omit to float at index + spread
+    spread: float = 0.0
+    floor: Optional[float] = None
+    cap: Optional[float] = None  # Rate cap strike on the index
+    origination_fee_rate: float = 0.0
+
+class RefinancingRequest(BaseModel):
+    year: int  # Repaid at the end of this hold year
+    repays: str
+    replacement: TrancheRequest
+
+class DebtAnalysisRequest(BaseModel):
+    scenario: ScenarioAnalysisRequest
+    tranches: Optional[List[TrancheRequest]] = None  # Defaults to the scenario's fixed-rate loan
+    refinancings: List[RefinancingRequest] = []
+    forward_curve: List[float] = []  # Annual index rates, held flat after the last
+    rate_shifts: List[float] = [0.0]  # Parallel stresses of the forward curve, one path each
+    random_paths: int = 0
+    rate_process: StochasticProcessRequest = StochasticProcessRequest()
+    seed: Optional[int] = None
+    dscr_threshold: float = 1.25
+    include_paths: bool = True  # Per-path debt service and DSCR, not just the summary
 
 @app.get("/")
 def read_root():
     return {"message": "Real Estate Analyzer API is running."}
 
-def sanitize_for_json(obj):
-    if isinstance(obj, dict):
-        return {k: sanitize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [sanitize_for_json(v) for v in obj]
-    elif isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    else:
-        return obj
-
-@app.post("/analyze")
-def analyze_scenario(request: ScenarioAnalysisRequest):
+def build_model(request: ScenarioAnalysisRequest) -> RealEstateModel:
     property_params = PropertyParameters(**request.property.dict())
     financing_params = FinancingParameters(**request.financing.dict())
     unit_types = [UnitType(**ut.dict()) for ut in request.unit_types]
-    model = RealEstateModel(property_params, financing_params, unit_types)
+    return RealEstateModel(property_params, financing_params, unit_types)
+
+def run_analysis(request: ScenarioAnalysisRequest, layout: str = "rows") -> Dict[str, Any]:
+    model = build_model(request)
+    property_params = model.property
     calculator = CashFlowCalculator(
         model,
         income_breakdown=request.income_breakdown or {},
-        expense_breakdown=request.expense_breakdown or {}
+        expense_breakdown=request.expense_breakdown or {},
+        assumptions=request.assumptions.dict(exclude_none=True)
     )
+    # All three read from the calculator's single cached projection, computed (and timed) first
+    calculator.project()
     irr_results = calculator.calculate_irr()
-    annual_cash_flows = [calculator.calculate_annual_cash_flow(year) for year in range(property_params.hold_period)]
     exit_analysis = calculator.calculate_exit_value(property_params.hold_period)
+    response = {"status": "success", "irr_results": irr_results}
+    if layout == "columnar":
+        columns = calculator.annual_cash_flow_columns()
+        response["annual_cash_flows"] = columns["columns"]
+        response["assumed_fields"] = columns["assumed"]
+    else:
+        response["annual_cash_flows"] = calculator.calculate_annual_cash_flows()
+    response["exit_analysis"] = exit_analysis
+    response["equity_required"] = model.calculate_equity_required()
+    return response
+
+@app.post("/analyze")
+def analyze_scenario(request: ScenarioAnalysisRequest, layout: Literal["rows", "columnar"] = "rows"):
+    """
+    layout=columnar returns annual_cash_flows as one list per field, with the fields whose
+    values were assumed listed once in assumed_fields instead of a *_assumed flag per row.
+    """
+    mark("validate")  # Reading and validating the body, before the handler ran
+    return FastJSONResponse(cached_analysis(request, layout))
+
+def cached_analysis(request: ScenarioAnalysisRequest, layout: str = "rows") -> Dict[str, Any]:
+    # Identical validated requests (after defaults are filled in) share one cache entry
+    with timed("cache"):
+        key = canonical_hash({"version": ANALYSIS_CACHE_VERSION, "layout": layout, "request": request.dict()})
+        result = analysis_cache.get(key)
+    if result is None:
+        result = run_analysis(request, layout)
+        analysis_cache.set(key, result)
+    return result
+
+@app.post("/analyze/monthly")
+def analyze_monthly(request: MonthlyAnalysisRequest):
+    """Monthly projection with quarterly and annual rollups, monthly IRR and XIRR over dated flows"""
+    try:
+        calculator = MonthlyCashFlowCalculator(
+            build_model(request),
+            assumptions=request.assumptions.dict(exclude_none=True),
+            capex_timing=request.capex_timing
+        )
+        irr_results = calculator.calculate_irr()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     response = {
         "status": "success",
+        "dates": irr_results["dates"][1:],  # Period-end dates; irr_results["dates"] adds the acquisition
+        "monthly": calculator.project(),
+        **{period: calculator.rollup(period) for period in ROLLUP_PERIODS},
         "irr_results": irr_results,
-        "annual_cash_flows": annual_cash_flows,
-        "exit_analysis": exit_analysis,
-        "equity_required": model.calculate_equity_required(),
+        "exit_analysis": calculator.calculate_exit_value(),
+    }
+    return FastJSONResponse(response)
+
+MAX_LEASING_YEARS = 50
+
+@app.post("/analyze/lease-rollover")
+def analyze_lease_rollover(request: LeaseRolloverRequest):
+    """Rental income projected unit by unit: lease expirations, renewals, downtime and loss-to-lease burn-off"""
+    if not 1 <= request.years <= MAX_LEASING_YEARS:
+        raise HTTPException(status_code=422, detail=f"years must be between 1 and {MAX_LEASING_YEARS}")
+    units = request.units
+    try:
+        rent_roll = ColumnarRentRoll(
+            [u.unit_id for u in units], [u.unit_type for u in units], [u.status for u in units],
+            [u.market_rent for u in units], [u.actual_rent for u in units],
+            [u.market_rent - u.actual_rent if u.loss_to_lease is None else u.loss_to_lease for u in units],
+            [u.sqft for u in units], [u.lease_expiration for u in units]
+        )
+        projector = LeaseRolloverProjector(
+            rent_roll, request.start_date, request.years, request.assumptions.dict(exclude_none=True)
+        )
+        dates = monthly_dates(request.start_date, projector.n_months)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    response = {
+        "status": "success",
+        "units": len(rent_roll),
+        "assumptions": projector.assumptions,
+        **{period: projector.rollup(period) for period in ROLLUP_PERIODS},
+    }
+    if request.include_monthly:
+        response["dates"] = dates[1:].astype(str).tolist()
+        response["monthly"] = projector.project()
+    return FastJSONResponse(response)
+
+MAX_EXIT_YEAR = 100
+
+@app.post("/analyze/hold-period")
+def analyze_hold_period(request: HoldPeriodRequest):
+    """Returns and proceeds for selling at the end of every year 1..N, from a single projection"""
+    if request.max_exit_year is not None and not 1 <= request.max_exit_year <= MAX_EXIT_YEAR:
+        raise HTTPException(status_code=422, detail=f"max_exit_year must be between 1 and {MAX_EXIT_YEAR}")
+    calculator = CashFlowCalculator(
+        build_model(request),
+        income_breakdown=request.income_breakdown or {},
+        expense_breakdown=request.expense_breakdown or {},
+        assumptions=request.assumptions.dict(exclude_none=True)
+    )
+    try:
+        curve = calculator.hold_period_curve(request.max_exit_year, request.discount_rate)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    best = {}
+    for metric in ("leveraged_irr", "unleveraged_irr") + (("leveraged_npv",) if request.discount_rate is not None else ()):
+        values = curve[metric]
+        best[metric] = int(curve["exit_year"][np.nanargmax(values)]) if np.isfinite(values).any() else None
+    return FastJSONResponse({"status": "success", "best_exit_year": best, "curve": curve})
+
+@app.post("/solve")
+def solve(request: SolveRequest):
+    """Goal seek: the value of one input (e.g. purchase price) at which a return metric hits its target"""
+    if request.bounds is not None and len(request.bounds) != 2:
+        raise HTTPException(status_code=422, detail="bounds must be [low, high]")
+    try:
+        result = goal_seek(
+            request.scenario.dict(), request.parameter, request.target, request.metric,
+            bounds=request.bounds, keep_loan_to_value=request.keep_loan_to_value
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return FastJSONResponse({"status": "success", **result})
+
+@app.get("/cache/stats")
+def cache_stats():
+    return analysis_cache.stats()
+
+@app.delete("/cache")
+def clear_cache():
+    analysis_cache.clear()
+    return {"status": "success"}
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """JSON merge patch (RFC 7386): objects merge recursively, null removes a key, anything else replaces"""
+    if not isinstance(patch, dict):
+        return patch
+    merged = dict(target) if isinstance(target, dict) else {}
+    for k, v in patch.items():
+        if v is None:
+            merged.pop(k, None)
+        else:
+            merged[k] = merge_patch(merged.get(k), v)
+    return merged
+
+def get_session(session_id: str):
+    session = analysis_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return session
+
+@app.post("/analyze/sessions")
+def create_session(request: ScenarioAnalysisRequest):
+    """Start a what-if session; later PATCHes recompute only the stages their edits touch"""
+    pipeline = AnalysisPipeline()
+    scenario = request.dict()
+    try:
+        recomputed, _ = pipeline.run(scenario)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    session_id = uuid.uuid4().hex
+    analysis_sessions.set(session_id, (scenario, pipeline, threading.Lock()))
+    return FastJSONResponse({
+        "status": "success",
+        "session_id": session_id,
+        "recomputed": recomputed,
+        "outputs": pipeline.outputs,
+    })
+
+@app.get("/analyze/sessions/{session_id}")
+def read_session(session_id: str):
+    _, _, lock = get_session(session_id)
+    with lock:
+        scenario, pipeline, _ = get_session(session_id)
+        return FastJSONResponse({
+            "status": "success",
+            "session_id": session_id,
+            "scenario": scenario,
+            "outputs": pipeline.outputs,
+        })
+
+@app.patch("/analyze/sessions/{session_id}")
+def update_session(session_id: str, patch: Dict[str, Any]):
+    """Apply a JSON merge patch to the session's scenario and return only the outputs that changed"""
+    _, _, lock = get_session(session_id)
+    # Concurrent PATCHes to one session apply one after another, each to the scenario the last left
+    with lock:
+        scenario, pipeline, _ = get_session(session_id)
+        try:
+            updated = ScenarioAnalysisRequest(**merge_patch(scenario, patch)).dict()
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=json.loads(e.json()))
+        try:
+            recomputed, changes = pipeline.run(updated)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        analysis_sessions.set(session_id, (updated, pipeline, lock))
+    return FastJSONResponse({
+        "status": "success",
+        "session_id": session_id,
+        "recomputed": recomputed,
+        "changes": changes,
+    })
+
+def save_scenario(request: SaveScenarioRequest, scenario_id: Optional[int] = None) -> Dict[str, Any]:
+    record = analysis_record(cached_analysis(request.scenario, "columnar"))
+    try:
+        saved = scenario_store.save(request.scenario.dict(), record, request.name, scenario_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown scenario")
+    return {"status": "success", **saved, "metrics": record["metrics"]}
+
+@app.post("/scenarios", status_code=201)
+def create_scenario(request: SaveScenarioRequest):
+    """Analyze and save a scenario as version 1 of a new stored scenario"""
+    return FastJSONResponse(save_scenario(request), status_code=201)
+
+@app.put("/scenarios/{scenario_id}")
+def update_scenario(scenario_id: int, request: SaveScenarioRequest):
+    """Analyze and save new inputs as the next version; unchanged inputs add no version"""
+    return FastJSONResponse(save_scenario(request, scenario_id))
+
+@app.get("/scenarios")
+def rank_scenarios(metric: str = "leveraged_irr", limit: int = 20, property_name: Optional[str] = None,
+                   order: Literal["desc", "asc"] = "desc"):
+    """Current versions of saved scenarios ranked by an indexed metric, e.g. the top 20 by leveraged IRR"""
+    if metric not in STORE_METRICS:
+        raise HTTPException(status_code=422, detail=f"metric must be one of {', '.join(STORE_METRICS)}")
+    if not 0 < limit <= MAX_RANKED_SCENARIOS:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {MAX_RANKED_SCENARIOS}")
+    scenarios = scenario_store.top(metric, limit, property_name, ascending=order == "asc")
+    return FastJSONResponse({"status": "success", "metric": metric, "scenarios": scenarios})
+
+@app.get("/scenarios/{scenario_id}")
+def read_scenario(scenario_id: int, version: Optional[int] = None, include_series: bool = True):
+    """A saved version (the current one by default): inputs, summary metrics and annual series"""
+    stored = scenario_store.get(scenario_id, version, include_series)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown scenario or version")
+    return FastJSONResponse({"status": "success", **stored})
+
+@app.get("/scenarios/{scenario_id}/versions")
+def scenario_versions(scenario_id: int):
+    history = scenario_store.history(scenario_id)
+    if not history:
+        raise HTTPException(status_code=404, detail="Unknown scenario")
+    return FastJSONResponse({"status": "success", "versions": history})
+
+@app.delete("/scenarios/{scenario_id}")
+def delete_scenario(scenario_id: int):
+    if not scenario_store.delete(scenario_id):
+        raise HTTPException(status_code=404, detail="Unknown scenario")
+    return {"status": "deleted"}
+
+def run_batch(request: BatchAnalysisRequest) -> Dict[str, Any]:
+    calculator = BatchCashFlowCalculator.from_models(
+        [build_model(scenario) for scenario in request.scenarios],
+        stack_assumptions([scenario.assumptions.dict(exclude_none=True) for scenario in request.scenarios])
+    )
+    return {
+        "status": "success",
+        "scenarios": calculator.results(include_annual_cash_flows=request.include_annual_cash_flows),
+    }
+
+@app.post("/analyze/batch")
+def analyze_batch(request: BatchAnalysisRequest):
+    """Evaluate many scenario variants in one (scenarios x years) array pass"""
+    try:
+        return FastJSONResponse(run_batch(request))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def run_waterfall(request: WaterfallRequest) -> Dict[str, Any]:
+    waterfall = Waterfall([WaterfallTier(**t.dict()) for t in request.tiers], request.lp_equity_share)
+    calculator = BatchCashFlowCalculator.from_models(
+        [build_model(scenario) for scenario in request.scenarios],
+        stack_assumptions([scenario.assumptions.dict(exclude_none=True) for scenario in request.scenarios])
+    )
+    irr_results = calculator.calculate_irr()
+    result = waterfall.distribute(irr_results["leveraged_flows"])
+    metrics = ("lp_irr", "gp_irr", "lp_equity_multiple", "gp_equity_multiple", "lp_profit", "gp_profit", "gp_promote")
+    columns = {k: finite_list(result[k]) for k in metrics + ("lp_distributions", "gp_distributions")}
+    deal_irr = finite_list(irr_results["leveraged_irr"])
+    scenarios = []
+    for i, hold_period in enumerate(calculator.hold_period.tolist()):
+        scenario = {"leveraged_irr": deal_irr[i], **{k: columns[k][i] for k in metrics}, "tiers": tier_summaries(result["tiers"], i)}
+        if request.include_flows:
+            scenario["lp_distributions"] = columns["lp_distributions"][i][:hold_period + 1]
+            scenario["gp_distributions"] = columns["gp_distributions"][i][:hold_period + 1]
+        scenarios.append(scenario)
+    return {"status": "success", "scenarios": scenarios}
+
+@app.post("/waterfall")
+def analyze_waterfall(request: WaterfallRequest):
+    """LP / GP returns of each scenario's leveraged flows through a promote waterfall, in one batch"""
+    try:
+        return FastJSONResponse(run_waterfall(request))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def run_sensitivity(request: SensitivityRequest) -> Dict[str, Any]:
+    grid = sensitivity_grid(
+        build_model(request.scenario),
+        [(axis.parameter, axis.values) for axis in request.axes],
+        request.scenario.assumptions.dict(exclude_none=True)
+    )
+    return {
+        "status": "success",
+        "axes": [axis.dict() for axis in request.axes],
+        **{k: finite_list(v) for k, v in grid.items()},
+    }
+
+@app.post("/sensitivity")
+def analyze_sensitivity(request: SensitivityRequest):
+    """IRR / equity multiple grid over two or three assumption axes in one vectorized pass"""
+    try:
+        return FastJSONResponse(run_sensitivity(request))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def run_portfolio(request: PortfolioRequest) -> Dict[str, Any]:
+    result = portfolio_rollup(
+        [build_model(p) for p in request.properties],
+        [p.assumptions.dict(exclude_none=True) for p in request.properties],
+        max_workers=request.max_workers,
+    )
+    properties = result.pop("properties")
+    response = {"status": "success"}
+    for k, v in result.items():
+        response[k] = finite_list(np.asarray(v))
+    if request.include_properties:
+        response["properties"] = {
+            "property_name": [p.property.property_name for p in request.properties],
+            **{k: finite_list(v) for k, v in properties.items()},
+        }
+    return response
+
+@app.post("/portfolio")
+def analyze_portfolio(request: PortfolioRequest):
+    """Calendar-year portfolio roll-up: combined cash flows, IRR and debt maturity profile"""
+    try:
+        return FastJSONResponse(run_portfolio(request))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+MAX_SIMULATION_PATHS = 10_000_000
+
+def build_simulation_config(request: SimulationRequest) -> SimulationConfig:
+    config = SimulationConfig(
+        paths=request.paths,
+        chunk_size=min(max(request.chunk_size, MIN_SIMULATION_CHUNK), MAX_SIMULATION_CHUNK),
+        seed=request.seed,
+        dscr_threshold=request.dscr_threshold,
+        max_workers=request.max_workers,
+    )
+    if request.correlation is not None:
+        config.correlation = request.correlation
+    config.rent_growth = dataclasses.replace(config.rent_growth, **request.rent_growth.dict(exclude_none=True))
+    config.vacancy = dataclasses.replace(config.vacancy, **request.vacancy.dict(exclude_none=True))
+    config.exit_cap = dataclasses.replace(config.exit_cap, **request.exit_cap.dict(exclude_none=True))
+    return config
+
+@app.post("/simulate")
+def simulate_scenario(request: SimulationRequest):
+    """Monte Carlo over rent growth, vacancy and exit cap; returns summary statistics, never paths"""
+    if request.paths > MAX_SIMULATION_PATHS:
+        raise HTTPException(status_code=422, detail=f"paths is limited to {MAX_SIMULATION_PATHS}")
+    model = build_model(request.scenario)
+    config = build_simulation_config(request)
+    assumptions = request.scenario.assumptions.dict(exclude_none=True)
+    try:
+        updates = simulate_iter(model, config, assumptions)
+        first = next(updates)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if request.stream:
+        def ndjson():
+            yield dumps(first) + b"\n"
+            for summary in updates:
+                yield dumps(summary) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    summary = first
+    for summary in updates:
+        pass
+    return FastJSONResponse({"status": "success", **summary})
+
+MAX_RATE_PATHS = 10_000
+
+@app.post("/analyze/debt")
+def analyze_debt(request: DebtAnalysisRequest):
+    """Debt service and DSCR of a multi-tranche, fixed or floating capital stack across rate paths"""
+    hold_period = request.scenario.property.hold_period
+    if request.random_paths < 0:
+        raise HTTPException(status_code=422, detail="random_paths must be at least 0")
+    n_paths = (len(request.rate_shifts) if request.forward_curve else 1) + request.random_paths
+    if n_paths < 1:
+        raise HTTPException(status_code=422, detail="at least one rate path is required")
+    if n_paths > MAX_RATE_PATHS:
+        raise HTTPException(status_code=422, detail=f"rate paths are limited to {MAX_RATE_PATHS}")
+    model = build_model(request.scenario)
+    calculator = CashFlowCalculator(
+        model,
+        income_breakdown=request.scenario.income_breakdown or {},
+        expense_breakdown=request.scenario.expense_breakdown or {},
+        assumptions=request.scenario.assumptions.dict(exclude_none=True)
+    )
+    noi = calculator.project()["flows"]["noi"]
+    try:
+        if request.tranches is None:
+            engine = DebtEngine.from_financing(model.financing, years=hold_period)
+        else:
+            engine = DebtEngine(
+                [Tranche(**t.dict()) for t in request.tranches],
+                [Refinancing(r.year, r.repays, Tranche(**r.replacement.dict())) for r in request.refinancings],
+                years=hold_period,
+            )
+        index_rates = None
+        if request.forward_curve:
+            process = dataclasses.replace(DEFAULT_RATE_PROCESS, **request.rate_process.dict(exclude_none=True))
+            index_rates = rate_paths(request.forward_curve, request.rate_shifts, request.random_paths, process, request.seed)
+        result = engine.evaluate(index_rates, noi=noi)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    response = {"status": "success", "summary": summarize_debt(result, request.dscr_threshold)}
+    if request.include_paths:
+        response["index_rates"] = index_rates
+        response.update(result)
+    return FastJSONResponse(response)
+
+IMPORTERS = {
+    "rent-roll": RentRollImport,
+    "operating-statement": OperatingStatementImport,
+}
+
+@app.post("/import/{kind}")
+def import_file(kind: str, file: UploadFile = File(...), sheet: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Stream a CSV or xlsx rent roll / operating statement in bounded chunks.
+    Responds with NDJSON: a progress line per chunk, then the import summary. chunk_size is
+    capped at MAX_IMPORT_CHUNK rows.
+    """
+    if kind not in IMPORTERS:
+        raise HTTPException(status_code=404, detail=f"Unknown import type: {kind}")
+    try:
+        importer = IMPORTERS[kind](chunk_size=min(chunk_size, MAX_IMPORT_CHUNK))
+        events = importer.run(iter_rows(file.file, file.filename or "", sheet))
+        # Header problems surface as a 422 before streaming starts
+        first = next(events, None)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    def ndjson():
+        if first is not None:
+            yield dumps({"progress": first}) + b"\n"
+            for progress in events:
+                yield dumps({"progress": progress}) + b"\n"
+        yield dumps({"status": "success", **importer.to_dict()}) + b"\n"
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+# Excel exports. Every report is written by a write-only workbook and streamed from a temporary
+# file, so batches are computed EXPORT_CHUNK_SIZE scenarios at a time and never held whole.
+EXPORT_CHUNK_SIZE = 1000
+BATCH_EXPORT_METRICS = (
+    "unleveraged_irr", "leveraged_irr", "unleveraged_equity_multiple", "leveraged_equity_multiple",
+)
+
+def xlsx_response(report: XlsxReport, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        report.stream(), media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def unit_mix_columns(unit_types: List[UnitTypeRequest]) -> Dict[str, list]:
+    return {
+        "unit_type": [u.unit_type for u in unit_types],
+        "description": [u.description for u in unit_types],
+        "unit_count": [u.unit_count for u in unit_types],
+        "sqft_per_unit": [u.sqft_per_unit for u in unit_types],
+        "market_rent": [u.market_rent for u in unit_types],
+        "total_sqft": [u.unit_count * u.sqft_per_unit for u in unit_types],
+        "annual_potential_rent": [u.unit_count * u.market_rent * 12 for u in unit_types],
     }
-    return sanitize_for_json(response)
+
+@app.post("/export/analysis")
+def export_analysis(request: ScenarioAnalysisRequest):
+    """xlsx report of one scenario: returns, annual cash flows, equity flows, monthly amortization and unit mix"""
+    result = cached_analysis(request, "columnar")
+    irr_results = result["irr_results"]
+    debt = DebtServiceCalculator(build_model(request).financing)
+    report = XlsxReport()
+    report.add_key_values("Summary", {
+        "Returns": {k: v for k, v in irr_results.items() if not isinstance(v, list)},
+        "Exit": result["exit_analysis"],
+        "Equity": {"equity_required": result["equity_required"]},
+    })
+    report.add_periods("Annual Cash Flows", result["annual_cash_flows"])
+    report.add_periods("Equity Flows", {
+        k: irr_results[k] for k in ("unleveraged_flows", "leveraged_flows")
+    }, first_period=0)
+    schedule = debt.monthly_schedule
+    report.add_sheet(
+        "Amortization", ("month", "year", *schedule),
+        zip(debt.months.tolist(), ((debt.months - 1) // 12 + 1).tolist(), *(v.tolist() for v in schedule.values()))
+    )
+    report.add_columns("Unit Mix", unit_mix_columns(request.unit_types))
+    return xlsx_response(report, "analysis.xlsx")
+
+@app.post("/export/batch")
+def export_batch(request: BatchAnalysisRequest):
+    """
+    xlsx of a batch: one row of returns per scenario and, with include_annual_cash_flows, one
+    row per scenario and year, computed and written EXPORT_CHUNK_SIZE scenarios at a time
+    """
+    report = XlsxReport()
+    summary = report.new_sheet("Scenarios", (
+        "scenario", "property_name", "purchase_price", "loan_amount", "hold_period",
+        *BATCH_EXPORT_METRICS, "equity_required", "net_sale_price", "net_proceeds",
+    ))
+    if not request.scenarios:
+        raise HTTPException(status_code=422, detail="A batch needs at least one scenario")
+    annual = None
+    for start in range(0, len(request.scenarios), EXPORT_CHUNK_SIZE):
+        chunk = request.scenarios[start:start + EXPORT_CHUNK_SIZE]
+        try:
+            calculator = BatchCashFlowCalculator.from_models(
+                [build_model(scenario) for scenario in chunk],
+                stack_assumptions([scenario.assumptions.dict(exclude_none=True) for scenario in chunk])
+            )
+            irr_results = calculator.calculate_irr()
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        exit_data = calculator.calculate_exit_value()
+        for i, scenario in enumerate(chunk):
+            report.append(summary, (
+                start + i + 1, scenario.property.property_name, scenario.property.purchase_price,
+                scenario.financing.loan_amount, scenario.property.hold_period,
+                *(irr_results[k][i] for k in BATCH_EXPORT_METRICS), calculator.equity_required[i],
+                exit_data["net_sale_price"][i], exit_data["net_proceeds"][i],
+            ))
+        if request.include_annual_cash_flows:
+            projection = calculator.project()
+            if annual is None:
+                annual = report.new_sheet("Annual Cash Flows", ("scenario", "year", *projection))
+            for i, hold_period in enumerate(calculator.hold_period.tolist()):
+                for year in range(hold_period):
+                    report.append(annual, (start + i + 1, year + 1, *(v[i, year] for v in projection.values())))
+    return xlsx_response(report, "batch.xlsx")
+
+@app.post("/export/sensitivity")
+def export_sensitivity(request: SensitivityRequest):
+    """xlsx of a sensitivity grid: one row per grid point and, for two axes, one matrix sheet per metric"""
+    try:
+        grid = sensitivity_grid(
+            build_model(request.scenario),
+            [(axis.parameter, axis.values) for axis in request.axes],
+            request.scenario.assumptions.dict(exclude_none=True)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    names = [axis.parameter for axis in request.axes]
+    report = XlsxReport()
+    points = np.array(np.meshgrid(*(axis.values for axis in request.axes), indexing="ij")).reshape(len(names), -1).T
+    report.add_sheet(
+        "Grid", (*names, *grid),
+        ((*point, *(values.flat[i] for values in grid.values())) for i, point in enumerate(points.tolist()))
+    )
+    if len(names) == 2:
+        rows, columns = request.axes
+        for metric, values in grid.items():
+            report.add_sheet(
+                metric, (f"{rows.parameter} / {columns.parameter}", *columns.values),
+                ([label, *row] for label, row in zip(rows.values, values.tolist()))
+            )
+    return xlsx_response(report, "sensitivity.xlsx")
+
+@app.post("/export/rent-roll")
+def export_rent_roll(file: UploadFile = File(...), sheet: Optional[str] = None):
+    """xlsx summary of an uploaded rent roll: totals, by unit type, by status and the derived unit mix"""
+    importer = RentRollImport()
+    try:
+        for _ in importer.run(iter_rows(file.file, file.filename or "", sheet)):
+            pass
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    summary = importer.to_dict()
+    if "totals" not in summary:
+        raise HTTPException(status_code=422, detail="The rent roll has no valid units")
+    report = XlsxReport()
+    report.add_key_values("Totals", {"Rent roll": summary["totals"]})
+    report.add_columns("By Unit Type", summary["by_unit_type"])
+    report.add_columns("By Status", summary["by_status"])
+    unit_types = summary["unit_types"]
+    report.add_columns("Unit Mix", {k: [u[k] for u in unit_types] for k in unit_types[0]})
+    return xlsx_response(report, "rent_roll.xlsx")
+
+# Background jobs for heavy analyses. Each kind maps to its request model and a runner
+# returning the same response as its endpoint (or yielding progress first, then returning it).
+def run_simulation_job(request: SimulationRequest):
+    config = build_simulation_config(request)
+    config.max_workers = 1  # The job already occupies one of the job pool's processes
+    summary = None
+    for summary in simulate_iter(build_model(request.scenario), config, request.scenario.assumptions.dict(exclude_none=True)):
+        yield {"paths_completed": summary["paths"], "paths": request.paths}
+    return {"status": "success", **summary}
+
+def run_portfolio_job(request: PortfolioRequest):
+    return run_portfolio(request.copy(update={"max_workers": 1}))
+
+JOB_KINDS = {
+    "analyze": (ScenarioAnalysisRequest, run_analysis),
+    "batch": (BatchAnalysisRequest, run_batch),
+    "sensitivity": (SensitivityRequest, run_sensitivity),
+    "waterfall": (WaterfallRequest, run_waterfall),
+    "portfolio": (PortfolioRequest, run_portfolio_job),
+    "simulate": (SimulationRequest, run_simulation_job),
+}
+
+memory_limit_mb = float(os.environ.get("JOB_MEMORY_LIMIT_MB", 2048))
+jobs = JobManager(
+    {kind: runner for kind, (_, runner) in JOB_KINDS.items()},
+    max_workers=int(os.environ.get("JOB_WORKERS", 2)),
+    time_limit=float(os.environ.get("JOB_TIME_LIMIT", 300)),
+    memory_limit=int(memory_limit_mb * 2 ** 20) if memory_limit_mb > 0 else None,
+    job_queue=InProcessQueue(int(os.environ.get("JOB_QUEUE_SIZE", 100))),
+    max_jobs=int(os.environ.get("JOB_HISTORY_SIZE", 100)),
+    result_ttl=float(os.environ.get("JOB_RESULT_TTL", 3600)),
+)
+
+class JobRequest(BaseModel):
+    kind: str
+    payload: Dict[str, Any]  # The request body of the matching endpoint
+    time_limit: Optional[float] = None  # Seconds; capped at JOB_TIME_LIMIT
+
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    """Queue an analysis to run in the background; poll, stream, cancel or fetch it by job_id"""
+    if request.kind not in JOB_KINDS:
+        raise HTTPException(status_code=422, detail=f"Unknown job kind: {request.kind}")
+    try:
+        payload = JOB_KINDS[request.kind][0](**request.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+    if request.kind == "simulate" and payload.paths > MAX_SIMULATION_PATHS:
+        raise HTTPException(status_code=422, detail=f"paths is limited to {MAX_SIMULATION_PATHS}")
+    try:
+        job = jobs.submit(request.kind, payload, request.time_limit)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Job queue is full")
+    return FastJSONResponse(job.to_dict(), status_code=202)
+
+@app.get("/jobs")
+def job_stats():
+    return jobs.stats()
+
+@app.get("/jobs/{job_id}")
+def read_job(job_id: str):
+    return FastJSONResponse(get_job(job_id).to_dict())
+
+@app.get("/jobs/{job_id}/events")
+def stream_job(job_id: str):
+    """NDJSON job status on every progress update until the job finishes"""
+    get_job(job_id)
+    def ndjson():
+        for job in jobs.watch(job_id):
+            yield dumps(job.to_dict()) + b"\n"
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    job = get_job(job_id)
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail={"status": job.status, "error": job.error})
+    return FastJSONResponse(job.result)
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    get_job(job_id)
+    return FastJSONResponse(jobs.cancel(job_id).to_dict())
+
+def app_metrics() -> List[str]:
+    cache = analysis_cache.stats()
+    job_counts = jobs.stats()
+    return [
+        *sample_lines("analysis_cache_lookups_total", "/analyze result cache lookups by outcome", "counter",
+                      {"hit": cache["hits"], "disk_hit": cache["disk_hits"], "miss": cache["misses"]}, "outcome"),
+        *sample_lines("analysis_cache_entries", "/analyze results held in memory", "gauge", {"": cache["entries"]}),
+        *sample_lines("analysis_sessions", "Live what-if sessions", "gauge", {"": analysis_sessions.stats()["entries"]}),
+        *sample_lines("stored_scenarios", "Saved scenarios and versions", "gauge", scenario_store.stats(), "kind"),
+        *sample_lines("jobs", "Background jobs by status", "gauge",
+                      {status: job_counts[status] for status in ("queued", "running") + FINISHED}, "status"),
+    ]
+
+REGISTRY.collectors.append(app_metrics)
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition: request and stage latency histograms, cache, session and job counts"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/profiles")
+def list_profiles():
+    return {"enabled": profiler.enabled, "profiles": profiler.list()}
+
+@app.get("/debug/profiles/{profile_id}")
+def read_profile(profile_id: str):
+    """Collapsed stacks of one profiled request, for flamegraph.pl or speedscope"""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired profile")
+    return PlainTextResponse(profile.collapsed())
 
 if __name__ == "__main__":
     print("Backend structure is ready. Data models and calculation stubs are in place.")
@@ -1,5 +1,7 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 
 @dataclass
 class RentRollUnit:
@@ -10,7 +12,202 @@ class RentRollUnit:
     actual_rent: float
     loss_to_lease: float
     sqft: Optional[float] = None
+    lease_expiration: Optional[str] = None  # ISO date the current lease ends
 
 @dataclass
 class RentRoll:
     units: List[RentRollUnit] = field(default_factory=list)
+
+OCCUPIED_STATUSES = ('occupied',)
+RENT_DTYPE = np.float64
+GROUP_FIELDS = ('unit_type', 'status')
+
+def _categorize(labels: Iterable[str]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Sorted category labels and the smallest unsigned integer codes that index them"""
+    categories, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    return tuple(categories.tolist()), codes.astype(np.min_scalar_type(max(len(categories) - 1, 0)))
+
+class ColumnarRentRoll(Sequence):
+    """
+    Array-backed rent roll: one compact column per field, with unit_type and status stored as
+    categorical codes and lease_expiration as datetime64[D] (NaT when unknown). Indexing and
+    iteration still yield RentRollUnit dataclasses, so it can stand in wherever a RentRoll's units
+    list is read.
+    """
+    def __init__(self, unit_id, unit_type, status, market_rent, actual_rent, loss_to_lease=None, sqft=None, lease_expiration=None):
+        self.unit_id = np.asarray(unit_id, dtype=str)
+        self.unit_types, self.unit_type_codes = _categorize(unit_type)
+        self.statuses, self.status_codes = _categorize(status)
+        self.market_rent = np.asarray(market_rent, dtype=RENT_DTYPE)
+        self.actual_rent = np.asarray(actual_rent, dtype=RENT_DTYPE)
+        self.loss_to_lease = (
+            self.market_rent - self.actual_rent if loss_to_lease is None
+            else np.asarray(loss_to_lease, dtype=RENT_DTYPE)
+        )
+        # Missing square footage is NaN
+        if sqft is None:
+            self.sqft = np.full(len(self.unit_id), np.nan)
+        elif isinstance(sqft, np.ndarray):
+            self.sqft = sqft.astype(float)
+        else:
+            self.sqft = np.array([np.nan if s is None else s for s in sqft], dtype=float)
+        if lease_expiration is None:
+            self.lease_expiration = np.full(len(self.unit_id), np.datetime64('NaT'), dtype='datetime64[D]')
+        else:
+            self.lease_expiration = np.array(lease_expiration, dtype='datetime64[D]').reshape(-1)
+        lengths = {len(c) for c in (
+            self.unit_type_codes, self.status_codes, self.market_rent, self.actual_rent, self.loss_to_lease, self.sqft, self.lease_expiration
+        )}
+        if lengths != {len(self.unit_id)}:
+            raise ValueError("Rent roll columns must all have one value per unit")
+
+    @classmethod
+    def from_units(cls, units: Iterable[RentRollUnit]) -> 'ColumnarRentRoll':
+        units = list(units)
+        return cls(
+            [u.unit_id for u in units], [u.unit_type for u in units], [u.status for u in units],
+            [u.market_rent for u in units], [u.actual_rent for u in units],
+            [u.loss_to_lease for u in units], [u.sqft for u in units], [u.lease_expiration for u in units]
+        )
+
+    @classmethod
+    def from_rent_roll(cls, rent_roll: RentRoll) -> 'ColumnarRentRoll':
+        return cls.from_units(rent_roll.units)
+
+    @classmethod
+    def _from_arrays(cls, unit_id, unit_types, unit_type_codes, statuses, status_codes, market_rent, actual_rent, loss_to_lease, sqft,
+                     lease_expiration) -> 'ColumnarRentRoll':
+        rent_roll = cls.__new__(cls)
+        rent_roll.unit_id = unit_id
+        rent_roll.unit_types, rent_roll.unit_type_codes = unit_types, unit_type_codes
+        rent_roll.statuses, rent_roll.status_codes = statuses, status_codes
+        rent_roll.market_rent, rent_roll.actual_rent, rent_roll.loss_to_lease = market_rent, actual_rent, loss_to_lease
+        rent_roll.sqft = sqft
+        rent_roll.lease_expiration = lease_expiration
+        return rent_roll
+
+    @classmethod
+    def concat(cls, parts: List['ColumnarRentRoll']) -> 'ColumnarRentRoll':
+        """One rent roll from several (e.g. chunks of an import), merging their categories"""
+        if not parts:
+            return cls([], [], [], [], [])
+
+        def merge(labels_of, codes_of):
+            labels = tuple(sorted(set().union(*(labels_of(p) for p in parts))))
+            lookup = {label: i for i, label in enumerate(labels)}
+            dtype = np.min_scalar_type(max(len(labels) - 1, 0))
+            codes = np.concatenate([
+                np.array([lookup[label] for label in labels_of(p)], dtype=dtype)[codes_of(p)] if len(codes_of(p)) else np.zeros(0, dtype)
+                for p in parts
+            ])
+            return labels, codes
+
+        return cls._from_arrays(
+            np.concatenate([p.unit_id for p in parts]),
+            *merge(lambda p: p.unit_types, lambda p: p.unit_type_codes),
+            *merge(lambda p: p.statuses, lambda p: p.status_codes),
+            *(np.concatenate([getattr(p, k) for p in parts]) for k in ('market_rent', 'actual_rent', 'loss_to_lease', 'sqft', 'lease_expiration'))
+        )
+
+    def take(self, indices) -> 'ColumnarRentRoll':
+        """The units at the given positions (or boolean mask), keeping the categories"""
+        return self._from_arrays(
+            self.unit_id[indices], self.unit_types, self.unit_type_codes[indices], self.statuses, self.status_codes[indices],
+            self.market_rent[indices], self.actual_rent[indices], self.loss_to_lease[indices], self.sqft[indices],
+            self.lease_expiration[indices]
+        )
+
+    def __len__(self) -> int:
+        return len(self.unit_id)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        sqft = self.sqft[index]
+        expiration = self.lease_expiration[index]
+        return RentRollUnit(
+            unit_id=str(self.unit_id[index]),
+            unit_type=self.unit_types[self.unit_type_codes[index]],
+            status=self.statuses[self.status_codes[index]],
+            market_rent=float(self.market_rent[index]),
+            actual_rent=float(self.actual_rent[index]),
+            loss_to_lease=float(self.loss_to_lease[index]),
+            sqft=None if np.isnan(sqft) else float(sqft),
+            lease_expiration=None if np.isnat(expiration) else str(expiration),
+        )
+
+    @property
+    def units(self) -> 'ColumnarRentRoll':
+        """Read-only RentRoll.units view: a sequence of RentRollUnit built on access"""
+        return self
+
+    def to_rent_roll(self) -> RentRoll:
+        return RentRoll(units=list(self))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, k).nbytes for k in (
+            'unit_id', 'unit_type_codes', 'status_codes', 'market_rent', 'actual_rent', 'loss_to_lease', 'sqft', 'lease_expiration'
+        ))
+
+    def occupied(self, occupied_statuses: Tuple[str, ...] = OCCUPIED_STATUSES) -> np.ndarray:
+        """Boolean mask of units whose status (case-insensitive) counts as occupied"""
+        occupied_codes = [i for i, s in enumerate(self.statuses) if s.lower() in occupied_statuses]
+        return np.isin(self.status_codes, occupied_codes)
+
+    def summary(self, by: Tuple[str, ...] = ('unit_type',), occupied_statuses: Tuple[str, ...] = OCCUPIED_STATUSES) -> Dict[str, list]:
+        """
+        Per-group unit count, occupancy, average market and actual rent, loss-to-lease and
+        rent per sqft, grouped by any of unit_type and status (by=() gives one total row).
+        Averages are over every unit in the group; per-sqft figures use units with a known sqft.
+        Returns one list per column, one entry per non-empty group.
+        """
+        for name in by:
+            if name not in GROUP_FIELDS:
+                raise ValueError(f"Cannot group a rent roll by {name}")
+        # Combine the categorical codes into one group index
+        group = np.zeros(len(self), dtype=np.int64)
+        sizes = []
+        for name in by:
+            labels = self.unit_types if name == 'unit_type' else self.statuses
+            codes = self.unit_type_codes if name == 'unit_type' else self.status_codes
+            group = group * len(labels) + codes
+            sizes.append(len(labels))
+        n_groups = int(np.prod(sizes, dtype=np.int64)) if by else 1
+
+        def total(weights=None):
+            return np.bincount(group, weights=weights, minlength=n_groups)
+
+        has_sqft = ~np.isnan(self.sqft)
+        unit_count = total()
+        occupied = total(self.occupied(occupied_statuses))
+        market = total(self.market_rent)
+        actual = total(self.actual_rent)
+        loss = total(self.loss_to_lease)
+        sqft = total(np.where(has_sqft, self.sqft, 0.0))
+        market_with_sqft = total(np.where(has_sqft, self.market_rent, 0.0))
+        actual_with_sqft = total(np.where(has_sqft, self.actual_rent, 0.0))
+
+        keep = unit_count > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns = {
+                'unit_count': unit_count.astype(np.int64),
+                'occupied_units': occupied.astype(np.int64),
+                'occupancy': occupied / unit_count,
+                'avg_market_rent': market / unit_count,
+                'avg_actual_rent': actual / unit_count,
+                'total_loss_to_lease': loss,
+                'loss_to_lease_rate': np.where(market != 0, loss / market, np.nan),
+                'total_sqft': sqft,
+                'market_rent_per_sqft': np.where(sqft > 0, market_with_sqft / sqft, np.nan),
+                'actual_rent_per_sqft': np.where(sqft > 0, actual_with_sqft / sqft, np.nan),
+            }
+        result = {}
+        # Unravel the combined group index back into one label column per grouping field
+        group_codes = np.unravel_index(np.flatnonzero(keep), sizes) if by else ()
+        for name, codes in zip(by, group_codes):
+            labels = self.unit_types if name == 'unit_type' else self.statuses
+            result[name] = [labels[c] for c in codes.tolist()]
+        for k, v in columns.items():
+            result[k] = [None if isinstance(x, float) and np.isnan(x) else x for x in v[keep].tolist()]
+        return result
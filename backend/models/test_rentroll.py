@@ -0,0 +1,46 @@
+import pytest
+from .rentroll import ColumnarRentRoll, RentRoll, RentRollUnit
+
+def make_rent_roll():
+    return RentRoll(units=[
+        RentRollUnit('101', '1BR', 'occupied', 1500.0, 1450.0, 50.0, 700.0),
+        RentRollUnit('102', '1BR', 'vacant', 1500.0, 0.0, 1500.0, 700.0),
+        RentRollUnit('201', '2BR', 'Occupied', 2000.0, 2000.0, 0.0, None),
+        RentRollUnit('202', '2BR', 'occupied', 2100.5, 2000.25, 100.25, 1000.0),
+    ])
+
+def test_columnar_round_trips_dataclass_view():
+    rent_roll = make_rent_roll()
+    columnar = ColumnarRentRoll.from_rent_roll(rent_roll)
+    assert len(columnar.units) == 4
+    assert columnar.to_rent_roll() == rent_roll
+    assert columnar[-1] == rent_roll.units[-1]
+    assert columnar.status_codes.itemsize == 1
+    merged = ColumnarRentRoll.concat([ColumnarRentRoll.from_units(rent_roll.units[:2]), ColumnarRentRoll.from_units(rent_roll.units[2:])])
+    assert list(merged) == rent_roll.units
+
+def test_summary_by_unit_type():
+    summary = ColumnarRentRoll.from_rent_roll(make_rent_roll()).summary()
+    assert summary['unit_type'] == ['1BR', '2BR']
+    assert summary['unit_count'] == [2, 2]
+    assert summary['occupancy'] == [0.5, 1.0]
+    assert summary['avg_actual_rent'][1] == pytest.approx(2000.125)
+    assert summary['total_loss_to_lease'][0] == pytest.approx(1550.0)
+    # Unit 201 has no sqft, so 2BR per-sqft figures come from unit 202 alone
+    assert summary['market_rent_per_sqft'][1] == pytest.approx(2.1005)
+
+def test_summary_by_type_and_status():
+    columnar = ColumnarRentRoll.from_rent_roll(make_rent_roll())
+    summary = columnar.summary(by=('unit_type', 'status'))
+    assert list(zip(summary['unit_type'], summary['status'])) == [
+        ('1BR', 'occupied'), ('1BR', 'vacant'), ('2BR', 'Occupied'), ('2BR', 'occupied')
+    ]
+    assert summary['market_rent_per_sqft'][2] is None
+    assert columnar.summary(by=())['unit_count'] == [4]
+    with pytest.raises(ValueError):
+        columnar.summary(by=('sqft',))
+
+def test_rents_round_trip_exactly():
+    columnar = ColumnarRentRoll(['101'], ['1BR'], ['occupied'], [1500.37], [1450.37], sqft=[712.3])
+    assert columnar[0] == RentRollUnit('101', '1BR', 'occupied', 1500.37, 1450.37, 50.0, 712.3)
+    assert columnar.summary(by=())['avg_market_rent'] == [1500.37]
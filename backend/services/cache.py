@@ -0,0 +1,138 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def canonical_hash(payload: Any) -> str:
+    """SHA-256 of the payload's canonical JSON (sorted keys, no whitespace)"""
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class DiskCache:
+    """SQLite-backed cache tier that survives restarts; values must be JSON-serializable"""
+    def __init__(self, path: str, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL, accessed REAL, value TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str, min_created: float) -> Optional[Any]:
+        row = self._conn.execute("SELECT created, value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[0] < min_created:
+            self.delete(key)
+            return None
+        self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[1])
+
+    def set(self, key: str, value: Any, created: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, created, accessed, value) VALUES (?, ?, ?, ?)",
+            (key, created, created, json.dumps(value))
+        )
+        # Evict least recently used rows beyond the size bound
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    def delete(self, key: str):
+        self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM results")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a TTL and hit/miss counters, keyed by content hash.
+    With disk_path set, misses fall through to a SQLite tier and entries are written through to it.
+    """
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, disk_path: Optional[str] = None, max_disk_entries: int = 10_000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = DiskCache(disk_path, max_disk_entries) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            if self._disk is not None:
+                value = self._disk.get(key, now - self.ttl_seconds)
+                if value is not None:
+                    self.disk_hits += 1
+                    self._store(key, value, now)
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._store(key, value, now)
+            if self._disk is not None:
+                self._disk.set(key, value, now)
+
+    def _store(self, key: str, value: Any, created: float):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'disk_entries': len(self._disk) if self._disk is not None else None,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else None,
+            }
@@ -0,0 +1,65 @@
+import json
+import math
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from .metrics import timed
+
+try:  # Optional: orjson encodes NumPy arrays and NaN (as null) natively in C
+    import orjson
+except ImportError:
+    orjson = None
+
+_SEPARATORS = (',', ':')
+
+
+def finite_list(values: np.ndarray) -> list:
+    """tolist() with nan/inf mapped to None, so results are JSON-safe without a recursive walk"""
+    if values.dtype.kind != 'f' or np.isfinite(values).all():
+        return values.tolist()
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def _default(obj: Any) -> Any:
+    """Encoder fallback for the types json can't encode itself"""
+    if isinstance(obj, np.ndarray):
+        return finite_list(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def sanitize_for_json(obj: Any) -> Any:
+    """Copy of obj with NaN/inf mapped to None and NumPy values converted to Python ones"""
+    if isinstance(obj, dict):
+        return {k: sanitize_for_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [sanitize_for_json(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return finite_list(obj)
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON with NaN/inf as null and NumPy scalars/arrays encoded directly"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        # C encoder in one pass; non-finite floats are rare, so only then walk the content
+        text = json.dumps(content, allow_nan=False, separators=_SEPARATORS, default=_default)
+    except ValueError:
+        text = json.dumps(sanitize_for_json(content), allow_nan=False, separators=_SEPARATORS, default=_default)
+    return text.encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by dumps, so handlers can return NumPy results without sanitizing them first"""
+    def render(self, content: Any) -> bytes:
+        with timed('encode'):
+            return dumps(content)
@@ -0,0 +1,94 @@
+"""
+Excel reports written with openpyxl's write-only mode. Each sheet's rows go to a temporary file
+as they are appended, and the finished workbook is streamed back from a temporary file in
+fixed-size chunks, so memory stays flat however many rows a report has.
+"""
+import math
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+XLSX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+STREAM_CHUNK_SIZE = 64 * 1024
+_INVALID_TITLE_CHARS = str.maketrans({c: '-' for c in '[]:*?/\\'})
+
+
+def _cell(value: Any) -> Any:
+    """A value openpyxl can write: NumPy scalars as Python ones, NaN/inf and containers as blanks or text"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (list, tuple, dict, np.ndarray)):
+        return str(value)
+    return value
+
+
+class XlsxReport:
+    """A write-only workbook built sheet by sheet, then streamed once with stream()"""
+    def __init__(self):
+        try:
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise ImportError("openpyxl is required to export .xlsx reports") from e
+        self.workbook = Workbook(write_only=True)
+        self._cell_type = WriteOnlyCell
+        self._bold = Font(bold=True)
+
+    def new_sheet(self, title: str, header: Optional[Sequence[Any]] = None):
+        """An empty sheet with a bold header row; fill it with append(), interleaved with other sheets if need be"""
+        sheet = self.workbook.create_sheet(title.translate(_INVALID_TITLE_CHARS)[:31])
+        if header:
+            cells = []
+            for value in header:
+                cell = self._cell_type(sheet, value=_cell(value))
+                cell.font = self._bold
+                cells.append(cell)
+            sheet.append(cells)
+        return sheet
+
+    @staticmethod
+    def append(sheet, row: Sequence[Any]):
+        sheet.append([_cell(v) for v in row])
+
+    def add_sheet(self, title: str, header: Optional[Sequence[Any]], rows: Iterable[Sequence[Any]]):
+        """A sheet of rows, which may be a generator; each is written out as it comes"""
+        sheet = self.new_sheet(title, header)
+        for row in rows:
+            self.append(sheet, row)
+
+    def add_key_values(self, title: str, sections: Dict[str, Dict[str, Any]]):
+        """Two-column sheet of label / value pairs, one block per section"""
+        def rows():
+            for section, values in sections.items():
+                yield (section, None)
+                for key, value in values.items():
+                    yield (key, value)
+                yield ()
+        self.add_sheet(title, ('Item', 'Value'), rows())
+
+    def add_columns(self, title: str, columns: Dict[str, Sequence[Any]]):
+        """One column per entry of an equal-length columns dict (e.g. a rent roll summary)"""
+        self.add_sheet(title, list(columns), zip(*columns.values()))
+
+    def add_periods(self, title: str, columns: Dict[str, Sequence[Any]], period_label: str = 'Year', first_period: int = 1):
+        """Fields as rows and periods as columns, the usual layout of a cash flow statement"""
+        n_periods = max((len(v) for v in columns.values()), default=0)
+        header = [''] + [f'{period_label} {i}' for i in range(first_period, first_period + n_periods)]
+        self.add_sheet(title, header, ([name, *values] for name, values in columns.items()))
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """The workbook's bytes in chunks, written to and read back from a temporary file"""
+        with tempfile.TemporaryFile() as f:
+            if not self.workbook.worksheets:
+                self.workbook.create_sheet('Empty')
+            self.workbook.save(f)
+            f.seek(0)
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
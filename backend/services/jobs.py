@@ -0,0 +1,278 @@
+import inspect
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; memory limits are then not enforced
+    resource = None
+
+POLL_INTERVAL = 0.05  # Seconds between deadline / cancellation checks while a job runs
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED, TIMED_OUT = 'queued', 'running', 'succeeded', 'failed', 'cancelled', 'timed_out'
+FINISHED = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+
+class InProcessQueue:
+    """
+    Bounded FIFO of job ids shared by the dispatcher threads. Anything with the same
+    put / get methods (e.g. a client for a local broker) can be passed to JobManager instead.
+    """
+    def __init__(self, max_size: int = 0):
+        self._queue = queue.Queue(maxsize=max_size)
+
+    def put(self, job_id: Optional[str]):
+        """Enqueue a job id, raising queue.Full when full; None stops one dispatcher and waits for room"""
+        self._queue.put(job_id, block=job_id is None)
+
+    def get(self) -> Optional[str]:
+        return self._queue.get()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Any
+    time_limit: float
+    status: str = QUEUED
+    progress: Optional[Dict[str, Any]] = None
+    result: Any = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    version: int = 0  # Bumped on every change, so watchers can wait for the next one
+    cancel_requested: bool = False
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        output = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+        }
+        if include_result:
+            output['result'] = self.result
+        return output
+
+
+def _address_space() -> Optional[int]:
+    """Current virtual memory size of this process in bytes (Linux), or None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def _run_job(fn: Callable, payload: Any, conn, memory_limit: Optional[int]):
+    """
+    Worker process body: fn(payload) either returns the result or is a generator yielding
+    progress dicts and returning the result. Messages go back to the dispatcher over conn.
+    """
+    baseline = _address_space()
+    if memory_limit and resource is not None and baseline is not None:
+        # Allocations beyond the forked baseline fail with MemoryError
+        resource.setrlimit(resource.RLIMIT_AS, (baseline + memory_limit, baseline + memory_limit))
+    try:
+        output = fn(payload)
+        if inspect.isgenerator(output):
+            while True:
+                try:
+                    conn.send(('progress', next(output)))
+                except StopIteration as stop:
+                    output = stop.value
+                    break
+        conn.send((SUCCEEDED, output))
+    except MemoryError:
+        conn.send((FAILED, 'Exceeded the memory limit'))
+    except Exception as e:
+        conn.send((FAILED, f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+class JobManager:
+    """
+    Runs submitted jobs in worker processes, at most max_workers at a time, each with a time
+    limit and a memory limit. Every job gets its own process so a timeout or cancellation can
+    stop it mid-computation. runners maps a job kind to a module-level function of its payload.
+    Finished jobs are kept (results included) for result_ttl seconds, or until max_jobs newer
+    ones push them out.
+    """
+    def __init__(self, runners: Dict[str, Callable], max_workers: int = 2, time_limit: float = 300.0,
+                 memory_limit: Optional[int] = None, job_queue=None, max_jobs: int = 100, result_ttl: float = 3600.0):
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.runners = runners
+        self.max_workers = max_workers
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.max_jobs = max_jobs
+        self.result_ttl = result_ttl
+        self._queue = job_queue if job_queue is not None else InProcessQueue()
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._changed = threading.Condition()
+        self._dispatchers = []
+
+    def _start(self):
+        # Dispatcher threads start with the first job, so importing the app spawns nothing
+        if not self._dispatchers:
+            for _ in range(self.max_workers):
+                thread = threading.Thread(target=self._dispatch, daemon=True)
+                thread.start()
+                self._dispatchers.append(thread)
+
+    def _update(self, job: Job, **changes):
+        with self._changed:
+            for k, v in changes.items():
+                setattr(job, k, v)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _expire(self):
+        """Forget finished jobs older than result_ttl and the oldest beyond max_jobs; call holding _changed"""
+        finished = [j for j in self._jobs.values() if j.status in FINISHED]
+        cutoff = time.time() - self.result_ttl
+        excess = len(self._jobs) - self.max_jobs
+        for i, job in enumerate(finished):
+            if i < excess or (job.finished or job.submitted) < cutoff:
+                del self._jobs[job.id]
+
+    def submit(self, kind: str, payload: Any, time_limit: Optional[float] = None) -> Job:
+        """Queue a job; raises KeyError for an unknown kind and queue.Full when the queue is full"""
+        if kind not in self.runners:
+            raise KeyError(kind)
+        job = Job(uuid.uuid4().hex, kind, payload, min(time_limit or self.time_limit, self.time_limit))
+        with self._changed:
+            self._jobs[job.id] = job
+            self._expire()
+        self._start()
+        try:
+            self._queue.put(job.id)
+        except queue.Full:
+            with self._changed:
+                del self._jobs[job.id]
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._changed:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            if job.status == QUEUED:
+                job.status, job.finished = CANCELLED, time.time()
+            else:
+                job.cancel_requested = True
+            job.version += 1
+            self._changed.notify_all()
+        return job
+
+    def wait(self, job_id: str, after_version: int = -1, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until the job changes past after_version (or finishes, or timeout passes)"""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: job_id not in self._jobs or self._jobs[job_id].version > after_version or self._jobs[job_id].status in FINISHED,
+                timeout
+            )
+            return self._jobs.get(job_id)
+
+    def watch(self, job_id: str, heartbeat: float = 15.0) -> Iterator[Job]:
+        """Yield the job on every change (or every heartbeat seconds) until it finishes"""
+        version = -1
+        while True:
+            job = self.wait(job_id, version, heartbeat)
+            if job is None:
+                return
+            version = job.version
+            yield job
+            if job.status in FINISHED:
+                return
+
+    def stats(self) -> Dict[str, int]:
+        counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED}
+        with self._changed:
+            self._expire()
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            counts[job.status] += 1
+        return {**counts, 'max_workers': self.max_workers}
+
+    def _dispatch(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self._jobs.get(job_id)
+            with self._changed:
+                if job is None or job.status != QUEUED:
+                    continue  # Cancelled while queued
+                job.status, job.started = RUNNING, time.time()
+                job.version += 1
+                self._changed.notify_all()
+            status, value = self._execute(job)
+            self._update(
+                job, status=status, finished=time.time(),
+                result=value if status == SUCCEEDED else None,
+                error=None if status == SUCCEEDED else value,
+            )
+
+    def _execute(self, job: Job):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_job, args=(self.runners[job.kind], job.payload, sender, self.memory_limit), daemon=True
+        )
+        process.start()
+        sender.close()
+        deadline = time.monotonic() + job.time_limit
+        try:
+            while True:
+                if job.cancel_requested:
+                    return CANCELLED, 'Cancelled'
+                if time.monotonic() > deadline:
+                    return TIMED_OUT, f'Exceeded the {job.time_limit:g}s time limit'
+                if not receiver.poll(POLL_INTERVAL):
+                    continue
+                try:
+                    kind, value = receiver.recv()
+                except EOFError:
+                    process.join()
+                    return FAILED, f'Worker exited with code {process.exitcode}'
+                if kind == 'progress':
+                    self._update(job, progress=value)
+                else:
+                    return kind, value
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
+
+    def shutdown(self):
+        """Stop the dispatchers once the jobs already queued have run"""
+        for _ in self._dispatchers:
+            self._queue.put(None)
+        for thread in self._dispatchers:
+            thread.join()
+        self._dispatchers = []
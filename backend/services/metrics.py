@@ -0,0 +1,216 @@
+"""
+Hot-path timing for requests and calculator stages: Server-Timing headers per request, and
+latency histograms / counters exposed in the Prometheus text format.
+"""
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; calculator stages take microseconds to milliseconds, requests up to seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (stage, seconds) timings of the request being handled, shared with threadpool handlers
+_request_timings: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar('request_timings', default=None)
+_request_mark: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar('request_mark', default=None)
+# Time spent in the children of each open stage, innermost last; stages record their own time only
+_open_stages: contextvars.ContextVar[Tuple[List[float], ...]] = contextvars.ContextVar('open_stages', default=())
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {value:g}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is a bisect and three additions under a lock"""
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]:.9g}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Registry:
+    """Metrics rendered by /metrics; collectors add gauges computed at scrape time"""
+    def __init__(self):
+        self.metrics = []
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+REQUEST_SECONDS = REGISTRY.register(Histogram('http_request_duration_seconds', 'Request latency until the response body is sent', ('method', 'route', 'status')))
+REQUESTS = REGISTRY.register(Counter('http_requests_total', 'Requests handled', ('method', 'route', 'status')))
+STAGE_SECONDS = REGISTRY.register(Histogram('analysis_stage_seconds', 'Time spent in each request / calculator stage', ('stage',)))
+
+
+def sample_lines(name: str, help: str, kind: str, values: Dict[str, float], label: str = '') -> List[str]:
+    """Prometheus lines for a gauge or counter read at scrape time, one series per values key labelled by label"""
+    lines = [f'# HELP {name} {help}', f'# TYPE {name} {kind}']
+    for key, value in values.items():
+        if value is not None:
+            lines.append(f'{name}{_format_labels((label,), (key,)) if label else ""} {value:g}')
+    return lines
+
+
+def record(stage: str, seconds: float):
+    """Add a stage timing to the histogram and, inside a request, to its Server-Timing header"""
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the time spent in the block as stage, excluding stages timed inside it"""
+    children = [0.0]
+    token = _open_stages.set(_open_stages.get() + (children,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _open_stages.reset(token)
+        parents = _open_stages.get()
+        if parents:
+            parents[-1][0] += elapsed
+        record(stage, elapsed - children[0])
+
+
+def timed_stage(stage: str):
+    """Decorator form of timed()"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def mark(stage: str):
+    """Record the time since the request started (or since the previous mark) as stage"""
+    last = _request_mark.get()
+    if last is not None:
+        now = time.perf_counter()
+        record(stage, now - last[0])
+        last[0] = now
+
+
+def server_timing(timings: List[Tuple[str, float]], total: float) -> str:
+    # Repeated stages (e.g. several calculators in one request) are summed
+    totals: Dict[str, float] = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    totals['total'] = total
+    return ', '.join(f'{stage};dur={seconds * 1e3:.3f}' for stage, seconds in totals.items())
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware: collects stage timings of each HTTP request into a Server-Timing header
+    and records its latency by method, route template and status. Responses that stream
+    report the stages finished before their first byte. An optional profiler (see
+    services.profiling) can wrap individual requests.
+    """
+    def __init__(self, app, profiler=None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        timings: List[Tuple[str, float]] = []
+        timings_token = _request_timings.set(timings)
+        mark_token = _request_mark.set([start])
+        session = self.profiler.begin(scope) if self.profiler is not None else None
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', server_timing(timings, time.perf_counter() - start).encode()))
+                if session is not None:
+                    headers.append((b'x-profile-id', session.profile.id.encode()))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_timings.reset(timings_token)
+            _request_mark.reset(mark_token)
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            REQUEST_SECONDS.observe(elapsed, scope['method'], route, str(status))
+            REQUESTS.inc(scope['method'], route, str(status))
+            if session is not None:
+                self.profiler.end(session, route, elapsed)
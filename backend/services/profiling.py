@@ -0,0 +1,133 @@
+"""
+Opt-in sampling profiler for individual requests. While a profiled request runs, a background
+thread samples the Python stacks of the threads executing application code every few
+milliseconds; the samples are kept as collapsed stacks ("a;b;c count" lines), which
+flamegraph.pl and speedscope read directly.
+"""
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+PROFILE_HEADER = b'x-profile'
+
+
+def _collapse(frame, own_file: str) -> Optional[str]:
+    """Root-first 'function (file:line)' stack, or None unless it runs application code"""
+    names = []
+    in_app = False
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename == own_file:
+            return None
+        in_app = in_app or (filename.startswith(APP_DIR) and '/site-packages/' not in filename)
+        names.append(f'{frame.f_code.co_name} ({Path(filename).name}:{frame.f_code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names)) if in_app else None
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval from a daemon thread between start() and stop()"""
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = _collapse(frame, __file__)
+                if stack is not None:
+                    self.samples[stack] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    duration: Optional[float] = None
+    created: float = field(default_factory=time.time)
+    samples: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+    def summary(self) -> Dict:
+        return {
+            'profile_id': self.id, 'method': self.method, 'path': self.path, 'route': self.route,
+            'duration': self.duration, 'created': self.created, 'samples': sum(self.samples.values()),
+        }
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and keeps the most recent profiles.
+    A request is profiled when it sends an X-Profile header and allow_header is set, or at
+    random with probability sample_rate. Randomly sampled profiles are only kept when the
+    request took at least slow_seconds. on_profile, if given, is called with every kept profile
+    (e.g. to ship it to external storage).
+    """
+    def __init__(self, allow_header: bool = False, sample_rate: float = 0.0, slow_seconds: float = 0.0,
+                 interval: float = 0.005, max_profiles: int = 50, on_profile: Callable[[Profile], None] = None):
+        self.allow_header = allow_header
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.interval = interval
+        self.on_profile = on_profile
+        self.profiles: 'deque[Profile]' = deque(maxlen=max_profiles)
+
+    @property
+    def enabled(self) -> bool:
+        return self.allow_header or self.sample_rate > 0
+
+    def begin(self, scope) -> Optional['_Session']:
+        requested = self.allow_header and any(k == PROFILE_HEADER for k, _ in scope.get('headers', ()))
+        if not requested and not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            return None
+        sampler = SamplingProfiler(self.interval)
+        sampler.start()
+        profile_id = uuid.uuid4().hex
+        return _Session(Profile(profile_id, scope['method'], scope['path']), sampler, requested)
+
+    def end(self, session: '_Session', route: str, duration: float):
+        profile = session.profile
+        profile.samples = session.sampler.stop()
+        profile.route, profile.duration = route, duration
+        if session.requested or duration >= self.slow_seconds:
+            self.profiles.append(profile)
+            if self.on_profile is not None:
+                self.on_profile(profile)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return next((p for p in self.profiles if p.id == profile_id), None)
+
+    def list(self) -> List[Dict]:
+        return [p.summary() for p in reversed(self.profiles)]
+
+
+@dataclass
+class _Session:
+    profile: Profile
+    sampler: SamplingProfiler
+    requested: bool
@@ -0,0 +1,218 @@
+"""
+Embedded SQLite store of saved scenarios: every save is a new version holding the inputs, their
+canonical hash, summary metrics in indexed columns and the annual series packed as compressed
+float64 columns. Metric queries ("top 20 by leveraged IRR across the book") read only the
+indexed columns of each scenario's current version.
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .cache import canonical_hash
+from .encoding import dumps
+
+# Indexed summary metrics, all real-valued; NaN (e.g. an IRR that did not converge) is stored as NULL
+METRICS = (
+    'leveraged_irr', 'unleveraged_irr', 'leveraged_equity_multiple', 'unleveraged_equity_multiple',
+    'min_dscr', 'equity_required',
+)
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    created REAL NOT NULL,
+    current_version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    created REAL NOT NULL,
+    is_current INTEGER NOT NULL,
+    input_hash TEXT NOT NULL,
+    property_name TEXT,
+    purchase_price REAL,
+    hold_period INTEGER,
+    {', '.join(f'{m} REAL' for m in METRICS)},
+    inputs BLOB NOT NULL,
+    summary BLOB NOT NULL,
+    series BLOB NOT NULL,
+    PRIMARY KEY (scenario_id, version)
+);
+CREATE INDEX IF NOT EXISTS versions_input_hash ON versions (input_hash);
+CREATE INDEX IF NOT EXISTS versions_property ON versions (property_name) WHERE is_current = 1;
+{''.join(f'CREATE INDEX IF NOT EXISTS versions_{m} ON versions ({m}) WHERE is_current = 1;' for m in METRICS)}
+"""
+_LISTED = ('scenario_id', 'name', 'version', 'created', 'input_hash', 'property_name', 'purchase_price', 'hold_period') + METRICS
+
+
+def _pack_json(value: Any) -> bytes:
+    return zlib.compress(dumps(value))
+
+
+def _unpack_json(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def pack_series(columns: Dict[str, Any]) -> bytes:
+    """Equal-length numeric columns as a JSON header line of names, then one compressed float64 block"""
+    names = list(columns)
+    values = np.array([np.asarray(columns[n], dtype=float) for n in names]).reshape(len(names), -1)
+    header = json.dumps({'fields': names, 'length': values.shape[1]}).encode()
+    return header + b'\n' + zlib.compress(values.astype('<f8').tobytes())
+
+
+def unpack_series(blob: bytes) -> Dict[str, np.ndarray]:
+    header, body = blob.split(b'\n', 1)
+    meta = json.loads(header)
+    values = np.frombuffer(zlib.decompress(body), dtype='<f8').reshape(len(meta['fields']), meta['length'])
+    return dict(zip(meta['fields'], values))
+
+
+def _metric(value) -> Optional[float]:
+    value = None if value is None else float(value)
+    return value if value is not None and np.isfinite(value) else None
+
+
+def analysis_record(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Metrics, summary and series to save from a columnar /analyze response"""
+    irr_results = result['irr_results']
+    columns = result['annual_cash_flows']
+    noi = np.asarray(columns['noi'], dtype=float)
+    debt_service = np.asarray(columns['debt_service'], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr = np.where(debt_service > 0, noi / debt_service, np.inf)
+    metrics = {k: _metric(irr_results[k]) for k in METRICS[:4]}
+    metrics['min_dscr'] = _metric(dscr.min(initial=np.inf))
+    metrics['equity_required'] = _metric(result['equity_required'])
+    summary = {
+        'irr_results': irr_results,  # Includes the hold-period-plus-one flows, which don't fit the series
+        'exit_analysis': result['exit_analysis'],
+        'assumed_fields': result.get('assumed_fields', []),
+    }
+    return {'metrics': metrics, 'summary': summary, 'series': columns}
+
+
+class ScenarioStore:
+    """Saved scenarios with version history; thread-safe, one connection guarded by a lock"""
+    def __init__(self, path: str = ':memory:'):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def save(self, inputs: Dict[str, Any], record: Dict[str, Any], name: Optional[str] = None,
+             scenario_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Save inputs and their analysis_record as a new scenario, or as the next version of
+        scenario_id. Saving inputs identical to the current version adds no version.
+        """
+        input_hash = canonical_hash(inputs)
+        now = time.time()
+        prop = inputs.get('property') or {}
+        metrics = record['metrics']
+        with self._lock, self._conn:
+            if scenario_id is None:
+                scenario_id = self._conn.execute(
+                    "INSERT INTO scenarios (name, created, current_version) VALUES (?, ?, 0)", (name, now)
+                ).lastrowid
+                version = 1
+            else:
+                row = self._conn.execute(
+                    "SELECT s.current_version, v.input_hash FROM scenarios s JOIN versions v"
+                    " ON v.scenario_id = s.id AND v.version = s.current_version WHERE s.id = ?", (scenario_id,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(scenario_id)
+                if name is not None:
+                    self._conn.execute("UPDATE scenarios SET name = ? WHERE id = ?", (name, scenario_id))
+                if row['input_hash'] == input_hash:
+                    return {'scenario_id': scenario_id, 'version': row['current_version'], 'input_hash': input_hash, 'created': False}
+                version = row['current_version'] + 1
+                self._conn.execute("UPDATE versions SET is_current = 0 WHERE scenario_id = ? AND is_current = 1", (scenario_id,))
+            self._conn.execute(
+                f"INSERT INTO versions (scenario_id, version, created, is_current, input_hash, property_name, purchase_price,"
+                f" hold_period, {', '.join(METRICS)}, inputs, summary, series) VALUES ({', '.join(['?'] * (11 + len(METRICS)))})",
+                (scenario_id, version, now, 1, input_hash, prop.get('property_name'), prop.get('purchase_price'),
+                 prop.get('hold_period'), *(metrics.get(m) for m in METRICS),
+                 _pack_json(inputs), _pack_json(record['summary']), pack_series(record['series']))
+            )
+            self._conn.execute("UPDATE scenarios SET current_version = ? WHERE id = ?", (version, scenario_id))
+        return {'scenario_id': scenario_id, 'version': version, 'input_hash': input_hash, 'created': True}
+
+    def _listing(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {k: row[k] for k in _LISTED}
+
+    def get(self, scenario_id: int, version: Optional[int] = None, include_series: bool = True) -> Optional[Dict[str, Any]]:
+        """One version (the current one by default) with its inputs, summary and, optionally, series"""
+        condition = "v.version = ?" if version is not None else "v.is_current = 1"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT v.*, s.name FROM versions v JOIN scenarios s ON s.id = v.scenario_id"
+                f" WHERE v.scenario_id = ? AND {condition}",
+                (scenario_id, version) if version is not None else (scenario_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        result = {
+            **self._listing(row),
+            'current': bool(row['is_current']),
+            'inputs': _unpack_json(row['inputs']),
+            'summary': _unpack_json(row['summary']),
+        }
+        if include_series:
+            result['series'] = unpack_series(row['series'])
+        return result
+
+    def find(self, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Most recent saved version with exactly these inputs, to reuse instead of recomputing"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scenario_id, version FROM versions WHERE input_hash = ? ORDER BY created DESC LIMIT 1",
+                (canonical_hash(inputs),)
+            ).fetchone()
+        return None if row is None else self.get(row['scenario_id'], row['version'])
+
+    def history(self, scenario_id: int) -> List[Dict[str, Any]]:
+        """Every version of a scenario, newest first, without inputs or series"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT v.*, s.name FROM versions v JOIN scenarios s ON s.id = v.scenario_id"
+                " WHERE v.scenario_id = ? ORDER BY v.version DESC", (scenario_id,)
+            ).fetchall()
+        return [{**self._listing(row), 'current': bool(row['is_current'])} for row in rows]
+
+    def top(self, metric: str = 'leveraged_irr', limit: int = 20, property_name: Optional[str] = None,
+            ascending: bool = False) -> List[Dict[str, Any]]:
+        """Current versions ranked by an indexed metric, optionally for one property"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        where = f"v.is_current = 1 AND v.{metric} IS NOT NULL"
+        params: List[Any] = []
+        if property_name is not None:
+            where += " AND v.property_name = ?"
+            params.append(property_name)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT v.scenario_id, s.name, v.version, v.created, v.input_hash, v.property_name, v.purchase_price,"
+                f" v.hold_period, {', '.join('v.' + m for m in METRICS)} FROM versions v JOIN scenarios s ON s.id = v.scenario_id"
+                f" WHERE {where} ORDER BY v.{metric} {'ASC' if ascending else 'DESC'} LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [self._listing(row) for row in rows]
+
+    def delete(self, scenario_id: int) -> bool:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,)).rowcount > 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            scenarios, versions = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM scenarios), (SELECT COUNT(*) FROM versions)"
+            ).fetchone()
+        return {'scenarios': scenarios, 'versions': versions}
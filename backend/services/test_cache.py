@@ -0,0 +1,40 @@
+from .cache import ResultCache, canonical_hash
+
+def test_canonical_hash_ignores_key_order():
+    assert canonical_hash({'a': 1, 'b': [1.5, 2]}) == canonical_hash({'b': [1.5, 2], 'a': 1})
+    assert canonical_hash({'a': 1}) != canonical_hash({'a': 2})
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 1, 1, 2)
+
+def test_ttl_expiry():
+    cache = ResultCache(ttl_seconds=0)
+    cache.set('a', 1)
+    cache.ttl_seconds = -1
+    assert cache.get('a') is None
+
+def test_get_or_compute_calls_once():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or {'value': 1}
+    assert cache.get_or_compute('k', compute) == {'value': 1}
+    assert cache.get_or_compute('k', compute) == {'value': 1}
+    assert len(calls) == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    ResultCache(disk_path=path).set('k', {'irr': 0.1})
+    restarted = ResultCache(disk_path=path)
+    assert restarted.get('k') == {'irr': 0.1}
+    assert restarted.stats()['disk_hits'] == 1
+    # Promoted into memory on the first hit
+    assert restarted.get('k') == {'irr': 0.1}
+    assert restarted.stats()['hits'] == 1
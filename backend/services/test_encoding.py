@@ -0,0 +1,14 @@
+import json
+import numpy as np
+from .encoding import dumps, sanitize_for_json
+
+def test_dumps_maps_non_finite_to_null():
+    content = {'irr': float('nan'), 'flows': [1.0, float('inf')], 'nested': {'x': -float('inf')}}
+    assert json.loads(dumps(content)) == {'irr': None, 'flows': [1.0, None], 'nested': {'x': None}}
+
+def test_dumps_numpy_values():
+    content = {'a': np.array([1.5, np.nan]), 'b': np.float32(2.5), 'c': np.int64(3), 'd': np.array([[1, 2]]), 'e': np.bool_(True)}
+    assert json.loads(dumps(content)) == {'a': [1.5, None], 'b': 2.5, 'c': 3, 'd': [[1, 2]], 'e': True}
+
+def test_sanitize_for_json():
+    assert sanitize_for_json({'a': (np.float64('nan'), 1)}) == {'a': [None, 1]}
@@ -0,0 +1,37 @@
+import io
+import numpy as np
+from openpyxl import load_workbook
+from .export import XlsxReport
+
+def reload(report, chunk_size=1024):
+    chunks = list(report.stream(chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks) and len(chunks) > 1
+    return load_workbook(io.BytesIO(b''.join(chunks)))
+
+def values(sheet):
+    return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+def test_report_sheets():
+    report = XlsxReport()
+    report.add_key_values('Summary', {'Returns': {'irr': np.float64(0.12), 'converged': np.bool_(True)}})
+    report.add_periods('Flows', {'noi': np.array([1.0, 2.0]), 'dscr': [1.5, np.inf]})
+    report.add_columns('Units: mix/type', {'unit_type': ['1BR', '2BR'], 'count': [np.int64(10), 5]})
+    workbook = reload(report)
+    assert workbook.sheetnames == ['Summary', 'Flows', 'Units- mix-type']
+    assert values(workbook['Summary']) == [['Item', 'Value'], ['Returns', None], ['irr', 0.12], ['converged', True]]
+    assert values(workbook['Flows']) == [[None, 'Year 1', 'Year 2'], ['noi', 1, 2], ['dscr', 1.5, None]]
+    assert values(workbook['Units- mix-type']) == [['unit_type', 'count'], ['1BR', 10], ['2BR', 5]]
+    assert workbook['Flows']['B1'].font.bold
+
+def test_interleaved_sheets():
+    report = XlsxReport()
+    summary = report.new_sheet('Scenarios', ('scenario', 'irr'))
+    annual = report.new_sheet('Annual', ('scenario', 'year', 'noi'))
+    for scenario in range(1, 4):
+        report.append(summary, (scenario, np.nan))
+        for year in range(1, 3):
+            report.append(annual, (scenario, year, [scenario, year]))
+    workbook = reload(report)
+    assert values(workbook['Scenarios'])[1:] == [[1, None], [2, None], [3, None]]
+    assert len(values(workbook['Annual'])) == 7
+    assert values(workbook['Annual'])[-1] == [3, 2, '[3, 2]']
@@ -0,0 +1,81 @@
+import time
+import queue
+import pytest
+from .jobs import CANCELLED, FAILED, SUCCEEDED, TIMED_OUT, InProcessQueue, JobManager
+
+def counting_job(n):
+    for i in range(n):
+        yield {'done': i + 1}
+    return {'total': n}
+
+def sleeping_job(seconds):
+    time.sleep(seconds)
+    return 'woke'
+
+def failing_job(_):
+    raise ValueError('bad input')
+
+def allocating_job(n_bytes):
+    return len(bytearray(n_bytes))
+
+RUNNERS = {'count': counting_job, 'sleep': sleeping_job, 'fail': failing_job, 'allocate': allocating_job}
+
+@pytest.fixture
+def manager():
+    manager = JobManager(RUNNERS, max_workers=2, time_limit=5, memory_limit=64 * 2 ** 20)
+    yield manager
+    manager.shutdown()
+
+def finish(manager, job):
+    return list(manager.watch(job.id))[-1]
+
+def test_result_and_progress(manager):
+    job = manager.submit('count', 3)
+    updates = list(manager.watch(job.id))
+    assert updates[-1].status == SUCCEEDED and updates[-1].result == {'total': 3}
+    assert updates[-1].progress == {'done': 3}
+    assert finish(manager, manager.submit('fail', None)).error == 'ValueError: bad input'
+    with pytest.raises(KeyError):
+        manager.submit('unknown', None)
+
+def test_time_limit_and_cancellation(manager):
+    job = manager.submit('sleep', 30, time_limit=0.2)
+    assert finish(manager, job).status == TIMED_OUT
+    running = manager.submit('sleep', 30)
+    queued = [manager.submit('sleep', 30) for _ in range(2)]
+    manager.cancel(queued[-1].id)
+    assert manager.get(queued[-1].id).status == CANCELLED
+    while manager.get(running.id).started is None:
+        time.sleep(0.01)
+    started = time.monotonic()
+    for job in [running, queued[0]]:
+        manager.cancel(job.id)
+        assert finish(manager, job).status == CANCELLED
+    assert time.monotonic() - started < 5
+
+def test_memory_limit(manager):
+    assert finish(manager, manager.submit('allocate', 2 ** 20)).result == 2 ** 20
+    job = finish(manager, manager.submit('allocate', 512 * 2 ** 20))
+    assert job.status == FAILED and 'memory' in job.error
+
+def test_bounded_queue():
+    manager = JobManager(RUNNERS, max_workers=1, job_queue=InProcessQueue(max_size=1))
+    running = manager.submit('sleep', 0.5)
+    while manager.get(running.id).started is None:
+        time.sleep(0.01)
+    manager.submit('sleep', 0)
+    with pytest.raises(queue.Full):
+        manager.submit('sleep', 0)
+    assert manager.stats()['queued'] == 1
+    manager.shutdown()
+
+def test_finished_jobs_expire():
+    manager = JobManager(RUNNERS, max_workers=1, time_limit=5, result_ttl=60)
+    try:
+        job = finish(manager, manager.submit('count', 1))
+        assert manager.get(job.id).result == {'total': 1}
+        manager.result_ttl = 0
+        assert manager.get(job.id) is None
+        assert manager.stats()['succeeded'] == 0
+    finally:
+        manager.shutdown()
@@ -0,0 +1,56 @@
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from . import metrics
+from .metrics import Histogram, TimingMiddleware, mark, server_timing, timed, timed_stage
+from .profiling import RequestProfiler
+
+def test_histogram_render():
+    histogram = Histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        histogram.observe(seconds, '/a')
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+def test_server_timing_sums_repeated_stages():
+    assert server_timing([('irr', 0.001), ('irr', 0.002)], 0.01) == 'irr;dur=3.000, total;dur=10.000'
+
+def test_nested_stages_record_exclusive_time(monkeypatch):
+    timings = []
+    monkeypatch.setattr(metrics, 'record', lambda stage, seconds: timings.append((stage, seconds)))
+    with timed('outer'):
+        time.sleep(0.02)
+        with timed('inner'):
+            time.sleep(0.02)
+    assert [stage for stage, _ in timings] == ['inner', 'outer']
+    assert 0.02 <= timings[0][1] and 0.02 <= timings[1][1] < 0.04
+
+@timed_stage('slow_stage')
+def slow_stage():
+    time.sleep(0.02)
+
+def test_middleware_server_timing_and_profile():
+    app = FastAPI()
+    profiler = RequestProfiler(allow_header=True, interval=0.001)
+    app.add_middleware(TimingMiddleware, profiler=profiler)
+
+    @app.get('/work/{n}')
+    def work(n: int):
+        mark('validate')
+        slow_stage()
+        with timed('encode'):
+            pass
+        return {'n': n}
+
+    client = TestClient(app)
+    response = client.get('/work/1')
+    stages = [part.split(';')[0] for part in response.headers['server-timing'].split(', ')]
+    assert stages == ['validate', 'slow_stage', 'encode', 'total']
+    assert 'x-profile-id' not in response.headers
+
+    response = client.get('/work/2', headers={'X-Profile': '1'})
+    profile = profiler.get(response.headers['x-profile-id'])
+    assert profile.route == '/work/{n}'
+    assert 'slow_stage' in profile.collapsed()
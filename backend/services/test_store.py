@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from .store import ScenarioStore, analysis_record, pack_series, unpack_series
+
+def make_inputs(name='Tower', price=10000000, rate=0.05):
+    return {'property': {'property_name': name, 'purchase_price': price, 'hold_period': 3}, 'financing': {'interest_rate': rate}}
+
+def make_record(irr, dscr=1.5):
+    result = {
+        'irr_results': {'leveraged_irr': irr, 'unleveraged_irr': irr / 2, 'leveraged_equity_multiple': 1 + irr,
+                        'unleveraged_equity_multiple': 1 + irr / 2, 'leveraged_flows': [-1.0, 0.1, 0.1, 1.2]},
+        'annual_cash_flows': {'noi': [150.0, 160.0, 170.0], 'debt_service': [100.0 / dscr * 1.5, 100.0, 100.0]},
+        'exit_analysis': {'net_proceeds': 1.0},
+        'equity_required': 4000000.0,
+    }
+    return analysis_record(result)
+
+def test_series_round_trip():
+    columns = {'noi': [1.5, 2.5, np.nan], 'capex': np.array([1.0, 2.0, 3.0])}
+    restored = unpack_series(pack_series(columns))
+    assert list(restored) == ['noi', 'capex']
+    assert np.array_equal(restored['noi'], [1.5, 2.5, np.nan], equal_nan=True)
+
+def test_versions_and_history():
+    store = ScenarioStore()
+    saved = store.save(make_inputs(), make_record(0.12), name='Base')
+    assert (saved['version'], saved['created']) == (1, True)
+    assert store.save(make_inputs(), make_record(0.12), scenario_id=saved['scenario_id'])['created'] is False
+    second = store.save(make_inputs(rate=0.06), make_record(0.10), scenario_id=saved['scenario_id'])
+    assert second['version'] == 2
+    assert [(v['version'], v['current']) for v in store.history(saved['scenario_id'])] == [(2, True), (1, False)]
+    assert store.get(saved['scenario_id'])['leveraged_irr'] == pytest.approx(0.10)
+    first = store.get(saved['scenario_id'], version=1)
+    assert first['inputs'] == make_inputs() and first['name'] == 'Base'
+    assert np.allclose(first['series']['noi'], [150, 160, 170])
+    assert first['summary']['irr_results']['leveraged_flows'] == [-1.0, 0.1, 0.1, 1.2]
+    assert store.find(make_inputs())['version'] == 1
+    with pytest.raises(KeyError):
+        store.save(make_inputs(), make_record(0.1), scenario_id=99)
+
+def test_top_ranks_current_versions_by_indexed_metric():
+    store = ScenarioStore()
+    for i, irr in enumerate([0.05, 0.20, 0.11, float('nan')]):
+        store.save(make_inputs(name='Tower' if i % 2 else 'Plaza', price=1e7 + i), make_record(irr, dscr=1 + irr))
+    # Superseded versions drop out of the ranking
+    store.save(make_inputs(price=5), make_record(0.01), scenario_id=2)
+    assert [s['scenario_id'] for s in store.top(limit=2)] == [3, 1]
+    assert [s['scenario_id'] for s in store.top('leveraged_irr', ascending=True)] == [2, 1, 3]
+    assert [s['scenario_id'] for s in store.top(property_name='Plaza')] == [3, 1]
+    assert store.top('min_dscr', limit=1, ascending=True)[0]['scenario_id'] == 1
+    plan = ' '.join(r[3] for r in store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT scenario_id FROM versions v WHERE v.is_current = 1 AND v.leveraged_irr IS NOT NULL"
+        " ORDER BY v.leveraged_irr DESC LIMIT 20"))
+    assert 'versions_leveraged_irr' in plan
+    assert store.delete(1) and store.get(1) is None and store.stats() == {'scenarios': 3, 'versions': 4}
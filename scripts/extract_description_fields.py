@@ -1,7 +1,8 @@
-import pandas as pd
 import json
+import pandas as pd
 import sys
 from pathlib import Path
+from workbook_cache import load_sheet
 
 # Default path and sheet name
 EXCEL_PATH = Path(__file__).parent.parent.parent / 'docs' / 'Building_I_Want v5.xlsx'
@@ -9,15 +10,19 @@ SHEET_NAME = 'Description'
 
 
 def extract_description_fields(excel_path=EXCEL_PATH, sheet_name=SHEET_NAME):
-    # Read the sheet into a DataFrame
-    df = pd.read_excel(excel_path, sheet_name=sheet_name)
+    # Raw cells from the parsed-workbook cache; the first row holds the field names
+    df = load_sheet(excel_path, sheet_name)
+    if df.empty:
+        return []
+    header = df.iloc[0]
+    body = df.iloc[1:]
     # Prepare output: list of fields with sample values
     fields = []
-    for col in df.columns:
-        sample_value = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
+    for i, col in enumerate(df.columns):
+        values = body[col].dropna()
         fields.append({
-            'field_name': col,
-            'sample_value': sample_value
+            'field_name': header[col] if not pd.isna(header[col]) else f'Unnamed: {i}',
+            'sample_value': values.iloc[0] if not values.empty else None
         })
     return fields
 
@@ -1,12 +1,12 @@
-import pandas as pd
 import numpy as np
+from workbook_cache import load_sheets
 
 EXCEL_PATH = '../../docs/Building_I_Want v5.xlsx'
 
-# Load the Excel file
-xls = pd.ExcelFile(EXCEL_PATH)
+# Load every sheet once (from the parsed-workbook cache when the file is unchanged)
+sheets = load_sheets(EXCEL_PATH)
 
-print('Sheets found:', xls.sheet_names)
+print('Sheets found:', list(sheets))
 
 # Helper to print a section header
 def print_section(title):
@@ -16,15 +16,16 @@ def print_section(title):
 
 def print_first_non_nan_row(df, col=0):
     # Find the first row where the specified column is not NaN
-    for idx, row in df.iterrows():
-        if not pd.isna(row[col]):
-            print(f'First non-NaN row in column {col} (row {idx}):')
-            print(row)
-            break
+    if col not in df.columns:
+        return
+    present = df[col].notna().to_numpy()
+    if present.any():
+        idx = int(np.argmax(present))
+        print(f'First non-NaN row in column {col} (row {idx}):')
+        print(df.iloc[idx])
 
-for sheet in xls.sheet_names:
+for sheet, df in sheets.items():
     print_section(sheet)
-    df = pd.read_excel(xls, sheet_name=sheet, header=None)
     print(f'Shape: {df.shape}')
     print('\nFirst 25 rows:')
     print(df.head(25))
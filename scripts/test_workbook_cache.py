@@ -0,0 +1,43 @@
+import datetime
+import pandas as pd
+from openpyxl import Workbook
+from workbook_cache import cache_path, load_sheets
+
+def make_workbook(path, units=120):
+    workbook = Workbook()
+    inputs = workbook.active
+    inputs.title = 'Inputs'
+    for row in (['Item', 'Value', 'Date'], ['Units', units, datetime.date(2025, 1, 31)], ['Rate', 0.05, None], [None] * 3, ['Note', None, 'tbd']):
+        inputs.append(row)
+    workbook.create_sheet('Numbers').append([1, 2.5])
+    workbook.save(path)
+
+def test_matches_read_excel(tmp_path):
+    path = tmp_path / 'model.xlsx'
+    make_workbook(path)
+    expected = pd.read_excel(path, sheet_name=None, header=None)
+    expected['Inputs'].loc[1, 2] = '2025-01-31T00:00:00'  # Dates come back as ISO strings
+    for cached in (False, True):
+        assert cache_path(path, tmp_path).exists() == cached
+        sheets = load_sheets(path, tmp_path)
+        assert list(sheets) == ['Inputs', 'Numbers']
+        for name, frame in sheets.items():
+            pd.testing.assert_frame_equal(frame, expected[name], check_dtype=False)
+        # Whole numbers come back as floats
+        assert isinstance(sheets['Inputs'].loc[1, 1], float)
+        assert sheets['Numbers'][0].dtype == float
+
+def test_edit_replaces_only_this_workbooks_cache(tmp_path):
+    path = tmp_path / 'model.xlsx'
+    other = tmp_path / 'model-v2.xlsx'
+    make_workbook(path)
+    make_workbook(other)
+    load_sheets(other, tmp_path)
+    original = cache_path(path, tmp_path)
+    assert load_sheets(path, tmp_path)['Inputs'].loc[1, 1] == 120
+    in_progress = original.with_suffix('.tmp.npz')
+    in_progress.touch()
+    make_workbook(path, units=130)
+    assert load_sheets(path, tmp_path)['Inputs'].loc[1, 1] == 130
+    assert not original.exists()
+    assert cache_path(path, tmp_path).exists() and cache_path(other, tmp_path).exists() and in_progress.exists()
@@ -0,0 +1,112 @@
+"""
+Parse the Excel source model once and cache every sheet as arrays in an .npz file keyed by
+the workbook's content hash. Later runs load the cache in milliseconds; editing the
+workbook changes its hash, so the stale cache is ignored and replaced automatically.
+"""
+import datetime
+import hashlib
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+CACHE_DIR = Path(__file__).parent / '.workbook_cache'
+CACHE_VERSION = 1  # Bump when the cache layout changes
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _encode_sheet(rows):
+    """Split a sheet's cells into a float grid (NaN where not numeric) and a text grid ('' where not text)"""
+    width = max((len(row) for row in rows), default=0)
+    values = np.full((len(rows), width), np.nan)
+    text = np.full((len(rows), width), '', dtype=object)
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            if cell is None:
+                continue
+            if isinstance(cell, bool):
+                text[i, j] = str(cell)
+            elif isinstance(cell, (int, float)):
+                values[i, j] = cell
+            elif isinstance(cell, (datetime.date, datetime.time)):
+                text[i, j] = cell.isoformat()
+            else:
+                text[i, j] = str(cell)
+    return values, text.astype(str)
+
+
+def _parse_workbook(path):
+    """Every sheet's cell values in one streaming read-only pass, trailing empty rows dropped"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for worksheet in workbook.worksheets:
+            rows = [list(row) for row in worksheet.iter_rows(values_only=True)]
+            while rows and all(cell is None for cell in rows[-1]):
+                rows.pop()
+            sheets[worksheet.title] = _encode_sheet(rows)
+        return sheets
+    finally:
+        workbook.close()
+
+
+def _cache_prefix(path):
+    # The workbook's name plus a digest of where it lives, so same-named workbooks don't share caches
+    path = Path(path)
+    return f'{path.stem}-{hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:8]}'
+
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f'{_cache_prefix(path)}-v{CACHE_VERSION}-{file_hash(path)[:16]}.npz'
+
+
+def load_sheets(path, cache_dir=CACHE_DIR):
+    """
+    {sheet name: DataFrame} of raw cell values (no header row, like pd.read_excel(header=None)),
+    from the cache when the workbook is unchanged, otherwise parsed and cached. Unlike pandas,
+    whole numbers come back as floats and dates and times as ISO strings.
+    """
+    cached = cache_path(path, cache_dir)
+    if cached.exists():
+        with np.load(cached) as data:
+            names = data['sheet_names'].tolist()
+            sheets = {name: (data[f'values_{i}'], data[f'text_{i}']) for i, name in enumerate(names)}
+    else:
+        sheets = _parse_workbook(path)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # Drop caches of earlier versions of this workbook, leaving other workbooks' caches and
+        # any write still in progress alone
+        stale = re.compile(re.escape(_cache_prefix(path)) + r'-v\d+-[0-9a-f]{16}\.npz')
+        for candidate in cached.parent.iterdir():
+            if stale.fullmatch(candidate.name):
+                candidate.unlink()
+        arrays = {'sheet_names': np.array(list(sheets), dtype=str)}
+        for i, (values, text) in enumerate(sheets.values()):
+            arrays[f'values_{i}'] = values
+            arrays[f'text_{i}'] = text
+        tmp = cached.with_suffix('.tmp.npz')
+        np.savez(tmp, **arrays)
+        tmp.replace(cached)
+    return {name: _to_frame(values, text) for name, (values, text) in sheets.items()}
+
+
+def _to_frame(values, text):
+    # Columns without text stay float, like pandas' own Excel reader
+    has_text = text != ''
+    return pd.DataFrame({
+        j: np.where(has_text[:, j], text[:, j].astype(object), values[:, j]) if has_text[:, j].any() else values[:, j]
+        for j in range(values.shape[1])
+    }, index=pd.RangeIndex(values.shape[0]))
+
+
+def load_sheet(path, sheet_name, cache_dir=CACHE_DIR):
+    return load_sheets(path, cache_dir)[sheet_name]